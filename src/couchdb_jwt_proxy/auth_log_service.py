@@ -7,13 +7,19 @@ security auditing, monitoring, and reporting.
 
 import uuid
 import base64
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# Batched writer settings: flush after this many events or this many seconds
+BATCH_MAX_EVENTS = 100
+BATCH_FLUSH_INTERVAL = 0.5
+BATCH_QUEUE_MAXSIZE = 10000
+
 
 class AuthLogService:
     """
@@ -45,6 +51,8 @@ class AuthLogService:
             self.auth_headers["Authorization"] = f"Basic {credentials}"
 
         self.db_name = self.db_url.split('/')[-1]
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task = None
         logger.info(f"AuthLogService initialized for database: {log_db_url}")
 
     async def _make_request(self, method: str, path: str, **kwargs) -> httpx.Response:
@@ -140,7 +148,7 @@ class AuthLogService:
             # Don't fail if index creation fails
             return True
 
-    async def log_auth_event(
+    def _build_event_doc(
         self,
         action: str,
         status: str,
@@ -152,25 +160,8 @@ class AuthLogService:
         issuer: Optional[str] = None,
         error_reason: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> bool:
-        """
-        Log an authentication event.
-
-        Args:
-            action: Type of action (login, tenant_switch, access_denied, rate_limited, token_validation)
-            status: Result status (success, failed)
-            user_id: User ID (if known)
-            tenant_id: Tenant ID (if applicable)
-            endpoint: API endpoint accessed
-            ip: Client IP address
-            user_agent: Client user agent
-            issuer: JWT issuer
-            error_reason: Reason for failure (if status=failed)
-            metadata: Additional metadata
-
-        Returns:
-            True if logged successfully, False on error
-        """
+    ) -> Dict[str, Any]:
+        """Build an auth_event document (see log_auth_event for arguments)."""
         timestamp = datetime.now(timezone.utc)
         doc_id = f"log_{timestamp.strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
@@ -201,6 +192,45 @@ class AuthLogService:
         if metadata:
             doc["metadata"] = metadata
 
+        return doc
+
+    async def log_auth_event(
+        self,
+        action: str,
+        status: str,
+        user_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        ip: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        issuer: Optional[str] = None,
+        error_reason: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Log an authentication event.
+
+        Args:
+            action: Type of action (login, tenant_switch, access_denied, rate_limited, token_validation)
+            status: Result status (success, failed)
+            user_id: User ID (if known)
+            tenant_id: Tenant ID (if applicable)
+            endpoint: API endpoint accessed
+            ip: Client IP address
+            user_agent: Client user agent
+            issuer: JWT issuer
+            error_reason: Reason for failure (if status=failed)
+            metadata: Additional metadata
+
+        Returns:
+            True if logged successfully, False on error
+        """
+        doc = self._build_event_doc(
+            action, status, user_id, tenant_id, endpoint, ip,
+            user_agent, issuer, error_reason, metadata
+        )
+        doc_id = doc["_id"]
+
         try:
             response = await self._make_request("PUT", doc_id, json=doc)
             if response.status_code in (200, 201, 202):
@@ -310,3 +340,114 @@ class AuthLogService:
             endpoint=endpoint,
             error_reason=error_reason
         )
+
+    async def bulk_log(self, docs: List[Dict[str, Any]]) -> bool:
+        """
+        Write a batch of auth_event documents with a single _bulk_docs POST.
+
+        Args:
+            docs: Documents built by _build_event_doc
+
+        Returns:
+            True if logged successfully, False on error
+        """
+        if not docs:
+            return True
+
+        try:
+            response = await self._make_request("POST", "_bulk_docs", json={"docs": docs})
+            if response.status_code in (200, 201, 202):
+                logger.debug(f"Logged {len(docs)} auth events")
+                return True
+            else:
+                logger.debug(f"Failed to log auth event batch: {response.status_code}")
+                return False
+        except Exception as e:
+            # Silently fail on connection errors - auth logging is non-critical
+            logger.debug(f"Auth log batch skipped (database unavailable): {type(e).__name__}")
+            return False
+
+    def enqueue_auth_event(self, **kwargs) -> bool:
+        """
+        Queue an auth event for the batch writer (non-blocking).
+
+        Takes the same keyword arguments as log_auth_event. If the batch
+        writer is not running, the event is written directly in a background
+        task instead. Events are dropped when the queue is full.
+
+        Returns:
+            True if the event was accepted, False if it was dropped
+        """
+        doc = self._build_event_doc(**kwargs)
+
+        if self._queue is None or self._writer_task is None:
+            asyncio.create_task(self.bulk_log([doc]))
+            return True
+
+        try:
+            self._queue.put_nowait(doc)
+            return True
+        except asyncio.QueueFull:
+            logger.debug("Auth log queue full - dropping event")
+            return False
+
+    def start_batch_writer(self):
+        """
+        Start the background task that flushes queued auth events.
+
+        Flushes every BATCH_MAX_EVENTS events or BATCH_FLUSH_INTERVAL seconds,
+        whichever comes first. This should be called during application startup.
+        """
+        if self._writer_task:
+            logger.warning("[AuthLogService] Batch writer already running")
+            return
+
+        self._queue = asyncio.Queue(maxsize=BATCH_QUEUE_MAXSIZE)
+
+        async def writer_loop():
+            """Drain the queue in batches until cancelled."""
+            loop = asyncio.get_running_loop()
+            batch: List[Dict[str, Any]] = []
+            try:
+                while True:
+                    batch = [await self._queue.get()]
+                    deadline = loop.time() + BATCH_FLUSH_INTERVAL
+
+                    while len(batch) < BATCH_MAX_EVENTS:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                        except asyncio.TimeoutError:
+                            break
+
+                    await self.bulk_log(batch)
+                    batch = []
+            finally:
+                # Cancelled mid-batch: the events already taken off the queue
+                # would otherwise be lost, so write them before exiting
+                if batch:
+                    await self.bulk_log(batch)
+
+        self._writer_task = asyncio.create_task(writer_loop())
+        logger.info("[AuthLogService] Started batch writer")
+
+    async def stop_batch_writer(self):
+        """Stop the batch writer and flush any events still queued."""
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+        if self._queue is not None:
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._queue = None
+            for i in range(0, len(pending), BATCH_MAX_EVENTS):
+                await self.bulk_log(pending[i:i + BATCH_MAX_EVENTS])
+            logger.info("[AuthLogService] Stopped batch writer")
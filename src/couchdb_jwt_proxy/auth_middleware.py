@@ -5,7 +5,7 @@ Verifies Bearer session tokens issued by POST /auth/session.
 The session token is obtained by authenticating once with NIP-98.
 """
 import logging
-from typing import Any, Dict, Optional
+from typing import NamedTuple, Optional
 
 from fastapi import Header, HTTPException, Request
 
@@ -14,25 +14,29 @@ from .core.auth import verify_session_token
 logger = logging.getLogger(__name__)
 
 
+class CurrentUser(NamedTuple):
+    """The authenticated caller of a tenant/invitation endpoint"""
+    user_id: str
+    sub: str                          # pubkey is the stable Nostr identity
+    email: Optional[str] = None       # not available in NIP-98
+    name: Optional[str] = None        # not available in NIP-98
+    issuer: str = "nostr"
+    azp: Optional[str] = None
+    tenant_id: Optional[str] = None   # active tenant, when the token carries one
+
+
 async def get_current_user(
     request: Request,
     authorization: Optional[str] = Header(None),
-) -> Dict[str, Any]:
+) -> CurrentUser:
     """Extract and verify the current user from a Bearer session token.
 
     Returns:
-        Dict with user_id, sub (pubkey), email, name, issuer, azp
+        CurrentUser with user_id, sub (pubkey), email, name, issuer, azp
 
     Raises:
         HTTPException(401): If token is missing or invalid
     """
     payload = verify_session_token(authorization)
 
-    return {
-        "user_id": payload["user_id"],
-        "sub": payload["pubkey"],   # pubkey is the stable Nostr identity
-        "email": None,              # not available in NIP-98
-        "name": None,               # not available in NIP-98
-        "issuer": "nostr",
-        "azp": None,
-    }
+    return CurrentUser(user_id=payload["user_id"], sub=payload["pubkey"])
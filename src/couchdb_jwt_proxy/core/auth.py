@@ -232,6 +232,41 @@ def issue_session_token(
     return {"token": token, "expires_in": ttl}
 
 
+# Verified session tokens, keyed by a short hash of the token. A hit skips the
+# HMAC, base64 and JSON work; entries are dropped lazily once expired.
+_VERIFIED_CACHE_MAXSIZE = 4096
+_verified_tokens: Dict[bytes, Dict[str, Any]] = {}
+_verified_secret: Optional[bytes] = None
+
+
+def _cache_verified_token(key: bytes, secret: bytes, payload: Dict[str, Any]) -> None:
+    """Remember a verified token payload; flushes everything if the secret changed."""
+    global _verified_secret
+    if secret != _verified_secret:
+        _verified_tokens.clear()
+        _verified_secret = secret
+    if len(_verified_tokens) >= _VERIFIED_CACHE_MAXSIZE:
+        now = int(time.time())
+        for k in [k for k, v in _verified_tokens.items() if now > v["exp"]]:
+            del _verified_tokens[k]
+        if len(_verified_tokens) >= _VERIFIED_CACHE_MAXSIZE:
+            # Still full: drop the oldest entry (dicts keep insertion order)
+            del _verified_tokens[next(iter(_verified_tokens))]
+    _verified_tokens[key] = {
+        "pubkey": payload["pubkey"],
+        "user_id": payload["user_id"],
+        "exp": payload.get("exp", 0),
+    }
+
+
+def extract_bearer(authorization: Optional[str]) -> Optional[str]:
+    """Return the token from a "Bearer <token>" header, or None if absent/malformed."""
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    token = authorization[7:]
+    return token or None
+
+
 def verify_session_token(authorization: Optional[str]) -> Dict[str, Any]:
     """Verify a Bearer session token and return {"pubkey", "user_id"}.
 
@@ -240,31 +275,45 @@ def verify_session_token(authorization: Optional[str]) -> Dict[str, Any]:
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
-    if not authorization.startswith("Bearer "):
+    token = extract_bearer(authorization)
+    if token is None:
         raise HTTPException(status_code=401, detail="Authorization must use Bearer scheme")
 
-    token = authorization[7:]
+    secret = _get_session_secret()
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _verified_tokens.get(cache_key) if secret == _verified_secret else None
+    if cached is not None:
+        if int(time.time()) <= cached["exp"]:
+            return {"pubkey": cached["pubkey"], "user_id": cached["user_id"]}
+        _verified_tokens.pop(cache_key, None)
 
     try:
         payload_b64, sig = token.rsplit(".", 1)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid session token format")
 
-    # Verify HMAC
-    expected_sig = hmac.new(_get_session_secret(), payload_b64.encode(), hashlib.sha256).hexdigest()
-    if not hmac.compare_digest(sig, expected_sig):
-        raise HTTPException(status_code=401, detail="Invalid session token: signature mismatch")
-
     # Decode payload
     try:
         payload = json.loads(base64.urlsafe_b64decode(payload_b64 + "=="))
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid session token: malformed payload")
 
-    # Check expiry
-    if int(time.time()) > payload.get("exp", 0):
+    # The payload is still unverified here, so check its shape before using it
+    if not isinstance(payload, dict) or not isinstance(payload.get("exp"), (int, float)):
+        raise HTTPException(status_code=401, detail="Invalid session token: malformed payload")
+
+    # Check expiry before the HMAC: stale tokens are rejected without hashing,
+    # and an unverified exp can only cause a rejection, never an acceptance
+    if int(time.time()) > payload["exp"]:
         raise HTTPException(status_code=401, detail="Session token expired")
 
+    # Verify HMAC
+    expected_sig = hmac.new(secret, payload_b64.encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(sig, expected_sig):
+        raise HTTPException(status_code=401, detail="Invalid session token: signature mismatch")
+
+    _cache_verified_token(cache_key, secret, payload)
+
     return {
         "pubkey": payload["pubkey"],
         "user_id": payload["user_id"],
@@ -10,7 +10,6 @@ Auto-detects test environment and switches to memory backend for unit tests.
 
 import os
 import sys
-import json
 import asyncio
 import threading
 from abc import ABC, abstractmethod
@@ -18,11 +17,21 @@ from typing import Dict, List, Optional, Any, Union
 from urllib.parse import urlparse
 import uuid
 import time
+import importlib.util
 import httpx
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets many long-lived _changes streams and short REST calls share one
+# upstream connection. It needs the h2 package (installed via httpx[http2]).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+UPSTREAM_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+
+# Request bodies are pre-encoded with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 def _is_test_env() -> bool:
     """Auto-detect if we're running in a test environment."""
@@ -171,6 +180,21 @@ class MemoryBackend(BaseBackend):
                         return {"error": "not_found", "reason": "missing"}
 
             elif parts[0] == "_all_docs":
+                # Fetch specific documents (POST {"keys": [...]})
+                if method == "POST" and payload and "keys" in payload:
+                    include_docs = str((params or {}).get("include_docs", "")).lower() == "true"
+                    rows = []
+                    for doc_id in payload["keys"]:
+                        doc = self._docs.get(doc_id)
+                        if doc is None:
+                            rows.append({"key": doc_id, "error": "not_found"})
+                            continue
+                        row = {"id": doc_id, "key": doc_id, "value": {"rev": doc.get("_rev", "1-")}}
+                        if include_docs:
+                            row["doc"] = doc.copy()
+                        rows.append(row)
+                    return {"total_rows": len(self._docs), "offset": 0, "rows": rows}
+
                 # List all documents
                 if method == "GET":
                     rows = []
@@ -399,19 +423,25 @@ class CouchBackend(BaseBackend):
         self.base_url = base_url.rstrip('/')
         self.auth = (username, password) if username and password else None
         # Use AsyncClient for async operations
-        self._client = httpx.AsyncClient(auth=self.auth, timeout=30.0)
+        self._client = httpx.AsyncClient(
+            auth=self.auth, timeout=30.0, http2=HTTP2_AVAILABLE, limits=UPSTREAM_LIMITS
+        )
 
     async def handle_request(self, path: str, method: str, payload: Optional[Dict] = None, params: Optional[Dict] = None) -> Any:
         """Forward requests to real CouchDB."""
         url = f"{self.base_url}/{path.lstrip('/')}"
 
         try:
+            # httpx's json= goes through stdlib json; encode with orjson instead
+            content = orjson.dumps(payload) if payload is not None else None
+            headers = JSON_HEADERS if payload is not None else None
+
             if method.upper() == "GET":
                 response = await self._client.get(url, params=params)
             elif method.upper() == "POST":
-                response = await self._client.post(url, json=payload, params=params)
+                response = await self._client.post(url, content=content, headers=headers, params=params)
             elif method.upper() == "PUT":
-                response = await self._client.put(url, json=payload, params=params)
+                response = await self._client.put(url, content=content, headers=headers, params=params)
             elif method.upper() == "DELETE":
                 response = await self._client.delete(url, params=params)
             else:
@@ -421,14 +451,14 @@ class CouchBackend(BaseBackend):
 
             # Return JSON response or empty dict for 204/empty responses
             try:
-                return response.json() if response.content else {}
-            except json.JSONDecodeError:
+                return orjson.loads(response.content) if response.content else {}
+            except orjson.JSONDecodeError:
                 return {"ok": True} if response.status_code < 400 else {"error": "response_not_json"}
 
         except httpx.HTTPStatusError as e:
             try:
-                return e.response.json()
-            except (json.JSONDecodeError, AttributeError):
+                return orjson.loads(e.response.content)
+            except (orjson.JSONDecodeError, AttributeError):
                 return {"error": "http_error", "reason": str(e)}
         except Exception as e:
             return {"error": "connection_error", "reason": str(e)}
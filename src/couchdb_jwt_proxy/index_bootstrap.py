@@ -134,6 +134,20 @@ class IndexBootstrap:
                 "index": {"fields": ["created_at"]},
                 "name": "created-at",
             },
+            {
+                "index": {"fields": ["type", "databaseName"]},
+                "name": "application-db",
+            },
+            # Invitation lookups (invite_service): token validation, and the
+            # per-tenant listing, whose sort must follow this field order
+            {
+                "index": {"fields": ["type", "tokenHash"]},
+                "name": "invitation-token",
+            },
+            {
+                "index": {"fields": ["type", "tenantId", "createdAt"]},
+                "name": "invitation-tenant-created",
+            },
         ]
 
         logger.info("📦 Creating indexes on 'couch-sitter'...")
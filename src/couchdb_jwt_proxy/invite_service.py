@@ -11,11 +11,15 @@ import hmac
 import hashlib
 import secrets
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import httpx
 import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from unittest.mock import MagicMock
 
+from .dal import HTTP2_AVAILABLE, UPSTREAM_LIMITS
+from .couch_sitter_service import BulkUpdateConflict
+
 logger = logging.getLogger(__name__)
 
 # Prefix for invitation tokens
@@ -23,6 +27,10 @@ TOKEN_PREFIX = "sk_"
 TOKEN_BYTES = 32  # 256-bit entropy
 EXPIRATION_DAYS = 7
 HMAC_ALGORITHM = "sha256"
+TOKEN_HASH_BYTES = 32  # BLAKE2b digest size for stored token hashes
+REQUEST_TIMEOUT = 10.0  # seconds, per couch-sitter request
+DEFAULT_PAGE_SIZE = 50  # invitations per page when listing
+MAX_PAGE_SIZE = 500
 
 
 class InviteService:
@@ -60,6 +68,9 @@ class InviteService:
             self.auth_headers["Authorization"] = f"Basic {credentials}"
 
         self.db_name = self.db_url.split('/')[-1]
+        # Long-lived upstream client, created on first HTTP request (see _get_client)
+        self._client: Optional[httpx.AsyncClient] = None
+
         logger.info(f"InviteService initialized for database: {couch_sitter_db_url}")
 
     async def _make_request(self, method: str, path: str, **kwargs):
@@ -112,10 +123,25 @@ class InviteService:
         headers = kwargs.pop('headers', {})
         headers.update(self.auth_headers)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(method, url, headers=headers, **kwargs)
-            response.raise_for_status()
-            return response
+        response = await self._get_client().request(method, url, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled upstream client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            # Never persist upstream cookies: the client is shared across users
+            no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE, timeout=REQUEST_TIMEOUT, limits=UPSTREAM_LIMITS, cookies=no_cookies
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled upstream client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def generate_token(self) -> str:
         """
@@ -135,15 +161,15 @@ class InviteService:
         """
         Hash a token for storage.
         
-        Uses SHA256 to store only hashed version in database.
+        Uses BLAKE2b (256-bit digest) to store only hashed version in database.
         
         Args:
             token: Plain token string
             
         Returns:
-            SHA256 hash as hex string
+            BLAKE2b hash as hex string
         """
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = hashlib.blake2b(token.encode(), digest_size=TOKEN_HASH_BYTES).hexdigest()
         logger.debug(f"Hashed token: {token[:20]}... -> {token_hash[:20]}...")
         return token_hash
 
@@ -260,10 +286,10 @@ class InviteService:
         """
         Validate an invitation token.
         
-        Checks:
+        Checks (all in the _find selector, so CouchDB returns only usable invitations):
         - Token exists and matches hash
+        - Still pending (not accepted or revoked)
         - Not yet expired
-        - Not already accepted
         
         Args:
             token: Plain token from user
@@ -277,44 +303,16 @@ class InviteService:
             return None
         
         try:
-            # Query for invitations with matching token hash
-            token_hash = self.hash_token(token)
-            query = {
-                "selector": {
-                    "type": "invitation",
-                    "tokenHash": token_hash
-                },
-                "limit": 1
-            }
-            
-            response = await self._make_request("POST", "_find", json=query)
-            result = response.json()
-            
-            docs = result.get("docs", [])
-            if not docs:
-                logger.warning(f"Token not found: {token[:20]}...")
-                return None
-            
-            invitation = docs[0]
-            
-            # Check if already accepted
-            if invitation.get("status") == "accepted":
-                logger.warning(f"Token already accepted: {invitation['_id']}")
-                return None
-            
-            # Check if revoked
-            if invitation.get("status") == "revoked":
-                logger.warning(f"Token revoked: {invitation['_id']}")
+            invitation = await self._find_valid_invitation(self.hash_token(token))
+            if not invitation:
+                # Invitations created before the switch to BLAKE2b store a SHA-256
+                # hash; they all expire within EXPIRATION_DAYS, after which this
+                # fallback can be removed
+                invitation = await self._find_valid_invitation(hashlib.sha256(token.encode()).hexdigest())
+            if not invitation:
+                logger.warning(f"Token not found, already used, revoked or expired: {token[:20]}...")
                 return None
             
-            # Check expiration
-            expires_at = invitation.get("expiresAt")
-            if expires_at:
-                expires_dt = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
-                if datetime.now(timezone.utc) > expires_dt:
-                    logger.warning(f"Token expired: {invitation['_id']}")
-                    return None
-            
             logger.info(f"Token validated: {invitation['_id']}")
             return invitation
             
@@ -322,6 +320,23 @@ class InviteService:
             logger.error(f"Error validating token: {e}")
             raise
 
+    async def _find_valid_invitation(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        """Find the pending, unexpired invitation with this token hash, if any"""
+        # expiresAt is stored as a UTC isoformat() string, so string order is time order
+        query = {
+            "selector": {
+                "type": "invitation",
+                "tokenHash": token_hash,
+                "status": "pending",
+                "expiresAt": {"$gt": datetime.now(timezone.utc).isoformat()}
+            },
+            "limit": 1
+        }
+        
+        response = await self._make_request("POST", "_find", json=query)
+        docs = response.json().get("docs", [])
+        return docs[0] if docs else None
+
     async def accept_invitation(
         self,
         invitation: Dict[str, Any],
@@ -340,12 +355,8 @@ class InviteService:
         Raises:
             httpx.HTTPError: If database operation fails
         """
-        current_time = datetime.now(timezone.utc).isoformat()
-        
-        invitation["status"] = "accepted"
-        invitation["acceptedAt"] = current_time
-        invitation["acceptedBy"] = user_id
-        
+        self.mark_accepted(invitation, user_id)
+
         try:
             response = await self._make_request("PUT", invitation["_id"], json=invitation)
             updated = response.json()
@@ -356,6 +367,28 @@ class InviteService:
             logger.error(f"Failed to accept invitation: {e}")
             raise
 
+    def mark_accepted(self, invitation: Dict[str, Any], user_id: str) -> None:
+        """
+        Set the accepted status fields on an invitation in place, without saving it.
+
+        Lets callers write the invitation together with other docs
+        (see CouchSitterService.add_user_to_tenant). The batch write re-applies
+        this to a fresh copy on a revision conflict, so the pending status is
+        checked again each time.
+
+        Args:
+            invitation: Invitation document
+            user_id: User ID accepting the invitation
+
+        Raises:
+            BulkUpdateConflict: If the invitation is no longer pending
+        """
+        if invitation.get("status") != "pending":
+            raise BulkUpdateConflict(f"Invitation {invitation.get('_id')} is no longer pending")
+        invitation["status"] = "accepted"
+        invitation["acceptedAt"] = datetime.now(timezone.utc).isoformat()
+        invitation["acceptedBy"] = user_id
+
     async def revoke_invitation(self, invite_id: str) -> Dict[str, Any]:
         """
         Revoke a pending invitation.
@@ -390,17 +423,23 @@ class InviteService:
     async def get_invitations_for_tenant(
         self,
         tenant_id: str,
-        status: Optional[str] = None
-    ) -> list:
+        status: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        bookmark: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Get all invitations for a tenant.
+        Get one page of invitations for a tenant, newest first.
         
         Args:
             tenant_id: Tenant ID
             status: Filter by status (pending, accepted, revoked)
+            limit: Maximum number of invitations to return
+            bookmark: Bookmark from the previous page, if any
+            fields: Only return these document fields (all fields if None)
             
         Returns:
-            List of invitation documents
+            Tuple of (invitation documents, bookmark for the next page)
         """
         try:
             selector = {
@@ -411,17 +450,24 @@ class InviteService:
             if status:
                 selector["status"] = status
             
+            # Sort on every field of the invitation-tenant-created index
+            # (see index_bootstrap) so CouchDB serves it from the index
             query = {
                 "selector": selector,
-                "sort": [{"createdAt": "desc"}]
+                "sort": [{"type": "desc"}, {"tenantId": "desc"}, {"createdAt": "desc"}],
+                "limit": limit
             }
+            if bookmark:
+                query["bookmark"] = bookmark
+            if fields:
+                query["fields"] = fields
             
             response = await self._make_request("POST", "_find", json=query)
             result = response.json()
             
             invitations = result.get("docs", [])
             logger.debug(f"Found {len(invitations)} invitations for tenant {tenant_id}")
-            return invitations
+            return invitations, result.get("bookmark")
             
         except httpx.HTTPStatusError as e:
             logger.error(f"Error fetching invitations for tenant {tenant_id}: {e}")
@@ -1,18 +1,22 @@
 import os
 import json
 import httpx
+import orjson
 import logging
 import base64
 import hashlib
 import asyncio
-from typing import Optional, Dict, Any, List
+import importlib.util
+from typing import Optional, Dict, Any, List, AsyncIterator
 from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 
 
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Header, Request, Body
+from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -24,7 +28,7 @@ from urllib.parse import parse_qsl
 # Import user/tenant management modules
 from .user_tenant_cache import get_cache
 from .couch_sitter_service import CouchSitterService, ADMIN_TENANT_ID
-from .dal import create_dal
+from .dal import create_dal, CouchBackend, HTTP2_AVAILABLE, UPSTREAM_LIMITS
 from .auth_log_service import AuthLogService
 from .invite_service import InviteService
 from .tenant_routes import create_tenant_router
@@ -35,7 +39,7 @@ from .bootstrap import BootstrapManager
 from .index_bootstrap import IndexBootstrap
 from .tenant_service import TenantService
 from . import auth_middleware
-from .core.auth import verify_session_token, verify_nip98, issue_session_token
+from .core.auth import verify_session_token, verify_nip98, issue_session_token, extract_bearer
 from .tenant_validation import validate_tenant_id_format, TenantIdFormatError, validate_user_id_format, UserIdFormatError
 
 # Load environment variables
@@ -50,12 +54,18 @@ PROXY_PORT = os.getenv("PROXY_PORT")
 LOG_LEVEL = os.getenv("LOG_LEVEL")
 COUCH_SITTER_LOG_DB_URL = os.getenv("COUCH_SITTER_LOG_DB_URL")
 
+# libuv event loop and C HTTP parser when installed (uvloop has no Windows build)
+UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
 # ... (imports and other setup)
 
 # ... (imports and other setup)
 
 # Tenant configuration (always enabled)
 TENANT_FIELD = os.getenv("TENANT_FIELD")
+# Re-filter responses whose upstream query the proxy already tenant-scoped
+STRICT_TENANT_FILTER = os.getenv("STRICT_TENANT_FILTER", "false").lower() == "true"
 
 # Couch-sitter database configuration for user/tenant management
 COUCH_SITTER_DB_URL = os.getenv("COUCH_SITTER_DB_URL")
@@ -66,6 +76,13 @@ APPLICATION_ID = os.getenv("APPLICATION_ID", "roady")
 
 USER_CACHE_TTL_SECONDS_STR = os.getenv("USER_CACHE_TTL_SECONDS", "300")
 
+# Upstream timeouts: regular requests get a bounded timeout, while long-lived
+# _changes feeds (longpoll/continuous/eventsource) are held open indefinitely.
+# Feeds still wait a bounded time for a free connection from their pool.
+DEFAULT_TIMEOUT = 30.0
+LONGPOLL_TIMEOUT = httpx.Timeout(None, pool=DEFAULT_TIMEOUT)
+_LONG_LIVED_FEEDS = frozenset({"longpoll", "continuous", "eventsource"})
+
 # Allowed CouchDB endpoints for PouchDB
 # Note: '/' removed because it was matching all document IDs as a prefix
 ALLOWED_ENDPOINTS = {
@@ -80,6 +97,24 @@ ALLOWED_ENDPOINTS = {
     "/_session": ["GET", "POST"],
 }
 
+# Databases the catch-all proxy may touch. Always includes couch-sitter (admin
+# database) and system databases; APPLICATION_ID may be comma-separated to allow
+# multiple app databases (e.g. "roady,roady-staging").
+# Rebuilt only by refresh_allowed_dbs(), never per request.
+_allowed_dbs_cache: frozenset = frozenset()
+
+def refresh_allowed_dbs() -> frozenset:
+    """Rebuild the database whitelist from the APPLICATION_ID env var"""
+    global _allowed_dbs_cache
+    app_dbs = {db.strip() for db in os.environ.get("APPLICATION_ID", "roady").split(",") if db.strip()}
+    _allowed_dbs_cache = frozenset({'couch-sitter', '_users', '_replicator'} | app_dbs)
+    return _allowed_dbs_cache
+
+refresh_allowed_dbs()
+
+# Virtual table path prefixes that must never reach the catch-all proxy
+_RESERVED_PREFIXES = ("__users", "__tenants")
+
 # Validation: Ensure required configuration is set
 missing_vars = []
 
@@ -180,13 +215,13 @@ if COUCH_SITTER_LOG_DB_URL:
         couchdb_user=COUCHDB_USER,
         couchdb_password=COUCHDB_PASSWORD
     )
-    logger.info(f"Initialized AuthLogService for: {COUCH_SITTER_LOG_DB_URL}")
+    logger.info("Initialized AuthLogService for: %s", COUCH_SITTER_LOG_DB_URL)
     # Note: Database will be created automatically on first log write
 else:
     logger.warning("COUCH_SITTER_LOG_DB_URL not configured - auth logging disabled")
 
-logger.info(f"Initialized user cache (TTL: {USER_CACHE_TTL_SECONDS}s)")
-logger.info(f"Initialized CouchSitter service for: {COUCH_SITTER_DB_URL}")
+logger.info("Initialized user cache (TTL: %ss)", USER_CACHE_TTL_SECONDS)
+logger.info("Initialized CouchSitter service for: %s", COUCH_SITTER_DB_URL)
 
 # JWT Functions
 def get_token_preview(token: str) -> str:
@@ -195,12 +230,42 @@ def get_token_preview(token: str) -> str:
         return "token_too_short"
     return f"{token[:10]}...{token[-10:]}"
 
+# CouchDB credentials are fixed at import, so the Basic Auth header is built once
+BASIC_AUTH_HEADER: Optional[str] = (
+    f"Basic {base64.b64encode(f'{COUCHDB_USER}:{COUCHDB_PASSWORD}'.encode()).decode()}"
+    if COUCHDB_USER and COUCHDB_PASSWORD else None
+)
+
 def get_basic_auth_header() -> Optional[str]:
-    """Create Basic Auth header for CouchDB"""
-    if COUCHDB_USER and COUCHDB_PASSWORD:
-        credentials = base64.b64encode(f"{COUCHDB_USER}:{COUCHDB_PASSWORD}".encode()).decode()
-        return f"Basic {credentials}"
-    return None
+    """Return the Basic Auth header for CouchDB"""
+    return BASIC_AUTH_HEADER
+
+# Shared upstream client: keeps CouchDB connections warm across requests
+_http_client: Optional[httpx.AsyncClient] = None
+# Long-lived _changes feeds hold a connection each for as long as the client
+# stays subscribed, so they get their own pool and can't starve regular requests
+_feed_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared upstream client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # Never persist upstream cookies: the client is shared across users
+        no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE, timeout=DEFAULT_TIMEOUT, limits=UPSTREAM_LIMITS, cookies=no_cookies
+        )
+    return _http_client
+
+def get_feed_client() -> httpx.AsyncClient:
+    """Return the client for long-lived _changes feeds, creating it on first use"""
+    global _feed_client
+    if _feed_client is None or _feed_client.is_closed:
+        no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        _feed_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE, timeout=LONGPOLL_TIMEOUT, limits=UPSTREAM_LIMITS, cookies=no_cookies
+        )
+    return _feed_client
 
 def decode_token_unsafe(token: str) -> Optional[Dict[str, Any]]:
     """Decode token without verification for debugging (only in logs)"""
@@ -236,6 +301,31 @@ def is_couch_sitter_app(payload: Dict[str, Any], request_path: str = None) -> bo
     
     return False
 
+async def remember_discovered_tenant(
+    tenant_service: TenantService,
+    sub_hash: str,
+    tenant_id: str,
+    sid: Optional[str],
+    application_id: str,
+) -> None:
+    """
+    Store a tenant found by discovery as the user's default and as the session tenant.
+
+    The two writes are independent, so they go out together (as concurrent
+    streams when the upstream speaks HTTP/2). Failures are logged, not raised.
+    """
+    writes = {"set user default": tenant_service.set_user_default_tenant(sub_hash, tenant_id, database="couch-sitter")}
+    if sid and session_service:
+        writes["create session"] = session_service.create_session(sid, sub_hash, tenant_id, application_id=application_id)
+
+    results = await asyncio.gather(*writes.values(), return_exceptions=True)
+    for action, result in zip(writes, results):
+        if isinstance(result, Exception):
+            logger.warning("[EXTRACT_TENANT] Failed to %s: %s", action, result)
+        else:
+            logger.debug("[EXTRACT_TENANT] %s done for tenant %s", action, tenant_id)
+
+
 async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> str:
     """
     Extract tenant ID from JWT payload with 5-level lookup chain.
@@ -271,18 +361,12 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
     # Determine if this is a couch-sitter request (special case)
     is_couch_sitter_request = is_couch_sitter_app(payload, request_path)
 
-    logger.debug(f"[EXTRACT_TENANT] Application: {'couch-sitter' if is_couch_sitter_request else 'multi-tenant'}")
+    logger.debug("[EXTRACT_TENANT] Application: %s", 'couch-sitter' if is_couch_sitter_request else 'multi-tenant')
 
     # For couch-sitter, use existing personal tenant behavior
     if is_couch_sitter_request:
-        logger.debug(f"[EXTRACT_TENANT] Level 0: couch-sitter request, using personal tenant")
+        logger.debug("[EXTRACT_TENANT] Level 0: couch-sitter request, using personal tenant")
         
-        # Try cache first
-        cached_info = user_cache.get_user_by_sub_hash(sub_hash)
-        if cached_info:
-            return cached_info.tenant_id
-
-        # Cache miss - fetch from couch-sitter database
         # Extract database name from request path (e.g., "roady-staging/..." -> "roady-staging")
         requested_db_name = None
         if request_path:
@@ -294,15 +378,24 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
         # This is trusted because it comes from the actual request URL
         application_id = requested_db_name
 
-        try:
-            user_tenant_info = await couch_sitter_service.get_user_tenant_info(
+        def load_user_tenant_info():
+            return couch_sitter_service.get_user_tenant_info(
                 sub=sub,
                 email=payload.get("email"),
                 name=payload.get("name") or payload.get("given_name"),
                 requested_db_name=requested_db_name
             )
+
+        # Try cache first; entries close to expiry are refreshed in the background
+        cached_info = user_cache.get_user_by_sub_hash(sub_hash, refresh=load_user_tenant_info)
+        if cached_info:
+            return cached_info.tenant_id
+
+        # Cache miss - fetch from couch-sitter database
+        try:
+            user_tenant_info = await load_user_tenant_info()
             user_cache.set_user(sub_hash, user_tenant_info)
-            logger.info(f"[EXTRACT_TENANT] Retrieved personal tenant: {user_tenant_info.tenant_id}")
+            logger.info("[EXTRACT_TENANT] Retrieved personal tenant: %s", user_tenant_info.tenant_id)
             return user_tenant_info.tenant_id
         except Exception as e:
             logger.error(f"[EXTRACT_TENANT] Failed to get personal tenant: {e}")
@@ -311,7 +404,7 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
     # ============================================================================
     # MULTI-TENANT REQUEST - 5-LEVEL DISCOVERY CHAIN
     # ============================================================================
-    logger.debug(f"[EXTRACT_TENANT] Multi-tenant request - starting 5-level discovery")
+    logger.debug("[EXTRACT_TENANT] Multi-tenant request - starting 5-level discovery")
 
     sid = payload.get("sid")
     user_name = payload.get("name") or payload.get("given_name")
@@ -324,47 +417,47 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
     # ============================================================================
     if sid and session_service:
         try:
-            logger.debug(f"[EXTRACT_TENANT] Level 1: Checking session cache for sid={sid}")
+            logger.debug("[EXTRACT_TENANT] Level 1: Checking session cache for sid=%s", sid)
             active_tenant_id = await session_service.get_active_tenant(sid)
             if active_tenant_id:
-                logger.info(f"[EXTRACT_TENANT] ✅ Level 1 HIT: Found session tenant: {active_tenant_id}")
+                logger.info("[EXTRACT_TENANT] ✅ Level 1 HIT: Found session tenant: %s", active_tenant_id)
                 return active_tenant_id
         except Exception as e:
             logger.warning(f"[EXTRACT_TENANT] Level 1 failed: {e}")
 
-    logger.debug(f"[EXTRACT_TENANT] Level 1 miss - falling through")
+    logger.debug("[EXTRACT_TENANT] Level 1 miss - falling through")
 
     # ============================================================================
     # LEVEL 2: User document default
     # ============================================================================
     try:
-        logger.debug(f"[EXTRACT_TENANT] Level 2: Checking user doc for default tenant")
+        logger.debug("[EXTRACT_TENANT] Level 2: Checking user doc for default tenant")
         user_doc_id = f"user_{sub_hash}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{COUCHDB_INTERNAL_URL}/couch-sitter/{user_doc_id}",
-                auth=(COUCHDB_USER, COUCHDB_PASSWORD),
-            )
+        client = get_http_client()
+        response = await client.get(
+            f"{COUCHDB_INTERNAL_URL}/couch-sitter/{user_doc_id}",
+            auth=(COUCHDB_USER, COUCHDB_PASSWORD),
+        )
 
-            if response.status_code == 200:
-                user_doc = response.json()
-                user_default = user_doc.get("active_tenant_id")
+        if response.status_code == 200:
+            user_doc = response.json()
+            user_default = user_doc.get("active_tenant_id")
+            
+            if user_default:
+                logger.info("[EXTRACT_TENANT] ✅ Level 2 HIT: Found user default: %s", user_default)
+                
+                # Create/update session with this default
+                if sid and session_service:
+                    try:
+                        await session_service.create_session(sid, sub_hash, user_default, application_id=application_id)
+                        logger.debug("[EXTRACT_TENANT] Cached session %s with tenant %s and app %s", sid, user_default, application_id)
+                    except Exception as e:
+                        logger.warning(f"[EXTRACT_TENANT] Failed to create session: {e}")
                 
-                if user_default:
-                    logger.info(f"[EXTRACT_TENANT] ✅ Level 2 HIT: Found user default: {user_default}")
-                    
-                    # Create/update session with this default
-                    if sid and session_service:
-                        try:
-                            await session_service.create_session(sid, sub_hash, user_default, app_id, application_id)
-                            logger.debug(f"[EXTRACT_TENANT] Cached session {sid} with tenant {user_default} and app {application_id}")
-                        except Exception as e:
-                            logger.warning(f"[EXTRACT_TENANT] Failed to create session: {e}")
-                    
-                    return user_default
-
-                logger.debug(f"[EXTRACT_TENANT] Level 2 miss - user doc has no active_tenant_id")
+                return user_default
+
+            logger.debug("[EXTRACT_TENANT] Level 2 miss - user doc has no active_tenant_id")
     except Exception as e:
         logger.warning(f"[EXTRACT_TENANT] Level 2 failed: {e}")
 
@@ -372,7 +465,7 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
     # LEVEL 3: Query first user-owned tenant
     # ============================================================================
     try:
-        logger.debug(f"[EXTRACT_TENANT] Level 3: Querying user's tenants")
+        logger.debug("[EXTRACT_TENANT] Level 3: Querying user's tenants")
         if not hasattr(extract_tenant, '_tenant_service'):
             extract_tenant._tenant_service = TenantService(
                 COUCHDB_INTERNAL_URL,
@@ -387,24 +480,14 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
             first_tenant = tenants[0]
             tenant_id = first_tenant["_id"].replace("tenant_", "")  # Remove prefix for virtual ID
             
-            logger.info(f"[EXTRACT_TENANT] ✅ Level 3 HIT: Found existing tenant: {tenant_id}")
+            logger.info("[EXTRACT_TENANT] ✅ Level 3 HIT: Found existing tenant: %s", tenant_id)
             
             # Update user default and create session
-            try:
-                await tenant_service.set_user_default_tenant(sub_hash, tenant_id, database="couch-sitter")
-                logger.debug(f"[EXTRACT_TENANT] Set user default to {tenant_id}")
-            except Exception as e:
-                logger.warning(f"[EXTRACT_TENANT] Failed to set user default: {e}")
-            
-            if sid and session_service:
-                try:
-                    await session_service.create_session(sid, sub_hash, tenant_id, app_id, application_id)
-                except Exception as e:
-                    logger.warning(f"[EXTRACT_TENANT] Failed to create session: {e}")
+            await remember_discovered_tenant(tenant_service, sub_hash, tenant_id, sid, application_id)
 
             return tenant_id
         
-        logger.debug(f"[EXTRACT_TENANT] Level 3 miss - user has no tenants")
+        logger.debug("[EXTRACT_TENANT] Level 3 miss - user has no tenants")
     except Exception as e:
         logger.warning(f"[EXTRACT_TENANT] Level 3 failed: {e}")
 
@@ -412,7 +495,7 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
     # LEVEL 4: Create new tenant for user
     # ============================================================================
     try:
-        logger.debug(f"[EXTRACT_TENANT] Level 4: Creating new tenant for user")
+        logger.debug("[EXTRACT_TENANT] Level 4: Creating new tenant for user")
         if not hasattr(extract_tenant, '_tenant_service'):
             extract_tenant._tenant_service = TenantService(
                 COUCHDB_INTERNAL_URL,
@@ -430,21 +513,10 @@ async def extract_tenant(payload: Dict[str, Any], request_path: str = None) -> s
         )
         tenant_id = result["tenant_id"]
         
-        logger.info(f"[EXTRACT_TENANT] ✅ Level 4: Created new tenant: {tenant_id}")
-        
-        # Set as user default
-        try:
-            await tenant_service.set_user_default_tenant(sub_hash, tenant_id, database="couch-sitter")
-            logger.debug(f"[EXTRACT_TENANT] Set user default to newly created tenant {tenant_id}")
-        except Exception as e:
-            logger.warning(f"[EXTRACT_TENANT] Failed to set user default: {e}")
+        logger.info("[EXTRACT_TENANT] ✅ Level 4: Created new tenant: %s", tenant_id)
         
-        # Create session
-        if sid and session_service:
-            try:
-                await session_service.create_session(sid, sub_hash, tenant_id, app_id, application_id)
-            except Exception as e:
-                logger.warning(f"[EXTRACT_TENANT] Failed to create session: {e}")
+        # Set as user default and create session
+        await remember_discovered_tenant(tenant_service, sub_hash, tenant_id, sid, application_id)
         
         return tenant_id
     except Exception as e:
@@ -463,91 +535,61 @@ def is_system_doc(doc_id: str) -> bool:
     """Check if document ID is a system document"""
     return doc_id.startswith("_")
 
+# Lookup tables derived once from ALLOWED_ENDPOINTS for is_endpoint_allowed()
+_ALLOWED_PAIRS = frozenset((p, m) for p, methods in ALLOWED_ENDPOINTS.items() for m in methods)
+_ALLOWED_PREFIXES = tuple(sorted(
+    ((p, frozenset(methods)) for p, methods in ALLOWED_ENDPOINTS.items() if p.endswith("/")),
+    key=lambda entry: len(entry[0]), reverse=True,
+))
+_LOCAL_METHODS = frozenset({"GET", "PUT", "DELETE"})
+_DOC_METHODS = frozenset({"GET", "PUT", "DELETE", "POST", "HEAD", "COPY"})
+_REV_METHODS = frozenset({"GET", "DELETE"})
+_ATTACHMENT_METHODS = frozenset({"GET", "PUT", "DELETE", "HEAD"})
+
 def is_endpoint_allowed(path: str, method: str) -> bool:
     """Check if endpoint is allowed (tenant mode always enabled)"""
-    logger.debug(f"🔍 Checking endpoint: path='{path}', method='{method}'")
-
-    # Log all allowed endpoints for debugging
-    logger.debug(f"📋 Available endpoints: {list(ALLOWED_ENDPOINTS.keys())}")
+    path_to_check = path if path.startswith('/') else f"/{path}"
 
     # Special case for _local documents (PouchDB replication)
     # Explicitly handle _local paths to ensure they are not blocked by system doc checks
-    # if prefix matching fails for some reason.
-    if path.startswith("_local/") or path.startswith("/_local/") or path == "_local" or path == "/_local":
-        is_allowed = method in ["GET", "PUT", "DELETE"]
-        logger.debug(f"✅ Special _local check: path='{path}', method='{method}' = {is_allowed}")
-        return is_allowed
+    if path_to_check.startswith("/_local/") or path_to_check == "/_local":
+        return method in _LOCAL_METHODS
 
-    # Check exact endpoint match (handle both with and without leading slash)
-    path_to_check = path if path.startswith('/') else f"/{path}"
+    # Exact endpoint match (with or without leading slash)
+    if (path_to_check, method) in _ALLOWED_PAIRS:
+        return True
     if path_to_check in ALLOWED_ENDPOINTS:
-        allowed_methods = ALLOWED_ENDPOINTS[path_to_check]
-        is_allowed = method in allowed_methods
-        logger.debug(f"✅ Exact match: path='{path}' (as '{path_to_check}') matches allowed endpoint, method='{method}' in {allowed_methods} = {is_allowed}")
-        return is_allowed
-    elif path in ALLOWED_ENDPOINTS:  # Also check original path in case it already has slash
-        allowed_methods = ALLOWED_ENDPOINTS[path]
-        is_allowed = method in allowed_methods
-        logger.debug(f"✅ Exact match: path='{path}' matches allowed endpoint, method='{method}' in {allowed_methods} = {is_allowed}")
-        return is_allowed
-
-    # Check prefix patterns for design documents and views
-    # Sort endpoints by length (longest first) to ensure more specific paths match first
-    sorted_endpoints = sorted(ALLOWED_ENDPOINTS.items(), key=lambda x: len(x[0]), reverse=True)
-    for allowed_path, allowed_methods in sorted_endpoints:
-        if allowed_path.endswith("/"):
-            # Handle both cases: path might or might not start with '/'
-            path_to_check = path if path.startswith('/') else f"/{path}"
-            logger.debug(f"🔍 Checking prefix: allowed_path='{allowed_path}', original_path='{path}', path_to_check='{path_to_check}', starts_with={path_to_check.startswith(allowed_path)}")
-            if path_to_check.startswith(allowed_path):
-                is_allowed = method in allowed_methods
-                logger.debug(f"✅ Prefix match: path='{path}' starts with allowed_path='{allowed_path}', method='{method}' in {allowed_methods} = {is_allowed}")
-                return is_allowed
-            else:
-                logger.debug(f"❌ Prefix check: path='{path}' does NOT start with allowed_path='{allowed_path}'")
+        return False
 
-    logger.debug(f"🔍 No exact or prefix match found for path='{path}', checking other patterns...")
+    # Prefix patterns, longest first so more specific paths match first
+    for allowed_path, allowed_methods in _ALLOWED_PREFIXES:
+        if path_to_check.startswith(allowed_path):
+            return method in allowed_methods
 
     # Check if it's a document endpoint (single document operations)
     # Allowed: GET /docid, PUT /docid, DELETE /docid, POST /docid
-    if method in ["GET", "PUT", "DELETE", "POST", "HEAD", "COPY"] and "/" not in path.lstrip("/"):
-        doc_id = path.lstrip("/")
-        if not doc_id:  # Empty path - database info request
+    doc_path = path.lstrip("/")
+    if method in _DOC_METHODS and "/" not in doc_path:
+        if not doc_path:  # Empty path - database info request
             # Allow GET for database info, block other methods
             return method == "GET"
-        return not is_system_doc(doc_id)
+        return not is_system_doc(doc_path)
 
     # Document revision endpoint: /docid?rev=...
-    if method in ["GET", "DELETE"] and "?" in path:
+    if method in _REV_METHODS and "?" in path:
         doc_id = path.split("?")[0].lstrip("/")
         if not doc_id:
             return False
         return not is_system_doc(doc_id)
 
-    # Bulk operations on multiple documents: /_bulk_get
-    if path == "_bulk_get" and method == "POST":
-        return True
-
     # Attachment operations: /docid/attachmentname
-    # But exclude system documents like _local/* which should have been handled by prefix matching
-    if method in ["GET", "PUT", "DELETE", "HEAD"] and "/" in path:
-        parts = path.split("/", 1)
-        if len(parts) == 2:
-            doc_id, attachment_part = parts
-            logger.debug(f"🔎 Attachment check: doc_id='{doc_id}', is_system={is_system_doc(doc_id)}, attachment_part='{attachment_part}'")
-            if doc_id and not is_system_doc(doc_id) and attachment_part:
-                logger.debug(f"✅ Attachment allowed: {method} /{path}")
-                return True
-            else:
-                logger.debug(f"❌ Attachment denied: doc_id is system doc or missing parts")
+    # But exclude system documents like _local/* which should have been handled above
+    if method in _ATTACHMENT_METHODS and "/" in path:
+        doc_id, _, attachment_part = path.partition("/")
+        if doc_id and not is_system_doc(doc_id) and attachment_part:
+            return True
 
     logger.warning(f"🚫 ENDPOINT DENIED: No pattern matched for {method} '{path}'")
-    logger.warning(f"📋 Summary check:")
-    logger.warning(f"  - Exact path match: {path in ALLOWED_ENDPOINTS}")
-    logger.warning(f"  - Prefix match: {any(path.startswith(p) for p in ALLOWED_ENDPOINTS.keys() if p.endswith('/'))}")
-    logger.warning(f"  - Document endpoint: {method in ['GET', 'PUT', 'DELETE', 'POST', 'HEAD', 'COPY'] and '/' not in path.lstrip('/')}")
-    logger.warning(f"  - Query endpoint: {method in ['GET', 'DELETE'] and '?' in path}")
-    logger.warning(f"  - Attachment endpoint: {method in ['GET', 'PUT', 'DELETE', 'HEAD'] and '/' in path}")
     return False
 
 def filter_document_for_tenant(doc: Dict[str, Any], tenant_id: str) -> Optional[Dict[str, Any]]:
@@ -567,9 +609,9 @@ def inject_tenant_into_doc(doc: Dict[str, Any], tenant_id: str, is_multi_tenant_
      """
      if is_multi_tenant_app:
          doc[TENANT_FIELD] = tenant_id
-         logger.debug(f"Injected tenant ID into document for multi-tenant app: {tenant_id}")
+         logger.debug("Injected tenant ID into document for multi-tenant app: %s", tenant_id)
      else:
-         logger.debug(f"Skipping tenant injection for couch-sitter app")
+         logger.debug("Skipping tenant injection for couch-sitter app")
      return doc
 
 def rewrite_all_docs_query(query_params: str, tenant_id: str, is_multi_tenant_app: bool = False) -> str:
@@ -580,16 +622,32 @@ def rewrite_all_docs_query(query_params: str, tenant_id: str, is_multi_tenant_ap
     For couch-sitter: No tenant filtering
     """
     if not is_multi_tenant_app:
-        logger.debug(f"Skipping tenant filtering for couch-sitter _all_docs query")
+        logger.debug("Skipping tenant filtering for couch-sitter _all_docs query")
         return query_params or ""
 
-    logger.debug(f"Adding tenant filtering for multi-tenant _all_docs query: {tenant_id}")
+    logger.debug("Adding tenant filtering for multi-tenant _all_docs query: %s", tenant_id)
     # Add start/end keys for tenant filtering
     if query_params:
         return f"{query_params}&start_key=\"{tenant_id}:\"&end_key=\"{tenant_id}:\ufff0\""
     else:
         return f"start_key=\"{tenant_id}:\"&end_key=\"{tenant_id}:\ufff0\""
 
+def rewrite_changes_query(qs_params: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Add seq_interval to a _changes query (parse_qs-style dict) when absent.
+
+    seq_interval lets CouchDB skip computing the composite sequence for every
+    row; last_seq is still returned for checkpointing. Longpoll and continuous
+    feeds are left alone because clients rely on each row's seq there.
+    """
+    if "seq_interval" in qs_params:
+        return qs_params
+    if qs_params.get("feed", [""])[0] in ("longpoll", "continuous"):
+        return qs_params
+
+    qs_params["seq_interval"] = [qs_params.get("limit", ["1000"])[0] or "1000"]
+    return qs_params
+
 def rewrite_find_query(body: Dict[str, Any], tenant_id: str, is_multi_tenant_app: bool = False) -> Dict[str, Any]:
     """
     Rewrite _find query to inject tenant filter (conditional based on application type).
@@ -598,16 +656,16 @@ def rewrite_find_query(body: Dict[str, Any], tenant_id: str, is_multi_tenant_app
     For couch-sitter: No tenant filtering
     """
     if not is_multi_tenant_app:
-        logger.debug(f"Skipping tenant filtering for couch-sitter _find query")
+        logger.debug("Skipping tenant filtering for couch-sitter _find query")
         return body
 
-    logger.debug(f"Adding tenant filtering for multi-tenant _find query: {tenant_id}")
+    logger.debug("Adding tenant filtering for multi-tenant _find query: %s", tenant_id)
     # Inject tenant into selector
     if "selector" not in body:
         body["selector"] = {}
 
     body["selector"][TENANT_FIELD] = tenant_id
-    logger.debug(f"Rewrote _find query with tenant filter: {TENANT_FIELD}={tenant_id}")
+    logger.debug("Rewrote _find query with tenant filter: %s=%s", TENANT_FIELD, tenant_id)
     return body
 
 def rewrite_bulk_docs(body: Dict[str, Any], tenant_id: str, is_multi_tenant_app: bool = False) -> Dict[str, Any]:
@@ -617,82 +675,149 @@ def rewrite_bulk_docs(body: Dict[str, Any], tenant_id: str, is_multi_tenant_app:
     For multi-tenant apps: Always inject tenant ID
     For couch-sitter: Never inject tenant ID
     """
-    if "docs" in body:
-        for doc in body["docs"]:
-            if is_multi_tenant_app:
-                # Always inject tenant ID (override any existing value)
-                doc[TENANT_FIELD] = tenant_id
+    docs = body.get("docs")
+    if docs is None:
+        return body
 
-        if is_multi_tenant_app:
-            logger.debug(f"Injected tenant into {len(body.get('docs', []))} documents for multi-tenant app")
-        else:
-            logger.debug(f"Skipping tenant injection for {len(body.get('docs', []))} documents for couch-sitter app")
+    if is_multi_tenant_app:
+        # Always inject tenant ID (override any existing value)
+        field = TENANT_FIELD
+        for doc in docs:
+            doc[field] = tenant_id
+        logger.debug("Injected tenant into %s documents for multi-tenant app", len(docs))
+    else:
+        logger.debug("Skipping tenant injection for %s documents for couch-sitter app", len(docs))
     return body
 
-def filter_response_documents(content: bytes, tenant_id: str) -> bytes:
-    """Filter response to remove non-tenant documents (tenant mode always enabled)"""
-    try:
-        response = json.loads(content)
-
-        # Filter rows in _all_docs response
-        if "rows" in response:
-            filtered_rows = []
-            for row in response.get("rows", []):
-                if "doc" in row:
-                    doc = row["doc"]
-                    if filter_document_for_tenant(doc, tenant_id):
-                        filtered_rows.append(row)
-                else:
-                    # For responses without embedded docs, check value
-                    if row.get("value", {}).get(TENANT_FIELD) == tenant_id:
-                        filtered_rows.append(row)
+def filter_response_dict(response: Dict[str, Any], tenant_id: str) -> Dict[str, Any]:
+    """Remove non-tenant documents from a parsed _all_docs/_find response in place"""
+    dropped = 0
+
+    # Filter rows in _all_docs response; rows without embedded docs carry the tenant in value.
+    # Deleted keys come back with "doc": null, as in filter_rows_stream
+    if "rows" in response:
+        rows = response.get("rows", [])
+        filtered_rows = [
+            row for row in rows
+            if ((row["doc"] or {}).get(TENANT_FIELD) if "doc" in row
+                else (row.get("value") or {}).get(TENANT_FIELD)) == tenant_id
+        ]
+        dropped += len(rows) - len(filtered_rows)
+
+        response["rows"] = filtered_rows
+        response["total_rows"] = len(filtered_rows)
+
+    # Filter results in _find response
+    if "docs" in response:
+        docs = response.get("docs", [])
+        filtered_docs = [doc for doc in docs if doc.get(TENANT_FIELD) == tenant_id]
+        dropped += len(docs) - len(filtered_docs)
 
-            response["rows"] = filtered_rows
-            response["total_rows"] = len(filtered_rows)
+        response["docs"] = filtered_docs
 
-        # Filter results in _find response
-        if "docs" in response:
-            filtered_docs = []
-            for doc in response.get("docs", []):
-                if filter_document_for_tenant(doc, tenant_id):
-                    filtered_docs.append(doc)
+    # One summary line instead of a warning per rejected document
+    if dropped:
+        logger.warning("Access denied: filtered %s documents not belonging to tenant '%s'", dropped, tenant_id)
 
-            response["docs"] = filtered_docs
+    return response
 
-        return json.dumps(response).encode()
-    except (json.JSONDecodeError, KeyError) as e:
+def filter_response_documents(content: bytes, tenant_id: str) -> bytes:
+    """Filter response to remove non-tenant documents (tenant mode always enabled)"""
+    try:
+        return orjson.dumps(filter_response_dict(orjson.loads(content), tenant_id))
+    except (orjson.JSONDecodeError, KeyError) as e:
         logger.warning(f"Could not filter response: {e}")
         return content
 
+async def filter_rows_stream(lines: AsyncIterator[str], tenant_id: str) -> AsyncIterator[bytes]:
+    """
+    Tenant-filter an _all_docs/_find response line by line as it arrives.
+
+    CouchDB writes the opening of the object up to '"rows":[' (or '"docs":[')
+    on one line, then one row per line, then the closing bracket. Each row is
+    parsed and checked on its own, so the response is never held in memory.
+    total_rows can only be known at the end, so it is moved after the rows.
+    Output that isn't laid out that way is buffered and filtered whole.
+    """
+    field = None
+    has_total_rows = False
+    kept = dropped = 0
+    in_rows = False
+
+    async for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        if field is None:
+            if not (stripped.endswith('"rows":[') or stripped.endswith('"docs":[')):
+                rest = [line] + [more async for more in lines]
+                yield filter_response_documents("\n".join(rest).encode(), tenant_id)
+                return
+            field = stripped[-7:-3]
+            meta = orjson.loads(stripped[:-len('"rows":[')].rstrip(",") + "}")
+            has_total_rows = meta.pop("total_rows", None) is not None
+            opening = orjson.dumps(meta)[:-1] + (b"," if meta else b"")
+            yield opening + f'"{field}":['.encode()
+            in_rows = True
+        elif in_rows and stripped.startswith("]"):
+            closing = b"\r\n]"
+            if has_total_rows:
+                closing += b',"total_rows":%d' % kept
+            yield closing + stripped[1:].encode()
+            in_rows = False
+        elif in_rows:
+            row = orjson.loads(stripped.rstrip(","))
+            if field == "docs":
+                row_tenant = row.get(TENANT_FIELD)
+            elif "doc" in row:
+                row_tenant = (row["doc"] or {}).get(TENANT_FIELD)
+            else:
+                row_tenant = (row.get("value") or {}).get(TENANT_FIELD)
+            if row_tenant == tenant_id:
+                yield (b",\r\n" if kept else b"\r\n") + orjson.dumps(row)
+                kept += 1
+            else:
+                dropped += 1
+        else:
+            # Trailing members after the rows (e.g. _find's bookmark)
+            yield b"\r\n" + stripped.encode()
+
+    if dropped:
+        logger.warning("Access denied: filtered %s documents not belonging to tenant '%s'", dropped, tenant_id)
+
+def filter_changes_dict(response: Dict[str, Any], tenant_id: str) -> Dict[str, Any]:
+    """Remove non-tenant documents from a parsed _changes response in place"""
+    # Filter results in _changes response
+    if "results" in response:
+        results = response.get("results", [])
+        # Changes without doc (deleted docs) are matched on the doc_id pattern instead
+        id_prefix = f"{tenant_id}:"
+        filtered_results = [
+            change for change in results
+            if ((change["doc"] or {}).get(TENANT_FIELD) == tenant_id if "doc" in change
+                else (not change.get("id", "") or change.get("id", "").startswith(id_prefix)))
+        ]
+        dropped = len(results) - len(filtered_results)
+        if dropped:
+            logger.warning("Access denied: filtered %s changes not belonging to tenant '%s'", dropped, tenant_id)
+
+        response["results"] = filtered_results
+        # Note: CouchDB _changes doesn't have total_rows, but we could add last_seq filtering if needed
+
+    return response
+
 def filter_changes_response(content: bytes, tenant_id: str) -> bytes:
     """Filter _changes response to remove non-tenant documents (tenant mode always enabled)"""
     try:
-        response = json.loads(content)
-
-        # Filter results in _changes response
-        if "results" in response:
-            filtered_results = []
-            for change in response.get("results", []):
-                # Check if the change has document data
-                if "doc" in change:
-                    doc = change["doc"]
-                    if filter_document_for_tenant(doc, tenant_id):
-                        filtered_results.append(change)
-                else:
-                    # For changes without doc (deleted docs), include if tenant matches
-                    # For deleted docs, we need to check the doc_id pattern
-                    doc_id = change.get("id", "")
-                    if doc_id.startswith(f"{tenant_id}:") or not doc_id:
-                        filtered_results.append(change)
-
-            response["results"] = filtered_results
-            # Note: CouchDB _changes doesn't have total_rows, but we could add last_seq filtering if needed
-
-        return json.dumps(response).encode()
-    except (json.JSONDecodeError, KeyError) as e:
+        return orjson.dumps(filter_changes_dict(orjson.loads(content), tenant_id))
+    except (orjson.JSONDecodeError, KeyError) as e:
         logger.warning(f"Could not filter _changes response: {e}")
         return content
 
+# Connection-level headers that must not be copied from the upstream response
+_HOP_BY_HOP_HEADERS = frozenset({"connection", "keep-alive", "transfer-encoding", "te", "trailer", "upgrade"})
+
 async def proxy_to_couchdb_direct(request: Request, path: str):
     """Proxy request directly to CouchDB without JWT validation (for public endpoints)"""
     # Build CouchDB URL
@@ -709,38 +834,40 @@ async def proxy_to_couchdb_direct(request: Request, path: str):
 
     # Forward request to CouchDB
     try:
-        async with httpx.AsyncClient() as client:
-            # Copy headers, excluding host
-            headers = {}
-            for key, value in request.headers.items():
-                if key.lower() not in ["host"]:
-                    headers[key] = value
-
-            # Add CouchDB authentication if configured
-            basic_auth = get_basic_auth_header()
-            if basic_auth:
-                headers["Authorization"] = basic_auth
-
-            logger.debug(f"Direct proxy: {request.method} /{path} -> {couchdb_url}")
-
-            response = await client.request(
-                method=request.method,
-                url=couchdb_url,
-                headers=headers,
-                content=body,
-                follow_redirects=True,
-                timeout=30.0
-            )
-
-            logger.debug(f"CouchDB response: {response.status_code} for {request.method} /{path}")
-
-            # Return response from CouchDB
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.headers.get("content-type")
-            )
+        client = get_http_client()
+        # Copy headers, excluding host
+        headers = {}
+        for key, value in request.headers.items():
+            if key.lower() not in ["host"]:
+                headers[key] = value
+
+        # Add CouchDB authentication if configured
+        basic_auth = BASIC_AUTH_HEADER
+        if basic_auth:
+            headers["Authorization"] = basic_auth
+
+        logger.debug("Direct proxy: %s /%s -> %s", request.method, path, couchdb_url)
+
+        upstream_request = client.build_request(
+            method=request.method,
+            url=couchdb_url,
+            headers=headers,
+            content=body,
+            timeout=DEFAULT_TIMEOUT
+        )
+        response = await client.send(upstream_request, stream=True, follow_redirects=True)
+
+        logger.debug("CouchDB response: %s for %s /%s", response.status_code, request.method, path)
+
+        # Nothing is filtered here, so pass the raw (still-encoded) bytes straight
+        # through instead of buffering the whole body; hop-by-hop headers are dropped
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS},
+            media_type=response.headers.get("content-type"),
+            background=BackgroundTask(response.aclose),
+        )
 
     except httpx.ConnectError as e:
         logger.error(f"Failed to connect to CouchDB: {e}")
@@ -755,34 +882,48 @@ async def proxy_to_couchdb_direct(request: Request, path: str):
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI application"""
     # Startup
-    logger.info(f"Starting CouchDB JWT Proxy on {PROXY_HOST}:{PROXY_PORT}")
-    logger.info(f"Proxying to CouchDB at {COUCHDB_INTERNAL_URL}")
+    logger.info("Starting CouchDB JWT Proxy on %s:%s", PROXY_HOST, PROXY_PORT)
+    logger.info("Proxying to CouchDB at %s", COUCHDB_INTERNAL_URL)
 
     # Initialize applications from database
     await initialize_applications()
 
     # CouchDB credentials
     if COUCHDB_USER:
-        logger.info(f"✓ CouchDB authentication enabled (user: {COUCHDB_USER})")
+        logger.info("✓ CouchDB authentication enabled (user: %s)", COUCHDB_USER)
     else:
         logger.warning(f"⚠ No CouchDB credentials configured")
 
     # Tenant mode (always enabled)
-    logger.info(f"✓ Tenant mode ENABLED (always)")
-    logger.info(f"  Tenant field: {TENANT_FIELD}")
+    logger.info("✓ Tenant mode ENABLED (always)")
+    logger.info("  Tenant field: %s", TENANT_FIELD)
 
-    logger.info(f"Logging level: {LOG_LEVEL}")
+    logger.info("Logging level: %s", LOG_LEVEL)
 
     # Start periodic cleanup service
-    logger.info(f"Starting periodic cleanup service (interval: 24 hours)")
+    logger.info("Starting periodic cleanup service (interval: 24 hours)")
     cleanup_service.start_periodic_cleanup()
 
+    # Start batched auth-event writer
+    if auth_log_service:
+        auth_log_service.start_batch_writer()
+
     yield
 
     # Shutdown
     logger.info("Shutting down CouchDB JWT Proxy")
     await cleanup_service.stop_periodic_cleanup()
     logger.info("Cleanup service stopped")
+    if auth_log_service:
+        await auth_log_service.stop_batch_writer()
+    if _http_client is not None:
+        await _http_client.aclose()
+    if _feed_client is not None:
+        await _feed_client.aclose()
+    await couch_sitter_service.close()
+    await invite_service.close()
+    if hasattr(extract_tenant, '_tenant_service'):
+        await extract_tenant._tenant_service.close()
 
 # Rate Limiting (CWE-770: No Rate Limiting on Auth Endpoints)
 limiter = Limiter(key_func=get_remote_address)
@@ -811,10 +952,10 @@ try:
     print("[EARLY ROUTER REGISTRATION] About to call create_tenant_router", flush=True)
     tenant_router = create_tenant_router(couch_sitter_service, invite_service)
     print(f"[EARLY ROUTER REGISTRATION] Tenant router created successfully", flush=True)
-    logger.info(f"[EARLY ROUTER REGISTRATION] Tenant router has {len(tenant_router.routes)} routes:")
+    logger.info("[EARLY ROUTER REGISTRATION] Tenant router has %s routes:", len(tenant_router.routes))
     for route in tenant_router.routes:
         print(f"   - {route.path} ({route.methods})", flush=True)
-        logger.info(f"   - {route.path} ({route.methods})")
+        logger.info("   - %s (%s)", route.path, route.methods)
     app.include_router(tenant_router)
     print("[EARLY ROUTER REGISTRATION] Router included successfully", flush=True)
     logger.info("[EARLY ROUTER REGISTRATION] Tenant and invitation routes registered successfully")
@@ -845,7 +986,7 @@ async def startup_event():
     
     # Ensure auth log database exists
     if auth_log_service:
-        logger.info(f"[Startup] Ensuring auth log database exists at: {COUCH_SITTER_LOG_DB_URL}")
+        logger.info("[Startup] Ensuring auth log database exists at: %s", COUCH_SITTER_LOG_DB_URL)
         try:
             success = await auth_log_service.ensure_database_exists()
             if success:
@@ -867,6 +1008,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "HEAD", "COPY", "PATCH", "OPTIONS"],
     allow_headers=["accept", "authorization", "content-type", "origin", "x-csrf-token"],
+    expose_headers=["X-Bookmark"],  # Invitation list paging (see tenant_routes)
+    max_age=86400,  # Let browsers cache preflights for a day instead of Starlette's 10 minutes
 )
 
 # Add rate limit error handler
@@ -895,7 +1038,8 @@ async def log_requests(request: Request, call_next):
         raise
 
 async def initialize_applications():
-    """No-op: Nostr NIP-98 auth does not require APPLICATIONS dict."""
+    """Nostr NIP-98 auth does not require APPLICATIONS dict; only refresh the database whitelist."""
+    refresh_allowed_dbs()
     logger.info("NIP-98 auth active — no application issuer registration needed")
 
 @app.get("/active-tenant")
@@ -903,7 +1047,7 @@ async def get_active_tenant(
     request: Request,
     authorization: Optional[str] = Header(None)
 ):
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
 
     try:
@@ -951,20 +1095,19 @@ async def get_auth_logs(
         raise HTTPException(status_code=503, detail="Auth logging not configured")
     
     # Validate authorization header
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
     
     try:
         import time
         start = time.time()
-        logger.info(f"[auth-logs] Request started")
+        logger.info("[auth-logs] Request started")
         
         # Verify JWT to ensure user is authenticated
-        token = authorization[7:]
         jwt_start = time.time()
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
-        logger.info(f"[auth-logs] JWT verification took {(time.time() - jwt_start)*1000:.0f}ms")
+        logger.info("[auth-logs] JWT verification took %.0fms", (time.time() - jwt_start)*1000)
         
         # TODO: Add admin role check once roles are implemented
         # For now, any authenticated user can view logs (consider restricting to admins)
@@ -995,32 +1138,32 @@ async def get_auth_logs(
         
         view_url = f"{view_url}{view_name}?include_docs=true&descending=true&startkey={endkey}&endkey={startkey}&limit={min(limit, 1000)}&skip={skip}"
         
-        logger.info(f"[auth-logs] Querying view: {view_url}")
+        logger.info("[auth-logs] Querying view: %s", view_url)
         
         # Execute query via httpx directly to log database
-        async with httpx.AsyncClient() as client:
-            headers = auth_log_service.auth_headers.copy()
-            
-            response = await client.get(view_url, headers=headers)
-            
-            logger.info(f"[auth-logs] Response status: {response.status_code}")
-            
-            if response.status_code != 200:
-                logger.error(f"[auth-logs] Failed to query auth logs: {response.status_code}")
-                logger.error(f"[auth-logs] Response body: {response.text}")
-                raise HTTPException(status_code=500, detail="Failed to retrieve logs")
-            
-            result = response.json()
-            # Convert view rows to docs format
-            docs = [row.get("doc") for row in result.get("rows", []) if row.get("doc")]
-            logger.info(f"[auth-logs] Results: {len(docs)} docs returned")
-            logger.info(f"[auth-logs] Total request time: {(time.time() - start)*1000:.0f}ms")
-            return {
-                "docs": docs,
-                "bookmark": None,
-                "execution_stats": None
-            }
-    
+        client = get_http_client()
+        headers = auth_log_service.auth_headers.copy()
+        
+        response = await client.get(view_url, headers=headers)
+        
+        logger.info("[auth-logs] Response status: %s", response.status_code)
+        
+        if response.status_code != 200:
+            logger.error(f"[auth-logs] Failed to query auth logs: {response.status_code}")
+            logger.error(f"[auth-logs] Response body: {response.text}")
+            raise HTTPException(status_code=500, detail="Failed to retrieve logs")
+        
+        result = response.json()
+        # Convert view rows to docs format
+        docs = [row.get("doc") for row in result.get("rows", []) if row.get("doc")]
+        logger.info("[auth-logs] Results: %s docs returned", len(docs))
+        logger.info("[auth-logs] Total request time: %.0fms", (time.time() - start)*1000)
+        return {
+            "docs": docs,
+            "bookmark": None,
+            "execution_stats": None
+        }
+
     except HTTPException:
         raise
     except Exception as e:
@@ -1050,13 +1193,12 @@ async def get_auth_logs_stats(
         raise HTTPException(status_code=503, detail="Auth logging not configured")
     
     # Validate authorization header
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
     
     try:
         # Verify JWT to ensure user is authenticated
-        token = authorization[7:]
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
         # TODO: Add admin role check once roles are implemented
         
@@ -1083,55 +1225,55 @@ async def get_auth_logs_stats(
             query["selector"]["status"] = status
         
         # Fetch all logs for the period
-        async with httpx.AsyncClient() as client:
-            headers = auth_log_service.auth_headers.copy()
-            headers["Content-Type"] = "application/json"
-            
-            response = await client.post(
-                f"{auth_log_service.db_url}/_find",
-                json=query,
-                headers=headers
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to query auth logs for stats: {response.status_code} {response.text}")
-                raise HTTPException(status_code=500, detail="Failed to retrieve stats")
-            
-            result = response.json()
-            docs = result.get("docs", [])
-            
-            # Calculate statistics
-            stats = {
-                "period_days": days,
-                "total_events": len(docs),
-                "by_action": {},
-                "by_status": {},
-                "successful_logins": 0,
-                "failed_authentications": 0,
-                "rate_limit_events": 0,
-                "unique_users": len(set(doc.get("user_id") for doc in docs if doc.get("user_id"))),
-                "unique_tenants": len(set(doc.get("tenant_id") for doc in docs if doc.get("tenant_id"))),
-                "unique_ips": len(set(doc.get("ip") for doc in docs if doc.get("ip")))
-            }
+        client = get_http_client()
+        headers = auth_log_service.auth_headers.copy()
+        headers["Content-Type"] = "application/json"
+        
+        response = await client.post(
+            f"{auth_log_service.db_url}/_find",
+            json=query,
+            headers=headers
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to query auth logs for stats: {response.status_code} {response.text}")
+            raise HTTPException(status_code=500, detail="Failed to retrieve stats")
+        
+        result = response.json()
+        docs = result.get("docs", [])
+        
+        # Calculate statistics
+        stats = {
+            "period_days": days,
+            "total_events": len(docs),
+            "by_action": {},
+            "by_status": {},
+            "successful_logins": 0,
+            "failed_authentications": 0,
+            "rate_limit_events": 0,
+            "unique_users": len(set(doc.get("user_id") for doc in docs if doc.get("user_id"))),
+            "unique_tenants": len(set(doc.get("tenant_id") for doc in docs if doc.get("tenant_id"))),
+            "unique_ips": len(set(doc.get("ip") for doc in docs if doc.get("ip")))
+        }
+        
+        # Aggregate by action and status
+        for doc in docs:
+            action = doc.get("action", "unknown")
+            status = doc.get("status", "unknown")
             
-            # Aggregate by action and status
-            for doc in docs:
-                action = doc.get("action", "unknown")
-                status = doc.get("status", "unknown")
-                
-                stats["by_action"][action] = stats["by_action"].get(action, 0) + 1
-                stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
-                
-                # Count specific events
-                if action == "login" and status == "success":
-                    stats["successful_logins"] += 1
-                elif status == "failed":
-                    stats["failed_authentications"] += 1
-                elif action == "rate_limited":
-                    stats["rate_limit_events"] += 1
+            stats["by_action"][action] = stats["by_action"].get(action, 0) + 1
+            stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
             
-            return stats
-    
+            # Count specific events
+            if action == "login" and status == "success":
+                stats["successful_logins"] += 1
+            elif status == "failed":
+                stats["failed_authentications"] += 1
+            elif action == "rate_limited":
+                stats["rate_limit_events"] += 1
+        
+        return stats
+
     except HTTPException:
         raise
     except Exception as e:
@@ -1193,7 +1335,8 @@ async def create_session(request: Request, authorization: Optional[str] = Header
     """
     body = await request.body()
     url = str(request.url)
-    pubkey = verify_nip98(authorization, url, "POST", body, NIP98_TIME_TOLERANCE)
+    # Schnorr verification is pure-Python EC math; keep it off the event loop
+    pubkey = await asyncio.to_thread(verify_nip98, authorization, url, "POST", body, NIP98_TIME_TOLERANCE)
 
     # Ensure user exists (creates user + personal tenant on first login)
     user_tenant_info = await couch_sitter_service.ensure_user_exists(
@@ -1208,7 +1351,7 @@ async def create_session(request: Request, authorization: Optional[str] = Header
         ttl=SESSION_TTL_SECONDS,
     )
 
-    logger.info(f"Session issued for pubkey {pubkey[:16]}... user_id={user_tenant_info.user_id}")
+    logger.info("Session issued for pubkey %s... user_id=%s", pubkey[:16], user_tenant_info.user_id)
     return {
         "token": token_data["token"],
         "pubkey": pubkey,
@@ -1249,26 +1392,30 @@ async def proxy_couchdb_streaming(
         qs_params["filter"] = ["_selector"]
         import json as _json
         qs_params["selector"] = [_json.dumps({TENANT_FIELD: tenant_id})]
+    qs_params = rewrite_changes_query(qs_params)
     encoded_qs = urlencode({k: v[0] for k, v in qs_params.items()})
     if encoded_qs:
         couchdb_url += f"?{encoded_qs}"
-    logger.info(f"Streaming _changes with tenant filter '{tenant_id}' to: {couchdb_url}")
+    logger.info("Streaming _changes with tenant filter '%s' to: %s", tenant_id, couchdb_url)
     
+    # Only long-lived feeds need an unbounded timeout and the separate feed pool;
+    # a normal feed is a plain request. query_params is already parsed, so this
+    # is a dict lookup.
+    is_long_lived = request.query_params.get("feed") in _LONG_LIVED_FEEDS
+    client = get_feed_client() if is_long_lived else get_http_client()
+
     # Generator function that keeps the stream context alive
     async def stream_from_couchdb():
-        # Keep client and stream alive for the duration of iteration
-        async with httpx.AsyncClient(timeout=None) as client:
-            # Add CouchDB authentication
-            headers = {}
-            basic_auth = get_basic_auth_header()
-            if basic_auth:
-                headers["Authorization"] = basic_auth
-            
-            # Stream the response
-            async with client.stream("GET", couchdb_url, headers=headers) as response:
-                # Iterate over chunks while keeping stream open
-                async for chunk in response.aiter_bytes():
-                    yield chunk
+        # Add CouchDB authentication
+        headers = {}
+        basic_auth = BASIC_AUTH_HEADER
+        if basic_auth:
+            headers["Authorization"] = basic_auth
+        
+        # Stream the response, keeping it open while iterating
+        async with client.stream("GET", couchdb_url, headers=headers) as response:
+            async for chunk in response.aiter_bytes():
+                yield chunk
     
     # Return streaming response
     return StreamingResponse(
@@ -1276,17 +1423,78 @@ async def proxy_couchdb_streaming(
         media_type="application/json"
     )
 
+async def proxy_couchdb_filtered_rows(
+    path: str,
+    method: str,
+    body_dict: Optional[Dict[str, Any]],
+    params: Optional[Dict[str, str]],
+    tenant_id: str
+):
+    """
+    Streaming proxy for _all_docs/_find that tenant-filters rows as they arrive.
+
+    Like the _changes streamer this bypasses the DAL; see filter_rows_stream.
+    """
+    headers = {"Accept": "application/json"}
+    basic_auth = get_basic_auth_header()
+    if basic_auth:
+        headers["Authorization"] = basic_auth
+    content = None
+    if body_dict is not None:
+        content = orjson.dumps(body_dict)
+        headers["Content-Type"] = "application/json"
+
+    client = get_http_client()
+    upstream_request = client.build_request(
+        method, f"{COUCHDB_INTERNAL_URL}/{path}", params=params, headers=headers, content=content
+    )
+    try:
+        response = await client.send(upstream_request, stream=True)
+    except httpx.HTTPError as e:
+        logger.error("CouchDB unavailable for %s /%s: %s", method, path, e)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    if response.status_code != 200:
+        # Errors are small; surface them the same way the DAL path does
+        error_body = await response.aread()
+        await response.aclose()
+        try:
+            reason = orjson.loads(error_body).get("reason", "Unknown error")
+        except (orjson.JSONDecodeError, AttributeError):
+            reason = "Unknown error"
+        raise HTTPException(status_code=response.status_code, detail=reason)
+
+    return StreamingResponse(
+        filter_rows_stream(response.aiter_lines(), tenant_id),
+        media_type="application/json",
+        background=BackgroundTask(response.aclose),
+    )
+
+async def read_json_body(request: Request) -> Dict[str, Any]:
+    """
+    Parse a virtual-table write body as a JSON object.
+
+    Handlers call this after checking the session token, so an
+    unauthenticated request gets a 401 whatever its body looks like.
+    """
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    return body
+
 # Add Virtual Tables Routes (BEFORE catch-all to ensure /__users/* and /__tenants/* match first)
 
 @app.get("/__users/{user_id}")
 async def get_user(user_id: str, authorization: Optional[str] = Header(None)):
     """GET /__users/<id> - Get user document"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1300,12 +1508,11 @@ async def get_user(user_id: str, authorization: Optional[str] = Header(None)):
 @app.put("/__users/{user_id}")
 async def update_user(user_id: str, request: Request, authorization: Optional[str] = Header(None)):
     """PUT /__users/<id> - Update user document"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1320,18 +1527,17 @@ async def update_user(user_id: str, request: Request, authorization: Optional[st
     # application_id from env var
     application_id = os.getenv("APPLICATION_ID", "roady")
 
-    body = await request.json()
+    body = await read_json_body(request)
     return await virtual_table_handler.update_user(user_id, requesting_user_id, body, issuer=issuer, sid=sid, application_id=application_id)
 
 @app.delete("/__users/{user_id}")
 async def delete_user(user_id: str, authorization: Optional[str] = Header(None)):
     """DELETE /__users/<id> - Soft-delete user document"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1345,12 +1551,11 @@ async def delete_user(user_id: str, authorization: Optional[str] = Header(None))
 @app.get("/__tenants/{tenant_id}")
 async def get_tenant(tenant_id: str, authorization: Optional[str] = Header(None)):
     """GET /__tenants/<id> - Get tenant document"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1372,12 +1577,11 @@ async def get_tenant(tenant_id: str, authorization: Optional[str] = Header(None)
 async def list_tenants(authorization: Optional[str] = Header(None)):
     """GET /__tenants - List all tenants user is member of"""
     logger.info("[LIST_TENANTS] GET /__tenants called")
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1393,20 +1597,19 @@ async def list_tenants(authorization: Optional[str] = Header(None)):
     except UserIdFormatError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    logger.info(f"[LIST_TENANTS] Getting tenants for user: {user_id}")
+    logger.info("[LIST_TENANTS] Getting tenants for user: %s", user_id)
     result = await virtual_table_handler.list_tenants(user_id)
-    logger.info(f"[LIST_TENANTS] Returning {len(result)} tenants")
+    logger.info("[LIST_TENANTS] Returning %s tenants", len(result))
     return result
 
 @app.post("/__tenants")
 async def create_tenant(request: Request, authorization: Optional[str] = Header(None)):
     """POST /__tenants - Create new tenant"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1422,20 +1625,19 @@ async def create_tenant(request: Request, authorization: Optional[str] = Header(
     except UserIdFormatError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    logger.info(f"[ROUTE] POST /__tenants: user_id={user_id}")
-    body = await request.json()
+    logger.info("[ROUTE] POST /__tenants: user_id=%s", user_id)
+    body = await read_json_body(request)
     result = await virtual_table_handler.create_tenant(user_id, body)
     return result
 
 @app.put("/__tenants/{tenant_id}")
 async def update_tenant(tenant_id: str, request: Request, authorization: Optional[str] = Header(None)):
     """PUT /__tenants/<id> - Update tenant document"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1458,19 +1660,22 @@ async def update_tenant(tenant_id: str, request: Request, authorization: Optiona
     except UserIdFormatError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    logger.info(f"[ROUTE] PUT /__tenants/{tenant_id}: user_id={user_id}")
-    body = await request.json()
-    return await virtual_table_handler.update_tenant(tenant_id, user_id, body)
+    logger.info("[ROUTE] PUT /__tenants/%s: user_id=%s", tenant_id, user_id)
+    body = await read_json_body(request)
+    try:
+        return await virtual_table_handler.update_tenant(tenant_id, user_id, body)
+    finally:
+        # The write bypasses CouchSitterService, so drop its cached copy here
+        couch_sitter_service.invalidate_tenant(tenant_id)
 
 @app.delete("/__tenants/{tenant_id}")
 async def delete_tenant(tenant_id: str, authorization: Optional[str] = Header(None)):
     """DELETE /__tenants/<id> - Soft-delete tenant"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1496,7 +1701,11 @@ async def delete_tenant(tenant_id: str, authorization: Optional[str] = Header(No
     # Get user's active_tenant_id for validation
     active_tenant_id = payload.get("active_tenant_id")
     
-    return await virtual_table_handler.delete_tenant(tenant_id, user_id, active_tenant_id or "")
+    try:
+        return await virtual_table_handler.delete_tenant(tenant_id, user_id, active_tenant_id or "")
+    finally:
+        # The write bypasses CouchSitterService, so drop its cached copy here
+        couch_sitter_service.invalidate_tenant(tenant_id)
 
 @app.get("/__users/_changes")
 async def user_changes(
@@ -1504,16 +1713,11 @@ async def user_changes(
     authorization: Optional[str] = Header(None)
 ):
     """GET /__users/_changes - Get user document changes"""
-    logger.info(f"🎯 EXPLICITLY HANDLING: GET /__users/_changes")
-    logger.info(f"   Authorization header present: {bool(authorization)}")
-    
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         logger.error(f"❌ GET /__users/_changes - Missing or invalid auth header: {authorization[:50] if authorization else 'None'}")
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
-    logger.info(f"   Token length: {len(token)}")
-    session_payload = verify_session_token(f"Bearer {token}")
+    session_payload = verify_session_token(authorization)
     payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
         
     if not payload:
@@ -1531,26 +1735,26 @@ async def user_changes(
     limit = request.query_params.get("limit")
     include_docs = request.query_params.get("include_docs", "false").lower() == "true"
     
-    logger.info(f"✅ GET /__users/_changes - User: {requesting_user_id[:20]}..., Since: {since}, Include docs: {include_docs}")
-    
     result = await virtual_table_handler.get_user_changes(
         requesting_user_id,
         since=since,
         limit=int(limit) if limit else None,
         include_docs=include_docs
     )
-    logger.info(f"✅ GET /__users/_changes - Returning {len(result.get('results', []))} changes")
+    logger.info(
+        "✅ GET /__users/_changes - User: %s..., Since: %s, Include docs: %s, Returning %s changes",
+        requesting_user_id[:20], since, include_docs, len(result.get('results', []))
+    )
     return result
 
 @app.post("/__users/_bulk_docs")
 async def user_bulk_docs(request: Request, authorization: Optional[str] = Header(None)):
     """POST /__users/_bulk_docs - Bulk user operations"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1559,7 +1763,7 @@ async def user_bulk_docs(request: Request, authorization: Optional[str] = Header
     if not requesting_user_id:
         raise HTTPException(status_code=400, detail="Missing 'sub' in JWT")
     
-    body = await request.json()
+    body = await read_json_body(request)
     docs = body.get("docs", [])
     
     return await virtual_table_handler.bulk_docs_users(requesting_user_id, docs)
@@ -1570,16 +1774,11 @@ async def tenant_changes(
     authorization: Optional[str] = Header(None)
 ):
     """GET /__tenants/_changes - Get tenant document changes"""
-    logger.info(f"🎯 EXPLICITLY HANDLING: GET /__tenants/_changes")
-    logger.info(f"   Authorization header present: {bool(authorization)}")
-    
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         logger.error(f"❌ GET /__tenants/_changes - Missing or invalid auth header: {authorization[:50] if authorization else 'None'}")
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
-    logger.info(f"   Token length: {len(token)}")
-    session_payload = verify_session_token(f"Bearer {token}")
+    session_payload = verify_session_token(authorization)
     payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
         
     if not payload:
@@ -1597,26 +1796,26 @@ async def tenant_changes(
     limit = request.query_params.get("limit")
     include_docs = request.query_params.get("include_docs", "false").lower() == "true"
     
-    logger.info(f"✅ GET /__tenants/_changes - User: {requesting_user_id[:20]}..., Since: {since}, Include docs: {include_docs}")
-    
     result = await virtual_table_handler.get_tenant_changes(
         requesting_user_id,
         since=since,
         limit=int(limit) if limit else None,
         include_docs=include_docs
     )
-    logger.info(f"✅ GET /__tenants/_changes - Returning {len(result.get('results', []))} changes")
+    logger.info(
+        "✅ GET /__tenants/_changes - User: %s..., Since: %s, Include docs: %s, Returning %s changes",
+        requesting_user_id[:20], since, include_docs, len(result.get('results', []))
+    )
     return result
 
 @app.post("/__tenants/_bulk_docs")
 async def tenant_bulk_docs(request: Request, authorization: Optional[str] = Header(None)):
     """POST /__tenants/_bulk_docs - Bulk tenant operations"""
-    if not authorization or not authorization.startswith("Bearer "):
+    if extract_bearer(authorization) is None:
         raise HTTPException(status_code=401, detail="Missing authorization")
     
-    token = authorization[7:]
     try:
-        session_payload = verify_session_token(f"Bearer {token}")
+        session_payload = verify_session_token(authorization)
         payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     except HTTPException:
         raise HTTPException(status_code=401, detail="Invalid or expired session token")
@@ -1628,66 +1827,78 @@ async def tenant_bulk_docs(request: Request, authorization: Optional[str] = Head
     # Get user's active_tenant_id for validation
     active_tenant_id = payload.get("active_tenant_id")
     
-    body = await request.json()
+    body = await read_json_body(request)
     docs = body.get("docs", [])
     
-    return await virtual_table_handler.bulk_docs_tenants(
-        requesting_user_id,
-        active_tenant_id or "",
-        docs
-    )
+    try:
+        return await virtual_table_handler.bulk_docs_tenants(
+            requesting_user_id,
+            active_tenant_id or "",
+            docs
+        )
+    finally:
+        # The writes bypass CouchSitterService, so drop its cached copies here
+        for doc in docs:
+            if doc.get("_id"):
+                couch_sitter_service.invalidate_tenant(doc["_id"])
 
 logger.info("✓ Registered virtual table routes (__users, __tenants, _changes, _bulk_docs)")
 
-@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "HEAD", "COPY", "PATCH", "OPTIONS"])
+def invalidate_written_tenants(endpoint_path: str, body_dict: Optional[Dict[str, Any]]) -> None:
+    """Drop the tenants a couch-sitter write through the catch-all may have changed"""
+    doc_id = endpoint_path.split("/", 1)[0]
+    if doc_id.startswith("tenant_"):
+        couch_sitter_service.invalidate_tenant(doc_id)
+    elif doc_id == "_bulk_docs" and body_dict:
+        for doc in body_dict.get("docs", ()):
+            if isinstance(doc, dict) and str(doc.get("_id", "")).startswith("tenant_"):
+                couch_sitter_service.invalidate_tenant(doc["_id"])
+
 async def proxy_couchdb(
     request: Request,
     path: str,
-    authorization: Optional[str] = Header(None)
+    authorization: Optional[str],
+    method: str,
+    has_body: bool,
 ):
-    """Proxy requests to CouchDB with JWT validation and tenant enforcement"""
-
-    logger.debug(f"Incoming request: {request.method} /{path}")
+    """Proxy requests to CouchDB with JWT validation and tenant enforcement.
 
-    # CRITICAL: Block /api/* from reaching catch-all (should be handled by included routers)
-    if path.startswith("api/"):
-        logger.error(f"❌ /api/ path reached catch-all: {request.method} /{path}")
-        logger.error(f"   This means tenant/invitation API routes are not being registered properly")
-        raise HTTPException(status_code=500, detail="API route not registered")
+    Shared by the per-method catch-all routes below, which pass the method
+    and whether it carries a body as constants fixed at registration.
+    """
 
     # NOTE: Virtual table routes (/__users/*, /__tenants/*, etc.) are handled by explicit @app.get() routes above.
     # If they reach here, something went wrong with route matching.
     # This catch-all should NOT handle these paths.
-    if path.startswith("__users") or path.startswith("__tenants"):
-        logger.error(f"❌ Virtual table path reached catch-all: {request.method} /{path}")
+    if path.startswith(_RESERVED_PREFIXES):
+        logger.error(f"❌ Virtual table path reached catch-all: {method} /{path}")
         logger.error(f"   This means explicit virtual routes are not being registered properly")
         raise HTTPException(status_code=500, detail="Virtual table route not registered")
 
-    # Handle CORS preflight requests explicitly if middleware didn't catch them
-    if request.method == "OPTIONS":
-        return Response(status_code=200)
+    # CRITICAL: Block /api/* from reaching catch-all (should be handled by included routers)
+    if path.startswith("api/"):
+        logger.error(f"❌ /api/ path reached catch-all: {method} /{path}")
+        logger.error(f"   This means tenant/invitation API routes are not being registered properly")
+        raise HTTPException(status_code=500, detail="API route not registered")
 
-    # Special case: GET / is a public health/metadata endpoint (no JWT required)
-    if request.method == "GET" and path == "":
-        logger.info(f"Public health check: {request.method} /")
-        # Skip JWT validation for root path
-        return await proxy_to_couchdb_direct(request, path)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Incoming request: %s /%s", method, path)
 
     # Extract and validate JWT token
     if not authorization:
-        logger.warning(f"401 - Missing Authorization header | Client: {request.client.host} | Path: {request.method} /{path}")
+        logger.warning(f"401 - Missing Authorization header | Client: {request.client.host} | Path: {method} /{path}")
         logger.warning("Missing Authorization header in request")
 
         raise HTTPException(status_code=401, detail="Missing authorization header")
 
     # Parse Bearer token
-    if not authorization.startswith("Bearer "):
-        logger.warning(f"401 - Invalid auth header format | Client: {request.client.host} | Path: {request.method} /{path} | Header: {authorization[:50]}")
+    token = extract_bearer(authorization)
+    if token is None:
+        logger.warning(f"401 - Invalid auth header format | Client: {request.client.host} | Path: {method} /{path} | Header: {authorization[:50]}")
         raise HTTPException(status_code=401, detail="Invalid authorization header format - expected 'Bearer <token>'")
 
-    token = authorization[7:]  # Remove "Bearer " prefix
 
-    session_payload = verify_session_token(f"Bearer {token}")
+    session_payload = verify_session_token(authorization)
     payload = {"sub": session_payload["pubkey"], "user_id": session_payload["user_id"]}
     
     if not payload:
@@ -1695,7 +1906,7 @@ async def proxy_couchdb(
         unverified = decode_token_unsafe(token)
         token_preview = get_token_preview(token)
 
-        log_msg = f"401 - {error_reason} | Client: {request.client.host} | Path: {request.method} /{path} | Token: {token_preview}"
+        log_msg = f"401 - {error_reason} | Client: {request.client.host} | Path: {method} /{path} | Token: {token_preview}"
         if unverified:
             log_msg += f" | Unverified payload: sub={unverified.get('sub', 'N/A')}, exp={unverified.get('exp', 'N/A')}, iat={unverified.get('iat', 'N/A')}"
 
@@ -1703,14 +1914,14 @@ async def proxy_couchdb(
         
         # Log failed token validation
         if auth_log_service:
-            import asyncio
-            asyncio.create_task(auth_log_service.log_token_validation(
-                success=False,
+            auth_log_service.enqueue_auth_event(
+                action="token_validation",
+                status="failed",
                 ip=request.client.host if request.client else None,
                 issuer=unverified.get('iss') if unverified else None,
                 error_reason=error_reason,
-                endpoint=f"{request.method} /{path}"
-            ))
+                endpoint=f"{method} /{path}"
+            )
         
         raise HTTPException(status_code=401, detail=f"Invalid or expired token ({error_reason})")
 
@@ -1726,32 +1937,29 @@ async def proxy_couchdb(
         db_name = None
         endpoint_path = "_all_dbs"
     else:
-        # Extract database name and endpoint from path for all other endpoints
-        path_parts = path.split('/')
-        if not path_parts:
-            raise HTTPException(status_code=400, detail="Invalid request path")
-        db_name = path_parts[0]
+        # Extract database name and endpoint path (everything after the database name)
+        # in a single pass over the path
+        db_name, _, endpoint_path = path.partition('/')
 
-        # Extract endpoint path (everything after the database name)
-        endpoint_path = '/'.join(path_parts[1:]) if len(path_parts) > 1 else ''
+    # Classify the endpoint once from its first segment ("_local/x" -> "_local");
+    # a bare path such as "_find" classifies as itself. The dispatch checks below
+    # compare against this instead of re-scanning the path on every branch.
+    endpoint_kind = endpoint_path.partition('/')[0] if endpoint_path else path
+    # Last segment of the path, for checks on the document being addressed
+    path_tail = path.rpartition('/')[2]
     
     # SPECIAL HANDLING: Route _changes requests to streaming handler
     # Must be done before DAL processing to avoid timeout issues
-    if endpoint_path == "_changes" or path.endswith("/_changes"):
-        logger.info(f"Routing _changes request to streaming handler for {db_name}")
+    if endpoint_kind == "_changes":
+        logger.info("Routing _changes request to streaming handler for %s", db_name)
         return await proxy_couchdb_streaming(request, path, db_name, tenant_id, payload)
 
     # CRITICAL: Prevent accidental database creation
-    # Build allowed databases list dynamically from Application documents
-    # Always include couch-sitter (admin database) and system databases
-    # APPLICATION_ID may be comma-separated to allow multiple app databases (e.g. "roady,roady-staging")
-    app_dbs = {db.strip() for db in os.environ.get("APPLICATION_ID", "roady").split(",") if db.strip()}
-    allowed_databases = {'couch-sitter', '_users', '_replicator'} | app_dbs
-    # Convert to list for error message
-    allowed_databases_list = sorted(list(allowed_databases))
-    
+    # Allowed databases are precomputed by refresh_allowed_dbs()
     # Skip whitelist check for system endpoints (db_name is None)
-    if db_name is not None and db_name not in allowed_databases:
+    if db_name is not None and db_name not in _allowed_dbs_cache:
+        # Convert to list for error message (only on the rejection path)
+        allowed_databases_list = sorted(_allowed_dbs_cache)
         logger.error(f"403 - Attempted access to non-whitelisted database: {db_name}")
         logger.error(f"This may indicate a bug where database name was not properly specified")
         logger.error(f"Allowed databases (from Application documents): {allowed_databases_list}")
@@ -1763,7 +1971,7 @@ async def proxy_couchdb(
     
     # Additional check: Block PUT requests that would create databases
     # PUT /{db_name} without a document ID would create a database
-    if db_name is not None and request.method == "PUT" and not endpoint_path:
+    if db_name is not None and method == "PUT" and not endpoint_path:
         logger.error(f"403 - Blocked database creation attempt: PUT /{db_name}")
         logger.error(f"Database creation is not allowed through the proxy")
         raise HTTPException(
@@ -1772,42 +1980,36 @@ async def proxy_couchdb(
         )
 
 
-    # Log successful authentication with details
-    log_msg = f"✓ Authenticated | Client: {client_id}"
-    if tenant_id:
-        log_msg += f" | Tenant: {tenant_id}"
-    log_msg += f" | {request.method} /{path}"
-    
     # Log successful authentication event
     if auth_log_service:
-        import asyncio
-        asyncio.create_task(auth_log_service.log_auth_event(
+        auth_log_service.enqueue_auth_event(
             action="auth_request",
             status="success",
             user_id=client_id,
             tenant_id=tenant_id,
-            endpoint=f"{request.method} /{path}",
+            endpoint=f"{method} /{path}",
             ip=request.client.host if request.client else None,
             user_agent=request.headers.get("user-agent"),
             issuer=payload.get("iss")
-        ))
+        )
 
     # SECURITY: Never log full JWT payload (CWE-532)
     # Instead log only safe, non-sensitive attributes
-    logger.debug(f"🔐 JWT VALIDATED - {request.method} /{path}")
-    logger.debug(f"🎯 JWT Issuer: {payload.get('iss')}")
-    logger.debug(f"🗄️ Target Database: {db_name}")
-    logger.debug(f"📱 Application detected: {'📊 Multi-tenant' if is_multi_tenant_app else '🛋️ Couch-sitter'}")
-
-    # Safe logging: only log non-sensitive claim information
-    if logger.level <= logging.DEBUG:
-        logger.debug(f"User context | sub={payload.get('sub')} | tenant={tenant_id}")
-
-    logger.debug(log_msg)
+    # Argument evaluation (dict lookups, conditionals) is skipped entirely below DEBUG
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔐 JWT VALIDATED - %s /%s", method, path)
+        logger.debug("🎯 JWT Issuer: %s", payload.get('iss'))
+        logger.debug("🗄️ Target Database: %s", db_name)
+        logger.debug("📱 Application detected: %s", '📊 Multi-tenant' if is_multi_tenant_app else '🛋️ Couch-sitter')
+        # Safe logging: only log non-sensitive claim information
+        logger.debug("User context | sub=%s | tenant=%s", payload.get('sub'), tenant_id)
+        # Log successful authentication with details
+        logger.debug("✓ Authenticated | Client: %s%s | %s /%s", client_id,
+                     f" | Tenant: {tenant_id}" if tenant_id else "", method, path)
 
     # Check if endpoint is allowed (tenant mode always enabled)
-    if not is_endpoint_allowed(endpoint_path, request.method):
-        logger.warning(f"Access denied: {request.method} /{path} not allowed (endpoint: {endpoint_path})")
+    if not is_endpoint_allowed(endpoint_path, method):
+        logger.warning(f"Access denied: {method} /{path} not allowed (endpoint: {endpoint_path})")
         raise HTTPException(status_code=403, detail="Endpoint not allowed")
 
     # Tenant ID is always required - extract_tenant will raise if missing
@@ -1822,10 +2024,12 @@ async def proxy_couchdb(
     else:
         couchdb_url = f"{COUCHDB_INTERNAL_URL}/{path}"
     query_string = str(request.url.query) if request.url.query else ""
+    query_rewritten = False
 
     # Rewrite query parameters for tenant enforcement (conditional)
     if path == "_all_docs":
         query_string = rewrite_all_docs_query(query_string, tenant_id, is_multi_tenant_app)
+        query_rewritten = True
     elif path == "_changes":
         # For _changes, we need to filter by tenant_id in the response
         # CouchDB _changes doesn't support tenant filtering in query params
@@ -1838,83 +2042,102 @@ async def proxy_couchdb(
     # Get request body if present
     body = None
     body_dict = None
-    logger.debug(f"Request method: {request.method}, checking for body...")
-    if request.method in ["POST", "PUT", "PATCH"]:
-        logger.debug(f"Reading body for {request.method} request...")
+    logger.debug("Request method: %s, checking for body...", method)
+    # Skip the body read entirely for explicitly empty writes; a missing
+    # Content-Length (chunked upload) still has to be read
+    if has_body and request.headers.get("content-length") != "0":
+        logger.debug("Reading body for %s request...", method)
         body = await request.body()
-        logger.debug(f"Body received: {len(body) if body else 0} bytes")
+        logger.debug("Body received: %s bytes", len(body) if body else 0)
         if body:
             # Don't log body content for security - just size and type
             try:
-                body_dict = json.loads(body)
-                logger.debug(f"Body parsed as JSON with {len(body_dict)} keys")
-            except json.JSONDecodeError as e:
+                body_dict = orjson.loads(body)
+                logger.debug("Body parsed as JSON with %s keys", len(body_dict))
+            except orjson.JSONDecodeError as e:
                 logger.warning(f"Failed to parse body as JSON: {e}")
         else:
-            logger.debug(f"Body is empty for {request.method}")
+            logger.debug("Body is empty for %s", method)
     else:
-        logger.debug(f"No body expected for {request.method}")
-
-    # Rewrite body for tenant enforcement (conditional based on application type)
-    if body_dict:
-        if path == "_find":
-            body_dict = rewrite_find_query(body_dict, tenant_id, is_multi_tenant_app)
+        logger.debug("No body expected for %s", method)
+
+    # Rewrite body for tenant enforcement (multi-tenant apps only). The rewrite
+    # helpers are no-ops for couch-sitter, so that case skips the block outright.
+    # The DAL takes the dict as its payload, so the rewritten body is never
+    # re-serialized here.
+    tenant_scoped = False
+    if is_multi_tenant_app and body_dict:
+        if endpoint_kind == "_find":
+            body_dict = rewrite_find_query(body_dict, tenant_id, True)
+            # CouchDB now applies the tenant selector itself
+            tenant_scoped = True
         elif path == "_bulk_docs":
-            body_dict = rewrite_bulk_docs(body_dict, tenant_id, is_multi_tenant_app)
-        elif request.method in ["PUT"] and not path.startswith("_"):
-            # Single document creation/update - inject tenant ID for multi-tenant apps only
-            body_dict = inject_tenant_into_doc(body_dict, tenant_id, is_multi_tenant_app)
-        elif request.method == "POST" and not path.startswith("_") and "/" not in path:
-            # Document creation via POST to database - inject tenant ID for multi-tenant apps only
-            body_dict = inject_tenant_into_doc(body_dict, tenant_id, is_multi_tenant_app)
-
-        body = json.dumps(body_dict).encode()
-
-    # CRITICAL: Prevent deletion of admin tenant
-    ADMIN_TENANT_ID = "tenant_couch_sitter_admins"
-    
+            body_dict = rewrite_bulk_docs(body_dict, tenant_id, True)
+        elif method == "PUT" and not path.startswith("_"):
+            # Single document creation/update - inject tenant ID
+            body_dict = inject_tenant_into_doc(body_dict, tenant_id, True)
+        elif method == "POST" and not path.startswith("_") and "/" not in path:
+            # Document creation via POST to database - inject tenant ID
+            body_dict = inject_tenant_into_doc(body_dict, tenant_id, True)
+
+    # CRITICAL: Prevent deletion of admin tenant (ADMIN_TENANT_ID from couch_sitter_service)
     # Check 1: Direct DELETE or PUT to the document
-    if endpoint_path == ADMIN_TENANT_ID or path.endswith(f"/{ADMIN_TENANT_ID}"):
-        if request.method == "DELETE":
+    if endpoint_path and path_tail == ADMIN_TENANT_ID:
+        if method == "DELETE":
             logger.warning(f"Blocked attempt to DELETE admin tenant: {ADMIN_TENANT_ID}")
             raise HTTPException(status_code=403, detail="Deleting the admin tenant is not allowed")
         
-        if request.method == "PUT" and body_dict:
+        if method == "PUT" and body_dict:
             # Check for soft delete (deletedAt) or hard delete (_deleted)
             if body_dict.get("_deleted") is True or body_dict.get("deletedAt"):
                 logger.warning(f"Blocked attempt to soft/hard delete admin tenant via PUT: {ADMIN_TENANT_ID}")
                 raise HTTPException(status_code=403, detail="Deleting the admin tenant is not allowed")
 
-    # Check 2: Bulk operations (_bulk_docs)
-    if (endpoint_path == "_bulk_docs" or path.endswith("/_bulk_docs")) and body_dict:
-        docs = body_dict.get("docs", [])
-        for doc in docs:
-            if doc.get("_id") == ADMIN_TENANT_ID:
-                if doc.get("_deleted") is True or doc.get("deletedAt"):
-                    logger.warning(f"Blocked attempt to delete admin tenant via _bulk_docs: {ADMIN_TENANT_ID}")
-                    raise HTTPException(status_code=403, detail="Deleting the admin tenant is not allowed")
+    # Check 2: Bulk operations (_bulk_docs). The admin tenant only lives in the
+    # couch-sitter database, so app-database replication batches skip the scan.
+    if db_name == "couch-sitter" and endpoint_path == "_bulk_docs" and body_dict:
+        if any(
+            doc.get("_id") == ADMIN_TENANT_ID and (doc.get("_deleted") is True or doc.get("deletedAt"))
+            for doc in body_dict.get("docs", ())
+        ):
+            logger.warning(f"Blocked attempt to delete admin tenant via _bulk_docs: {ADMIN_TENANT_ID}")
+            raise HTTPException(status_code=403, detail="Deleting the admin tenant is not allowed")
+
+    # Starlette has already parsed (and memoized) the client's query string;
+    # only re-parse when the tenant rewrite above changed it. Starlette keeps
+    # blank values, which parse_qsl drops, so filter them out to match
+    if query_rewritten:
+        params = dict(parse_qsl(query_string)) if query_string else None
+    else:
+        params = {k: v for k, v in request.query_params.items() if v} or None
+
+    # Against a real CouchDB, responses that need row filtering are streamed and
+    # filtered row by row instead of being buffered whole by the DAL
+    if (
+        is_multi_tenant_app
+        and endpoint_kind in ("_all_docs", "_find")
+        and not (endpoint_kind == "_find" and tenant_scoped and not STRICT_TENANT_FILTER)
+        and isinstance(dal.backend, CouchBackend)
+    ):
+        return await proxy_couchdb_filtered_rows(path, method, body_dict, params, tenant_id)
 
     # Forward request to CouchDB via DAL
     try:
-        # Prepare payload
-        payload = None
-        if body_dict:
-            payload = body_dict
-        elif body:
-            try:
-                payload = json.loads(body)
-            except json.JSONDecodeError:
-                # If body is not JSON, we can't pass it to DAL easily if DAL expects dict
-                # But our DAL currently expects dict payload for POST/PUT
-                # If it's raw bytes, we might need to adjust DAL or just pass as is if DAL supported it
-                # For now, assume JSON for CouchDB operations
-                logger.warning("Request body is not valid JSON, passing as None to DAL")
-                pass
+        # Prepare payload. The body was already parsed into body_dict above (None
+        # when it was absent or not valid JSON), so reuse it instead of parsing
+        # the same bytes a second time.
+        payload = body_dict
+        if body and body_dict is None:
+            logger.warning("Request body is not valid JSON, passing as None to DAL")
 
         # Execute request via DAL
         # Note: DAL handles authentication and URL construction
-        params = dict(parse_qsl(query_string)) if query_string else None
-        dal_response = await dal.get(path, request.method, payload, params=params)
+        try:
+            dal_response = await dal.get(path, method, payload, params=params)
+        finally:
+            # These writes bypass CouchSitterService, so drop its cached copies here
+            if db_name == "couch-sitter" and method not in ("GET", "HEAD"):
+                invalidate_written_tenants(endpoint_path, body_dict)
         
         # Check for DAL errors
         if isinstance(dal_response, dict) and "error" in dal_response:
@@ -1945,23 +2168,18 @@ async def proxy_couchdb(
         if is_multi_tenant_app:
             # Use endpoint_path for checking which filter to apply
             # path contains "dbname/endpoint", endpoint_path contains "endpoint"
-            if endpoint_path in ["_all_docs", "_find"] or path in ["_all_docs", "_find"]:
-                # If response is a dict (parsed JSON), filter it directly
-                # We need to serialize to string for filter_response_documents if it expects string
-                # Or update filter_response_documents to handle dicts
-                # Let's assume we need to re-serialize for now or update the filter function
-                # Actually, let's update the filter logic to handle dicts if possible
-                # But filter_response_documents takes bytes/str.
-                # Let's serialize back to JSON for consistency with existing filter logic
-                response_json = json.dumps(response_content).encode()
-                filtered_json = filter_response_documents(response_json, tenant_id)
-                response_content = json.loads(filtered_json)
-                
-            elif endpoint_path == "_changes" or path == "_changes":
-                response_json = json.dumps(response_content).encode()
-                filtered_json = filter_changes_response(response_json, tenant_id)
-                response_content = json.loads(filtered_json)
-            elif endpoint_path == "_bulk_get" or path == "_bulk_get":
+            if endpoint_kind == "_all_docs" or endpoint_kind == "_find":
+                # The DAL already returns parsed JSON, so filter the dict directly.
+                # A _find whose selector was tenant-scoped above only returns the
+                # tenant's docs; _all_docs key ranges don't check TENANT_FIELD and
+                # are always filtered.
+                if tenant_scoped and not STRICT_TENANT_FILTER:
+                    logger.debug("Skipping response filter for tenant-scoped _find: %s", path)
+                else:
+                    response_content = filter_response_dict(response_content, tenant_id)
+            elif endpoint_kind == "_changes":
+                response_content = filter_changes_dict(response_content, tenant_id)
+            elif endpoint_kind == "_bulk_get":
                 # Filter each result row — strip docs not belonging to the tenant.
                 results = response_content.get("results", [])
                 filtered_results = []
@@ -1977,22 +2195,22 @@ async def proxy_couchdb(
                         filtered_results.append({**row, "docs": filtered_docs})
                 response_content = {**response_content, "results": filtered_results}
         else:
-            logger.debug(f"Skipping tenant filtering for couch-sitter app: {request.method} /{path}")
+            logger.debug("Skipping tenant filtering for couch-sitter app: %s /%s", method, path)
 
         # Debug logging for _changes to diagnose polling issues
-        if endpoint_path == "_changes" or "_changes" in path:
+        if endpoint_kind == "_changes":
             results = response_content.get('results', [])
             first_seq = results[0].get('seq') if results else None
             last_result_seq = results[-1].get('seq') if results else None
-            logger.info(f"_changes response: last_seq={response_content.get('last_seq')}, results_count={len(results)}, pending={response_content.get('pending')}, first_seq={first_seq}, last_result_seq={last_result_seq}")
+            logger.info("_changes response: last_seq=%s, results_count=%s, pending=%s, first_seq=%s, last_result_seq=%s", response_content.get('last_seq'), len(results), response_content.get('pending'), first_seq, last_result_seq)
         
         # Log _local document operations (checkpoint reads/writes)
-        if "_local" in path:
-            logger.info(f"_local operation: {request.method} {path}, status=success")
+        if endpoint_kind == "_local":
+            logger.info("_local operation: %s %s, status=success", method, path)
 
         # Return response
         return Response(
-            content=json.dumps(response_content),
+            content=orjson.dumps(response_content),
             status_code=200,
             media_type="application/json"
         )
@@ -2002,19 +2220,59 @@ async def proxy_couchdb(
     except Exception as e:
         import traceback
         # Log failed requests, especially _local writes
-        if "_local" in path:
-            logger.error(f"FAILED _local operation: {request.method} /{path}: {e}")
+        if endpoint_kind == "_local":
+            logger.error(f"FAILED _local operation: {method} /{path}: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
         else:
-            logger.error(f"Proxy error for {request.method} /{path}: {e}")
+            logger.error(f"Proxy error for {method} /{path}: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+# Catch-all routes, one per method so the router does the method dispatch
+# Handle CORS preflight requests explicitly if middleware didn't catch them
+@app.options("/{path:path}")
+async def proxy_couchdb_options(path: str):
+    return Response(status_code=200)
+
+@app.get("/{path:path}")
+async def proxy_couchdb_get(request: Request, path: str, authorization: Optional[str] = Header(None)):
+    # Special case: GET / is a public health/metadata endpoint (no JWT required)
+    if not path:
+        return await proxy_to_couchdb_direct(request, path)
+    return await proxy_couchdb(request, path, authorization, "GET", False)
+
+@app.head("/{path:path}")
+async def proxy_couchdb_head(request: Request, path: str, authorization: Optional[str] = Header(None)):
+    return await proxy_couchdb(request, path, authorization, "HEAD", False)
+
+@app.delete("/{path:path}")
+async def proxy_couchdb_delete(request: Request, path: str, authorization: Optional[str] = Header(None)):
+    return await proxy_couchdb(request, path, authorization, "DELETE", False)
+
+@app.api_route("/{path:path}", methods=["COPY"])
+async def proxy_couchdb_copy(request: Request, path: str, authorization: Optional[str] = Header(None)):
+    return await proxy_couchdb(request, path, authorization, "COPY", False)
+
+@app.post("/{path:path}")
+async def proxy_couchdb_post(request: Request, path: str, authorization: Optional[str] = Header(None)):
+    return await proxy_couchdb(request, path, authorization, "POST", True)
+
+@app.put("/{path:path}")
+async def proxy_couchdb_put(request: Request, path: str, authorization: Optional[str] = Header(None)):
+    return await proxy_couchdb(request, path, authorization, "PUT", True)
+
+@app.patch("/{path:path}")
+async def proxy_couchdb_patch(request: Request, path: str, authorization: Optional[str] = Header(None)):
+    return await proxy_couchdb(request, path, authorization, "PATCH", True)
+
+
 if __name__ == "__main__":
     uvicorn.run(
         app,
         host=PROXY_HOST,
         port=PROXY_PORT,
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP,
         log_level=LOG_LEVEL.lower()
     )
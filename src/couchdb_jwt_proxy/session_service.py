@@ -19,6 +19,7 @@ Schema (couch-sitter):
 
 import time
 import logging
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
@@ -36,8 +37,21 @@ class SessionService:
             dal: Data Access Layer instance for CouchDB operations
         """
         self.dal = dal
-        self._cache: Dict[str, Dict[str, Any]] = {}  # sid → {active_tenant_id, cached_at}
+        # sid → {active_tenant_id, cached_at}, oldest first; the TTL is uniform,
+        # so insertion order is also expiry order
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._cache_ttl = 3600  # 1 hour TTL for cache entries
+        self._cache_max_size = 10000  # Size bound, independent of cleanup runs
+
+    def _cache_put(self, sid: str, active_tenant_id: Optional[str]):
+        """Insert/refresh a cache entry at the newest end, evicting the oldest overflow."""
+        self._cache[sid] = {
+            "active_tenant_id": active_tenant_id,
+            "cached_at": time.time()
+        }
+        self._cache.move_to_end(sid)
+        while len(self._cache) > self._cache_max_size:
+            self._cache.popitem(last=False)
 
     async def create_session(
         self,
@@ -93,17 +107,14 @@ class SessionService:
         # Store in CouchDB
         try:
             result = await self.dal.put_document("couch-sitter", doc_id, session_doc)
-            logger.info(f"[SessionService] Created/updated session: {sid} → {active_tenant_id}")
+            logger.info("[SessionService] Created/updated session: %s → %s", sid, active_tenant_id)
             session_doc["_rev"] = result.get("_rev")
         except Exception as e:
             logger.error(f"[SessionService] Failed to create session {sid}: {e}")
             raise
         
         # Update in-memory cache
-        self._cache[sid] = {
-            "active_tenant_id": active_tenant_id,
-            "cached_at": time.time()
-        }
+        self._cache_put(sid, active_tenant_id)
         
         return session_doc
 
@@ -122,26 +133,23 @@ class SessionService:
         if cached:
             age = time.time() - cached["cached_at"]
             if age < self._cache_ttl:
-                logger.debug(f"[SessionService] Cache hit for {sid}: {cached['active_tenant_id']} (age: {age:.1f}s)")
+                logger.debug("[SessionService] Cache hit for %s: %s (age: %.1fs)", sid, cached['active_tenant_id'], age)
                 return cached["active_tenant_id"]
             else:
                 # Cache expired, remove it
-                logger.debug(f"[SessionService] Cache expired for {sid} (age: {age:.1f}s > {self._cache_ttl}s)")
+                logger.debug("[SessionService] Cache expired for %s (age: %.1fs > %ss)", sid, age, self._cache_ttl)
                 self._cache.pop(sid, None)
         
         # Cache miss or expired: query CouchDB
-        doc_id = f"session_{sid}"
+        doc_id = sid  # Same _id create_session writes
         try:
             doc = await self.dal.get_document("couch-sitter", doc_id)
             active_tenant_id = doc.get("active_tenant_id")
             
             # Update cache with fresh data
-            self._cache[sid] = {
-                "active_tenant_id": active_tenant_id,
-                "cached_at": time.time()
-            }
+            self._cache_put(sid, active_tenant_id)
             
-            logger.debug(f"[SessionService] CouchDB hit for {sid}: {active_tenant_id}")
+            logger.debug("[SessionService] CouchDB hit for %s: %s", sid, active_tenant_id)
             return active_tenant_id
         except Exception as e:
             # Session document not found or other error
@@ -162,11 +170,11 @@ class SessionService:
         self._cache.pop(sid, None)
         
         # Remove from CouchDB
-        doc_id = f"session_{sid}"
+        doc_id = sid  # Same _id create_session writes
         try:
             doc = await self.dal.get_document("couch-sitter", doc_id)
             await self.dal.delete_document("couch-sitter", doc_id, doc.get("_rev"))
-            logger.info(f"[SessionService] Deleted session: {sid}")
+            logger.info("[SessionService] Deleted session: %s", sid)
             return True
         except Exception as e:
             logger.warning(f"[SessionService] Could not delete session {sid}: {e}")
@@ -175,18 +183,21 @@ class SessionService:
     def cleanup_expired_cache(self):
         """
         Remove stale entries from in-memory cache.
-        Called periodically to prevent unbounded memory growth.
+
+        Entries are kept in expiry order (hits don't reorder them), so the
+        scan stops at the first live entry instead of walking the whole cache.
         """
         now = time.time()
-        expired = [
-            sid for sid, entry in self._cache.items()
-            if (now - entry["cached_at"]) > self._cache_ttl
-        ]
+        expired = 0
+        while self._cache:
+            sid, entry = next(iter(self._cache.items()))
+            if (now - entry["cached_at"]) <= self._cache_ttl:
+                break
+            del self._cache[sid]
+            expired += 1
         
         if expired:
-            for sid in expired:
-                self._cache.pop(sid)
-            logger.info(f"[SessionService] Cleaned {len(expired)} expired cache entries")
+            logger.info("[SessionService] Cleaned %s expired cache entries", expired)
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """
@@ -8,31 +8,75 @@ Validates that documents being written to app databases:
 This is added to main.py as a middleware layer.
 """
 
-import json
+import re
+import time
+import asyncio
+import base64
 import logging
-from typing import Dict, Any, List, Optional
+import orjson
+from collections import OrderedDict
+from email.message import Message
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 from fastapi import Request
 from fastapi.responses import JSONResponse
-import jwt
 
 logger = logging.getLogger(__name__)
 
+# Only these methods carry documents that need tenant validation
+_WRITE_METHODS = frozenset(('PUT', 'POST'))
+
+# Tokens are resolved to their subject (and, once fetched, that user's tenants)
+# for a few minutes; clients poll with the same token, so a repeat write is one
+# dict lookup with no decode and no tenant fetch
+_TOKEN_CACHE_TTL = 300
+_TOKEN_CACHE_MAX_SIZE = 512
+
+# A user's tenant list is refetched after this long, so revoked access expires
+_USER_TENANT_CACHE_TTL = 300
+_USER_TENANT_CACHE_MAX_SIZE = 1024
+
+# Paths that skip tenant validation, matched as substrings in one regex scan.
+# Keep the list minimal: a pattern that contains another one is redundant.
+_SKIP_VALIDATION_PATTERNS = (
+    'couch-sitter',  # Central registry
+    '_users',        # System users database (also covers the /__users virtual endpoint)
+    '/_all_dbs',
+    '/_dbs',
+    '/_uuids',
+    '/_active_tasks',
+    '/_admin',
+    '/api/',         # API endpoints (they handle auth separately)
+    '/__tenants',    # Virtual endpoints
+)
+_SKIP_VALIDATION_RE = re.compile('|'.join(map(re.escape, _SKIP_VALIDATION_PATTERNS)))
+
 
 class TenantAccessMiddleware:
     """Middleware that validates tenant access for document writes"""
     
+    # __call__ reads several of these per request; slots skip the instance dict
+    __slots__ = ('app', 'couch_sitter_service', '_user_tenant_cache', '_token_cache', '_inflight')
+    
     def __init__(self, app, couch_sitter_service):
         self.app = app
         self.couch_sitter_service = couch_sitter_service
-        self._user_tenant_cache = {}  # Simple cache to avoid repeated queries
+        # user_id -> (tenant set for membership checks, tenant list for error
+        # messages, monotonic expiry), kept in insertion (and so expiry) order
+        self._user_tenant_cache: "OrderedDict[str, Tuple[FrozenSet[str], List[str], float]]" = OrderedDict()
+        # token -> (user_id, tenant set or None until fetched, tenant list or
+        # None, monotonic expiry)
+        self._token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # user_id -> in-flight tenant fetch, shared by concurrent cache misses
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     async def __call__(self, request: Request, call_next):
         """
         Intercept requests and validate tenant access for writes.
         """
         
-        # Only validate writes to app databases
-        if request.method not in ['PUT', 'POST']:
+        # Only validate writes to app databases. Reads dominate, so this is
+        # checked before touching the URL, headers or body.
+        if request.method not in _WRITE_METHODS:
             return await call_next(request)
         
         path = request.url.path
@@ -41,6 +85,11 @@ class TenantAccessMiddleware:
         if self._should_skip_validation(path):
             return await call_next(request)
         
+        # Standalone attachment uploads carry raw bytes, not a document with a
+        # tenant field, so don't buffer (possibly huge) blobs just to fail a parse
+        if self._is_binary_attachment_upload(request, path):
+            return await call_next(request)
+        
         # Get authenticated user
         try:
             auth_header = request.headers.get('Authorization', '')
@@ -49,9 +98,7 @@ class TenantAccessMiddleware:
                 return await call_next(request)
             
             token = auth_header[7:]  # Remove "Bearer "
-            # Decode JWT to get user_id (no verification here - that's done by auth_middleware)
-            decoded = jwt.decode(token, options={"verify_signature": False})
-            user_id = decoded.get('sub')
+            user_id, tenant_set, user_tenants = self._lookup_token(token)
             
             if not user_id:
                 logger.warning("No user_id in JWT during tenant validation")
@@ -60,23 +107,56 @@ class TenantAccessMiddleware:
             logger.debug(f"Could not extract user from JWT: {e}")
             return await call_next(request)
         
-        # Read request body
+        # A PUT to .../band-info_{tenantId} names its tenant in the URL, so a
+        # foreign tenant is rejected before the body is read or parsed
+        if request.method == 'PUT':
+            doc_id = path.rsplit('/', 1)[-1]
+            if doc_id.startswith('band-info_'):
+                url_tenant = doc_id[len('band-info_'):]
+                if tenant_set is None:
+                    tenant_set, user_tenants = await self._get_token_tenants(token, user_id)
+                if url_tenant not in tenant_set:
+                    logger.warning(f"Tenant validation failed: band-info PUT for tenant '{url_tenant}' by {user_id}")
+                    return JSONResponse(
+                        status_code=403,
+                        content={
+                            "error": "Forbidden",
+                            "reason": f"Cannot write band-info for tenant '{url_tenant}'. "
+                                      f"You have access to: {user_tenants}",
+                        }
+                    )
+        
+        # Read request body. An explicitly empty body has nothing to validate, so
+        # don't touch the receive channel at all; a missing Content-Length
+        # (chunked upload) still has to be read.
+        if request.headers.get('content-length') == '0':
+            return await call_next(request)
         try:
             body = await request.body()
             if not body:
                 return await call_next(request)
             
-            data = json.loads(body)
+            # multipart/related doc PUTs carry the JSON document as their first part
+            if request.headers.get('content-type', '').startswith('multipart/related'):
+                body = _multipart_document(body, request.headers['content-type'])
+            
+            # orjson parses the raw bytes directly; bulk_docs bodies can be large
+            data = orjson.loads(body)
         except Exception as e:
             logger.debug(f"Could not parse request body for tenant validation: {e}")
             return await call_next(request)
         
+        # Get user's authorized tenants (the only I/O, skipped on a token cache
+        # hit); validation itself is plain CPU work and runs synchronously
+        if tenant_set is None:
+            tenant_set, user_tenants = await self._get_token_tenants(token, user_id)
+        
         # Validate tenant access
         try:
             if '_bulk_docs' in path:
-                await self._validate_bulk_docs(data, user_id, path)
+                self._validate_bulk_docs(data, user_id, path, tenant_set, user_tenants)
             else:
-                await self._validate_document(data, user_id, path)
+                self._validate_document(data, user_id, path, tenant_set, user_tenants)
         except ValueError as e:
             logger.warning(f"Tenant validation failed: {e}")
             return JSONResponse(
@@ -84,42 +164,101 @@ class TenantAccessMiddleware:
                 content={"error": "Forbidden", "reason": str(e)}
             )
         
-        # Validation passed - continue with request
-        # Need to restore body since we read it
+        # Validation passed - continue with request. Only a few top-level fields
+        # of the parsed body were needed, so drop the (possibly attachment-heavy)
+        # dict now rather than holding it for the rest of the request.
+        del data
+
+        # Need to restore body since we read it. Replay the already-read bytes
+        # once as a complete message, then hand back to the real channel so a
+        # later receive() still sees the client disconnect.
+        original_receive = request._receive
+        body_sent = False
+
         async def receive():
-            return {"type": "http.request", "body": body}
+            nonlocal body_sent
+            if body_sent:
+                return await original_receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
         
         request._receive = receive
         return await call_next(request)
     
-    async def _validate_document(self, doc: Dict[str, Any], user_id: str, path: str) -> None:
-        """Validate a single document"""
+    def _lookup_token(self, token: str) -> Tuple[Optional[str], Optional[FrozenSet[str]], Optional[List[str]]]:
+        """Return the token's 'sub' claim and, if already known, its user's tenants"""
+        now = time.monotonic()
+        cached = self._token_cache.get(token)
+        if cached and cached[3] > now:
+            return cached[0], cached[1], cached[2]
+
+        # Decode JWT to get user_id (no verification here - that's done by auth_middleware)
+        decoded = _decode_jwt_payload(token)
+        user_id = decoded.get('sub')
+
+        expiry = now + _TOKEN_CACHE_TTL
+        exp = decoded.get('exp')
+        if isinstance(exp, (int, float)):
+            # Never serve a cached subject past the token's own expiry
+            expiry = min(expiry, now + (exp - time.time()))
+
+        self._store_token(token, (user_id, None, None, expiry))
+        return user_id, None, None
+
+    async def _get_token_tenants(self, token: str, user_id: str) -> Tuple[FrozenSet[str], List[str]]:
+        """Fetch the user's tenants and attach them to the token's cache entry"""
+        tenant_set, tenant_ids = await self._get_user_tenants(user_id)
+
+        entry = self._token_cache.get(token)
+        user_entry = self._user_tenant_cache.get(user_id)
+        # Only a successful (cached) fetch is attached, and it must not outlive
+        # either the token or the per-user entry it came from
+        if entry is not None and user_entry is not None and user_entry[0] is tenant_set:
+            self._store_token(token, (user_id, tenant_set, tenant_ids, min(entry[3], user_entry[2])))
+
+        return tenant_set, tenant_ids
+
+    def _store_token(self, token: str, entry: tuple) -> None:
+        """Insert or refresh a token entry, evicting the oldest beyond the cap"""
+        cache = self._token_cache
+        cache.pop(token, None)
+        cache[token] = entry
+        if len(cache) > _TOKEN_CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+
+    def _validate_document(
+        self,
+        doc: Dict[str, Any],
+        user_id: str,
+        path: str,
+        tenant_set: FrozenSet[str],
+        user_tenants: List[str],
+    ) -> None:
+        """Validate a single document against the user's authorized tenants"""
+        
+        # Bind the lookup once for the field reads below
+        get = doc.get
         
         # Skip if deleting
-        if doc.get('_deleted'):
+        if get('_deleted'):
             return
         
-        # Get user's authorized tenants
-        user_tenants = await self._get_user_tenants(user_id)
-        if not user_tenants:
+        if not tenant_set:
             raise ValueError(
                 "You have no authorized tenants. Create one via /api/tenants first."
             )
         
-        doc_type = doc.get('type', '')
-        doc_id = doc.get('_id', '')
+        doc_type, doc_id, tenant_id = get('type', ''), get('_id', ''), get('tenant')
         
         # Special handling for band-info
         if doc_type == 'band-info':
             if doc_id.startswith('band-info_'):
                 tenant_id = doc_id.split('_', 1)[1]
-                if tenant_id not in user_tenants:
+                if tenant_id not in tenant_set:
                     raise ValueError(
                         f"Cannot write band-info for tenant '{tenant_id}'. "
                         f"You have access to: {user_tenants}"
                     )
-                # Add tenant field for consistency
-                doc['tenant'] = tenant_id
             else:
                 raise ValueError(
                     "band-info documents must follow naming: band-info_{tenantId}"
@@ -127,15 +266,13 @@ class TenantAccessMiddleware:
             return
         
         # All other documents need explicit tenant field
-        tenant_id = doc.get('tenant')
-        
         if not tenant_id:
             raise ValueError(
                 f"Document missing required 'tenant' field. "
                 f"You have access to: {user_tenants}"
             )
         
-        if tenant_id not in user_tenants:
+        if tenant_id not in tenant_set:
             raise ValueError(
                 f"Cannot write to tenant '{tenant_id}'. "
                 f"You have access to: {user_tenants}"
@@ -143,103 +280,172 @@ class TenantAccessMiddleware:
         
         logger.info(f"✅ Validation passed: user={user_id}, tenant={tenant_id}, doc_id={doc_id}")
     
-    async def _validate_bulk_docs(self, data: Dict[str, Any], user_id: str, path: str) -> None:
-        """Validate all documents in bulk write"""
+    def _validate_bulk_docs(
+        self,
+        data: Dict[str, Any],
+        user_id: str,
+        path: str,
+        tenant_set: FrozenSet[str],
+        user_tenants: List[str],
+    ) -> None:
+        """Validate all documents in bulk write against the user's authorized tenants"""
         
         docs = data.get('docs', [])
         if not docs:
             return
         
-        # Get user's authorized tenants once
-        user_tenants = await self._get_user_tenants(user_id)
-        if not user_tenants:
+        if not tenant_set:
             raise ValueError(
                 "You have no authorized tenants. Create one via /api/tenants first."
             )
         
-        # Validate each document
-        for i, doc in enumerate(docs):
-            # Skip deleted documents
-            if doc.get('_deleted'):
-                continue
-            
-            try:
-                doc_type = doc.get('type', '')
-                doc_id = doc.get('_id', '')
-                
-                if doc_type == 'band-info':
-                    if doc_id.startswith('band-info_'):
-                        tenant_id = doc_id.split('_', 1)[1]
-                        if tenant_id not in user_tenants:
-                            raise ValueError(
-                                f"Cannot write band-info for tenant '{tenant_id}'"
-                            )
-                    else:
-                        raise ValueError("band-info must follow naming: band-info_{tenantId}")
-                else:
-                    tenant_id = doc.get('tenant')
-                    if not tenant_id:
-                        raise ValueError(f"Document {i} missing 'tenant' field")
-                    if tenant_id not in user_tenants:
-                        raise ValueError(
-                            f"Document {i}: cannot write to tenant '{tenant_id}'"
-                        )
-            except ValueError as e:
-                raise ValueError(f"Bulk doc {i} failed: {str(e)}")
+        index, err_msg = _find_invalid_doc(docs, tenant_set)
+        if err_msg:
+            raise ValueError(f"Bulk doc {index} failed: {err_msg}")
         
         logger.info(
             f"✅ Bulk validation passed: user={user_id}, docs={len(docs)}, "
             f"tenants={user_tenants}"
         )
     
-    async def _get_user_tenants(self, user_id: str) -> List[str]:
-        """Get list of tenant IDs user has access to"""
+    async def _get_user_tenants(self, user_id: str) -> Tuple[FrozenSet[str], List[str]]:
+        """Get the tenant IDs user has access to, as a set and as a list"""
         
         # Check cache first
-        if user_id in self._user_tenant_cache:
-            return self._user_tenant_cache[user_id]
+        now = time.monotonic()
+        cache = self._user_tenant_cache
+        entry = cache.get(user_id)
+        if entry and entry[2] > now:
+            return entry[0], entry[1]
         
+        # Single-flight: a burst of misses for one user waits on one fetch
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_user_tenants(user_id))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(user_id, None))
+        # Shield so one cancelled request doesn't cancel the fetch for the rest
+        return await asyncio.shield(task)
+    
+    async def _fetch_user_tenants(self, user_id: str) -> Tuple[FrozenSet[str], List[str]]:
+        """Fetch a user's tenant IDs from couch-sitter and cache them"""
+        cache = self._user_tenant_cache
         try:
             tenants, _ = await self.couch_sitter_service.get_user_tenants(user_id)
+            now = time.monotonic()
             tenant_ids = [t.get("_id") for t in tenants if t and t.get("_id")]
+            # Membership is checked once per document, so keep a set alongside the list
+            tenant_set = frozenset(tenant_ids)
             
             # Cache for 5 minutes
-            self._user_tenant_cache[user_id] = tenant_ids
+            cache.pop(user_id, None)
+            cache[user_id] = (tenant_set, tenant_ids, now + _USER_TENANT_CACHE_TTL)
+            # Every entry has the same TTL, so expired ones sit at the front
+            while cache:
+                oldest = next(iter(cache.values()))
+                if oldest[2] > now and len(cache) <= _USER_TENANT_CACHE_MAX_SIZE:
+                    break
+                cache.popitem(last=False)
             
-            return tenant_ids
+            return tenant_set, tenant_ids
         except Exception as e:
             logger.error(f"Failed to get user tenants: {e}")
-            # Return empty list - request will be rejected with "no tenants" error
-            return []
+            # Return no tenants - request will be rejected with "no tenants" error
+            return frozenset(), []
+    
+    @staticmethod
+    def _is_binary_attachment_upload(request: Request, path: str) -> bool:
+        """Check for a non-JSON PUT to /{db}/{docid}/{attachment}"""
+        if request.method != 'PUT':
+            return False
+        content_type = request.headers.get('content-type', '')
+        # multipart/related doc PUTs embed the JSON document, which __call__
+        # extracts and validates
+        if content_type.startswith(('application/json', 'multipart/')):
+            return False
+        segments = path.strip('/').split('/')
+        # Design doc ids contain a slash: /{db}/_design/{name}/{attachment}
+        if len(segments) > 1 and segments[1] == '_design':
+            return len(segments) >= 4
+        return len(segments) >= 3 and not segments[1].startswith('_')
     
-    def _should_skip_validation(self, path: str) -> bool:
+    @staticmethod
+    def _should_skip_validation(path: str) -> bool:
         """Check if request should skip tenant validation"""
-        
-        # Skip couch-sitter (central registry)
-        if 'couch-sitter' in path:
-            return True
-        
-        # Skip _users database (system)
-        if '_users' in path:
-            return True
-        
-        # Skip system endpoints
-        skip_patterns = [
-            '/_all_dbs',
-            '/_dbs',
-            '/_uuids',
-            '/_active_tasks',
-            '/_admin',
-            '/api/',  # API endpoints (they handle auth separately)
-            '/__users',  # Virtual endpoints
-            '/__tenants'  # Virtual endpoints
-        ]
-        
-        for pattern in skip_patterns:
-            if pattern in path:
-                return True
-        
-        return False
+        return _SKIP_VALIDATION_RE.search(path) is not None
+
+
+def _decode_jwt_payload(token: str) -> Dict[str, Any]:
+    """
+    Decode a JWT's claims without verifying it.
+
+    Only the payload segment is needed, so it is base64url-decoded and parsed
+    directly rather than going through a JWT library's header and claim handling.
+    Raises ValueError for a malformed token.
+    """
+    _, payload_b64, _ = token.split('.', 2)
+    padding = '=' * (-len(payload_b64) % 4)
+    claims = orjson.loads(base64.urlsafe_b64decode(payload_b64 + padding))
+    if not isinstance(claims, dict):
+        raise ValueError("JWT payload is not a JSON object")
+    return claims
+
+
+def _multipart_document(body: bytes, content_type: str) -> bytes:
+    """
+    Return the JSON document part of a multipart/related document PUT.
+
+    CouchDB requires the document to be the first part, ahead of its
+    attachments, so only that part is located; attachments are left unparsed.
+    Raises ValueError if the body has no such part.
+    """
+    header = Message()
+    header['content-type'] = content_type
+    boundary = header.get_param('boundary')
+    if not boundary:
+        raise ValueError("multipart body without a boundary")
+    parts = body.split(b'--' + boundary.encode(), 2)
+    if len(parts) < 3:
+        raise ValueError("multipart body without a complete first part")
+    _, sep, content = parts[1].partition(b'\r\n\r\n')
+    if not sep:
+        raise ValueError("multipart first part without headers")
+    return content.rstrip(b'\r\n')
+
+
+def _find_invalid_doc(docs: List[Dict[str, Any]], tenant_set: FrozenSet[str]) -> Tuple[int, Optional[str]]:
+    """
+    Return (index, error) for the first doc the user may not write, or (-1, None).
+
+    Kept as a self-contained function over plain lists, dicts and a frozenset
+    so the per-doc loop stays free of instance state.
+    """
+    # Replication batches can hold thousands of docs, so the lookups used per
+    # doc are bound to locals once
+    _get = dict.get
+    for i, doc in enumerate(docs):
+        # Skip deleted documents
+        if _get(doc, '_deleted'):
+            continue
+
+        doc_type = _get(doc, 'type', '')
+        doc_id = _get(doc, '_id', '')
+
+        if doc_type == 'band-info':
+            if doc_id.startswith('band-info_'):
+                tenant_id = doc_id.split('_', 1)[1]
+                if tenant_id not in tenant_set:
+                    return i, f"Cannot write band-info for tenant '{tenant_id}'"
+            else:
+                return i, "band-info must follow naming: band-info_{tenantId}"
+        else:
+            tenant_id = _get(doc, 'tenant')
+            if not tenant_id:
+                return i, f"Document {i} missing 'tenant' field"
+            if tenant_id not in tenant_set:
+                return i, f"Document {i}: cannot write to tenant '{tenant_id}'"
+
+    return -1, None
 
 
 def create_tenant_access_middleware(app, couch_sitter_service):
@@ -5,16 +5,92 @@ Provides endpoints for creating/managing workspaces and invitations.
 """
 
 import os
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from typing import Optional, Dict, Any, List
+import asyncio
+from datetime import datetime, timezone, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Body, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List, Literal, Callable
 import logging
-import httpx
 
-from .auth_middleware import get_current_user
+from .auth_middleware import CurrentUser, get_current_user
 from .tenant_validation import validate_tenant_id_format, TenantIdFormatError
+from .couch_sitter_service import BulkUpdateConflict
+from .invite_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Path ID formats, checked by FastAPI before a handler (and CouchDB) is reached
+INVITE_ID_PATTERN = r"^invite_[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+USER_ID_PATTERN = r"^user_[0-9a-f]{64}$"
+
+
+class InvitationCreate(BaseModel):
+    """Create-invitation request body"""
+    model_config = ConfigDict(extra="ignore")
+
+    email: Optional[str] = ""  # Email is optional
+    role: Literal["member", "admin", "editor", "viewer"] = "member"
+
+
+class RoleUpdate(BaseModel):
+    """Change-member-role request body"""
+    model_config = ConfigDict(extra="ignore")
+
+    role: Literal["admin", "member"]
+
+
+class InvitationSummary(BaseModel):
+    """Public view of an invitation document; tokenHash and other fields are dropped"""
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+
+    id: str = Field(alias="_id")
+    email: Optional[str] = None
+    role: Optional[str] = None
+    status: Optional[str] = None
+    createdAt: Optional[str] = None
+    expiresAt: Optional[str] = None
+
+
+# Fetch only what InvitationSummary returns
+INVITATION_SUMMARY_FIELDS = ["_id", "email", "role", "status", "createdAt", "expiresAt"]
+
+
+class TenantRoute(APIRoute):
+    """
+    Maps handler errors to responses in one place, so endpoints only raise
+    HTTPException for control flow.
+
+    TenantIdFormatError (a malformed ID from the request) becomes 400 with the
+    error message, and a BulkUpdateConflict becomes a generic 409; any other
+    exception, ValueError included, is logged with its traceback and becomes a
+    generic 500 so internal details never reach the client.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except (HTTPException, RequestValidationError):
+                raise
+            except TenantIdFormatError as e:
+                logger.warning("Rejected %s %s: %s", request.method, request.url.path, e)
+                return ORJSONResponse({"detail": str(e)}, status_code=400)
+            except BulkUpdateConflict as e:
+                logger.warning("Conflict on %s %s: %s", request.method, request.url.path, e)
+                return ORJSONResponse(
+                    {"detail": "The resource was changed by another request, please retry"}, status_code=409
+                )
+            except Exception:
+                logger.error("Error handling %s %s", request.method, request.url.path, exc_info=True)
+                return ORJSONResponse({"detail": "Internal server error"}, status_code=500)
+
+        return route_handler
+
 
 def create_tenant_router(couch_sitter_service, invite_service):
     """
@@ -27,14 +103,16 @@ def create_tenant_router(couch_sitter_service, invite_service):
     Returns:
         APIRouter with all tenant/invitation endpoints
     """
-    router = APIRouter(prefix="/api", tags=["tenants"])
+    router = APIRouter(
+        prefix="/api", tags=["tenants"], default_response_class=ORJSONResponse, route_class=TenantRoute
+    )
 
     # ============ TENANT MANAGEMENT ============
 
     @router.post("/tenants")
     async def create_tenant(
         request_data: Dict[str, Any] = Body(...),
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Create a new workspace tenant.
@@ -49,66 +127,58 @@ def create_tenant_router(couch_sitter_service, invite_service):
         if not name:
             raise HTTPException(status_code=400, detail="Tenant name is required")
 
-        try:
-            sub = current_user.get("sub")
-            email = current_user.get("email")
-            name_from_jwt = current_user.get("name")
-
-            # Determine applicationId from APPLICATION_ID env var
-            app_id = os.environ.get("APPLICATION_ID", "roady")
-
-            logger.info(f"Creating tenant with applicationId: {app_id}")
-            
-            # CRITICAL: Ensure user exists before creating tenant
-            # This creates the user document with correct ID format if it doesn't exist
-            logger.info(f"Ensuring user exists for sub: {sub}")
-            user_info = await couch_sitter_service.ensure_user_exists(
-                sub=sub,
-                email=email,
-                name=name_from_jwt,
-                requested_db_name=app_id
-            )
-            
-            # Extract user_id from the UserTenantInfo object
-            user_id = user_info.user_id
-            logger.info(f"Got user_id from ensure_user_exists: {user_id}")
-            
-            if not user_id:
-                raise ValueError("Failed to obtain user_id from ensure_user_exists()")
-
-            logger.info(f"Creating workspace tenant for user {user_id}, name={name}, app_id={app_id}")
-            tenant = await couch_sitter_service.create_workspace_tenant(
-                user_id=user_id,
-                name=name,
-                application_id=app_id
-            )
-
-            # Extract virtual ID from internal ID (remove tenant_ prefix)
-            internal_id = tenant.get("_id")
-            virtual_id = internal_id[7:] if internal_id.startswith("tenant_") else internal_id
-
-            return {
-                "tenantId": virtual_id,
-                "_id": virtual_id,
-                "type": tenant.get("type"),
-                "name": tenant.get("name"),
-                "applicationId": tenant.get("applicationId"),
-                "userId": tenant.get("userId"),
-                "userIds": tenant.get("userIds"),
-                "createdAt": tenant.get("createdAt"),
-                "metadata": tenant.get("metadata")
-            }
-
-        except ValueError as e:
-            logger.error(f"Validation error creating tenant: {e}")
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            logger.error(f"Error creating tenant: {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail="Failed to create tenant")
+        sub = current_user.sub
+        email = current_user.email
+        name_from_jwt = current_user.name
+
+        # Determine applicationId from APPLICATION_ID env var
+        app_id = os.environ.get("APPLICATION_ID", "roady")
+
+        logger.info("Creating tenant with applicationId: %s", app_id)
+        
+        # CRITICAL: Ensure user exists before creating tenant
+        # This creates the user document with correct ID format if it doesn't exist
+        logger.info("Ensuring user exists for sub: %s", sub)
+        user_info = await couch_sitter_service.ensure_user_exists(
+            sub=sub,
+            email=email,
+            name=name_from_jwt,
+            requested_db_name=app_id
+        )
+        
+        # Extract user_id from the UserTenantInfo object
+        user_id = user_info.user_id
+        logger.info("Got user_id from ensure_user_exists: %s", user_id)
+        
+        if not user_id:
+            raise ValueError("Failed to obtain user_id from ensure_user_exists()")
+
+        logger.info("Creating workspace tenant for user %s, name=%s, app_id=%s", user_id, name, app_id)
+        tenant = await couch_sitter_service.create_workspace_tenant(
+            user_id=user_id,
+            name=name,
+            application_id=app_id
+        )
+
+        # Extract virtual ID from internal ID (remove tenant_ prefix)
+        internal_id = tenant.get("_id")
+        virtual_id = internal_id[7:] if internal_id.startswith("tenant_") else internal_id
+
+        return {
+            "tenantId": virtual_id,
+            "_id": virtual_id,
+            "type": tenant.get("type"),
+            "name": tenant.get("name"),
+            "applicationId": tenant.get("applicationId"),
+            "userId": tenant.get("userId"),
+            "userIds": tenant.get("userIds"),
+            "createdAt": tenant.get("createdAt"),
+            "metadata": tenant.get("metadata")
+        }
 
     @router.get("/my-tenants")
     async def list_user_tenants(
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         List all tenants the user has access to.
@@ -116,28 +186,23 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             List of tenants with user's role for each
         """
-        try:
-            user_id = current_user.get("user_id")
-            tenant_id = current_user.get("tenant_id")
-            sub = current_user.get("sub")
+        user_id = current_user.user_id
+        tenant_id = current_user.tenant_id
+        sub = current_user.sub
 
-            # Get all tenants for user
-            tenants_list, personal_tenant_id = await couch_sitter_service.get_user_tenants(sub)
+        # Get all tenants for user
+        tenants_list, personal_tenant_id = await couch_sitter_service.get_user_tenants(sub)
 
-            return {
-                "tenants": tenants_list,
-                "activeTenantId": tenant_id or personal_tenant_id
-            }
-
-        except Exception as e:
-            logger.error(f"Error listing tenants: {e}")
-            raise HTTPException(status_code=500, detail="Failed to list tenants")
+        return {
+            "tenants": tenants_list,
+            "activeTenantId": tenant_id or personal_tenant_id
+        }
 
     @router.put("/tenants/{tenant_id}")
     async def update_tenant(
         tenant_id: str,
         request_data: Dict[str, Any],
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Update tenant (owner only).
@@ -148,49 +213,40 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             Updated tenant
         """
-        try:
-            # Validate tenant ID format
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            
-            user_id = current_user.get("user_id")
+        validate_tenant_id_format(tenant_id)
+        
+        user_id = current_user.user_id
 
-            # Get tenant and check ownership
-            tenant = await couch_sitter_service.get_tenant(tenant_id)
-            if not tenant:
-                raise HTTPException(status_code=404, detail="Tenant not found")
+        # Get tenant and check ownership
+        tenant = await couch_sitter_service.get_tenant(tenant_id, use_cache=False)
+        if not tenant:
+            raise HTTPException(status_code=404, detail="Tenant not found")
 
-            if tenant.get("userId") != user_id:
-                raise HTTPException(status_code=403, detail="Only owner can update tenant")
+        if tenant.get("userId") != user_id:
+            raise HTTPException(status_code=403, detail="Only owner can update tenant")
 
-            # Update name
-            if "name" in request_data:
-                tenant["name"] = request_data["name"]
+        now_iso = datetime.now(timezone.utc).isoformat()
 
-            from datetime import datetime, timezone
-            tenant["updatedAt"] = datetime.now(timezone.utc).isoformat()
-
-            response = await couch_sitter_service._make_request("PUT", tenant_id, json=tenant)
-            updated = response.json()
+        def apply_update(doc):
+            # Re-checked on a conflict retry, against the re-read doc
+            if doc.get("deletedAt") or doc.get("userId") != user_id:
+                raise BulkUpdateConflict(f"Tenant {tenant_id} changed before the update was written")
+            if "name" in request_data:
+                doc["name"] = request_data["name"]
+            doc["updatedAt"] = now_iso
 
-            return {
-                "_id": tenant.get("_id"),
-                "name": tenant.get("name"),
-                "updatedAt": tenant.get("updatedAt")
-            }
+        await couch_sitter_service.bulk_update([(tenant, apply_update)])
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error updating tenant: {e}")
-            raise HTTPException(status_code=500, detail="Failed to update tenant")
+        return {
+            "_id": tenant.get("_id"),
+            "name": tenant.get("name"),
+            "updatedAt": tenant.get("updatedAt")
+        }
 
     @router.delete("/tenants/{tenant_id}")
     async def delete_tenant(
         tenant_id: str,
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Delete a tenant (owner only, cannot delete personal).
@@ -198,167 +254,140 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             204 No Content
         """
-        try:
-            # Validate tenant ID format
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            
-            user_id = current_user.get("user_id")
+        validate_tenant_id_format(tenant_id)
+        
+        user_id = current_user.user_id
 
-            # Get tenant
-            tenant = await couch_sitter_service.get_tenant(tenant_id)
-            if not tenant:
-                raise HTTPException(status_code=404, detail="Tenant not found")
+        # Get tenant
+        tenant = await couch_sitter_service.get_tenant(tenant_id, use_cache=False)
+        if not tenant:
+            raise HTTPException(status_code=404, detail="Tenant not found")
 
-            # Check if personal
-            if tenant.get("metadata", {}).get("autoCreated"):
-                raise HTTPException(status_code=400, detail="Cannot delete personal tenant")
+        # Check if personal
+        if tenant.get("metadata", {}).get("autoCreated"):
+            raise HTTPException(status_code=400, detail="Cannot delete personal tenant")
 
-            # Check ownership
-            if tenant.get("userId") != user_id:
-                raise HTTPException(status_code=403, detail="Only owner can delete tenant")
+        # Check ownership
+        if tenant.get("userId") != user_id:
+            raise HTTPException(status_code=403, detail="Only owner can delete tenant")
 
-            # Soft delete
-            from datetime import datetime, timezone
-            tenant["deletedAt"] = datetime.now(timezone.utc).isoformat()
-            await couch_sitter_service._make_request("PUT", tenant_id, json=tenant)
+        now_iso = datetime.now(timezone.utc).isoformat()
 
-            return {"status": "deleted"}
+        def soft_delete(doc):
+            # Re-checked on a conflict retry, against the re-read doc
+            if doc.get("deletedAt") or doc.get("userId") != user_id:
+                raise BulkUpdateConflict(f"Tenant {tenant_id} changed before the delete was written")
+            doc["deletedAt"] = now_iso
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting tenant: {e}")
-            raise HTTPException(status_code=500, detail="Failed to delete tenant")
+        # Soft delete
+        await couch_sitter_service.bulk_update([(tenant, soft_delete)])
+
+        return {"status": "deleted"}
 
     # ============ INVITATION MANAGEMENT ============
 
     @router.post("/tenants/{tenant_id}/invitations")
     async def create_invitation(
         tenant_id: str,
-        request_data: Dict[str, Any],
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        request_data: InvitationCreate,
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Create an invitation for a workspace tenant (owner/admin only).
 
         Request:
             - email: Email to invite
-            - role: Role to assign (member, admin)
+            - role: Role to assign (member, admin, editor, viewer)
 
         Returns:
             Invitation with token and invite link
         """
-        try:
-            # Validate tenant ID format
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            
-            user_id = current_user.get("user_id")
-            email = request_data.get("email", "")  # Email is optional
-            role = request_data.get("role", "member")
-
-            if role not in ["member", "admin", "editor", "viewer"]:
-                raise HTTPException(status_code=400, detail="Invalid role")
-
-            # Check tenant access and role
-            logger.info(f"Looking up tenant: {tenant_id}")
-            tenant = await couch_sitter_service.get_tenant(tenant_id)
-            if not tenant:
-                logger.error(f"Tenant not found: {tenant_id}")
-                raise HTTPException(status_code=404, detail=f"Tenant not found: {tenant_id}")
-
-            # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
-            # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
-            # if user_role not in ["owner", "admin"]:
-            #     raise HTTPException(status_code=403, detail="Only owner/admin can create invitations")
-
-            # Create invitation
-            invitation = await invite_service.create_invitation(
-                tenant_id=tenant_id,
-                tenant_name=tenant.get("name"),
-                email=email,
-                role=role,
-                created_by=user_id
-            )
-
-            return {
-                "_id": invitation.get("_id"),
-                "tenantId": invitation.get("tenantId"),
-                "tenantName": invitation.get("tenantName"),
-                "email": invitation.get("email"),
-                "role": invitation.get("role"),
-                "status": invitation.get("status"),
-                "token": invitation.get("token"),
-                "inviteLink": f"https://app.example.com/join?invite={invitation.get('token')}",
-                "expiresAt": invitation.get("expiresAt"),
-                "createdAt": invitation.get("createdAt")
-            }
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error creating invitation: {e}")
-            raise HTTPException(status_code=500, detail="Failed to create invitation")
-
-    @router.get("/tenants/{tenant_id}/invitations")
+        validate_tenant_id_format(tenant_id)
+        
+        user_id = current_user.user_id
+        email = request_data.email
+        role = request_data.role
+
+        # Check tenant access and role
+        logger.info("Looking up tenant: %s", tenant_id)
+        tenant = await couch_sitter_service.get_tenant(tenant_id)
+        if not tenant:
+            logger.error("Tenant not found: %s", tenant_id)
+            raise HTTPException(status_code=404, detail=f"Tenant not found: {tenant_id}")
+
+        # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
+        # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
+        # if user_role not in ["owner", "admin"]:
+        #     raise HTTPException(status_code=403, detail="Only owner/admin can create invitations")
+
+        # Create invitation
+        invitation = await invite_service.create_invitation(
+            tenant_id=tenant_id,
+            tenant_name=tenant.get("name"),
+            email=email,
+            role=role,
+            created_by=user_id
+        )
+
+        return {
+            "_id": invitation.get("_id"),
+            "tenantId": invitation.get("tenantId"),
+            "tenantName": invitation.get("tenantName"),
+            "email": invitation.get("email"),
+            "role": invitation.get("role"),
+            "status": invitation.get("status"),
+            "token": invitation.get("token"),
+            "inviteLink": f"https://app.example.com/join?invite={invitation.get('token')}",
+            "expiresAt": invitation.get("expiresAt"),
+            "createdAt": invitation.get("createdAt")
+        }
+
+    @router.get("/tenants/{tenant_id}/invitations", response_model=List[InvitationSummary])
     async def list_invitations(
         tenant_id: str,
+        response: Response,
         status: Optional[str] = Query(None),
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        bookmark: Optional[str] = Query(None),
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
-        List invitations for a tenant (owner/admin only).
+        List invitations for a tenant (owner/admin only), one page at a time.
 
         Query:
             - status: Filter by pending/accepted/revoked
+            - limit: Page size (default 50, max 500)
+            - bookmark: X-Bookmark value from the previous page
 
         Returns:
-            List of invitations
+            List of invitations; the X-Bookmark header fetches the next page
         """
-        try:
-            # Validate tenant ID format
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            
-            user_id = current_user.get("user_id")
-
-            # Check access
-            tenant = await couch_sitter_service.get_tenant(tenant_id)
-            if not tenant:
-                raise HTTPException(status_code=404, detail="Tenant not found")
-
-            # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
-            # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
-            # if user_role not in ["owner", "admin"]:
-            #     raise HTTPException(status_code=403, detail="Only owner/admin can list invitations")
-
-            # Get invitations
-            invitations = await invite_service.get_invitations_for_tenant(tenant_id, status)
-
-            return [
-                {
-                    "_id": inv.get("_id"),
-                    "email": inv.get("email"),
-                    "role": inv.get("role"),
-                    "status": inv.get("status"),
-                    "createdAt": inv.get("createdAt"),
-                    "expiresAt": inv.get("expiresAt")
-                }
-                for inv in invitations
-            ]
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error listing invitations: {e}")
-            raise HTTPException(status_code=500, detail="Failed to list invitations")
+        validate_tenant_id_format(tenant_id)
+        
+        user_id = current_user.user_id
+
+        # Check access; the invitation query doesn't depend on the tenant doc,
+        # so both lookups run together
+        tenant, (invitations, next_bookmark) = await asyncio.gather(
+            couch_sitter_service.get_tenant(tenant_id),
+            invite_service.get_invitations_for_tenant(
+                tenant_id, status, limit=limit, bookmark=bookmark, fields=INVITATION_SUMMARY_FIELDS
+            ),
+        )
+        if not tenant:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+        # CouchDB returns a bookmark even for the last page; a short page means
+        # there is nothing more to fetch
+        if next_bookmark and len(invitations) == limit:
+            response.headers["X-Bookmark"] = next_bookmark
+
+        # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
+        # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
+        # if user_role not in ["owner", "admin"]:
+        #     raise HTTPException(status_code=403, detail="Only owner/admin can list invitations")
+
+        # The response model picks the public fields straight off the documents
+        return invitations
 
     @router.get("/invitations/preview")
     async def preview_invitation(token: str = Query(...)):
@@ -371,28 +400,21 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             Invitation preview
         """
-        try:
-            invitation = await invite_service.validate_token(token)
-            if not invitation:
-                raise HTTPException(status_code=400, detail="Invalid or expired invitation")
-
-            return {
-                "tenantName": invitation.get("tenantName"),
-                "role": invitation.get("role"),
-                "isValid": True,
-                "expiresAt": invitation.get("expiresAt")
-            }
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error previewing invitation: {e}")
-            raise HTTPException(status_code=500, detail="Failed to preview invitation")
+        invitation = await invite_service.validate_token(token)
+        if not invitation:
+            raise HTTPException(status_code=400, detail="Invalid or expired invitation")
+
+        return {
+            "tenantName": invitation.get("tenantName"),
+            "role": invitation.get("role"),
+            "isValid": True,
+            "expiresAt": invitation.get("expiresAt")
+        }
 
     @router.patch("/invitations/accept")
     async def accept_invitation(
         request_data: Dict[str, Any] = Body(...),
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Accept an invitation and add user to tenant.
@@ -408,82 +430,72 @@ def create_tenant_router(couch_sitter_service, invite_service):
             - 410: Expired token
             - 409: User already a member
         """
+        invite_token = request_data.get("inviteToken")
+        if not invite_token:
+            raise HTTPException(status_code=400, detail="inviteToken is required")
+
+        # Validate token
+        invitation = await invite_service.validate_token(invite_token)
+        if not invitation:
+            # Check if expired to return correct status code
+            # We need to find the invitation by token to check status
+            # For now, return 404 for invalid/revoked
+            raise HTTPException(status_code=404, detail="This invitation is no longer valid or has expired")
+
+        user_id = current_user.user_id
+        tenant_id = invitation.get("tenantId")
+        role = invitation.get("role", "editor")
+        
+        # CRITICAL: Validate tenant_id format from invitation is internal format (tenant_uuid)
+        # Invitations must store tenant_id in internal format. Fail fast if wrong.
         try:
-            invite_token = request_data.get("inviteToken")
-            if not invite_token:
-                raise HTTPException(status_code=400, detail="inviteToken is required")
-    
-            # Validate token
-            invitation = await invite_service.validate_token(invite_token)
-            if not invitation:
-                # Check if expired to return correct status code
-                # We need to find the invitation by token to check status
-                # For now, return 404 for invalid/revoked
-                raise HTTPException(status_code=404, detail="This invitation is no longer valid or has expired")
-    
-            user_id = current_user.get("user_id")
-            tenant_id = invitation.get("tenantId")
-            role = invitation.get("role", "editor")
-            
-            # CRITICAL: Validate tenant_id format from invitation is internal format (tenant_uuid)
-            # Invitations must store tenant_id in internal format. Fail fast if wrong.
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                logger.error(f"Invalid tenant_id in invitation {invitation.get('_id')}: {tenant_id} - {e}")
-                raise HTTPException(status_code=500, detail="Invitation data is corrupted (invalid tenant format)")
-
-            # Cannot accept your own invitation
-            if invitation.get("createdBy") == user_id:
-                raise HTTPException(status_code=400, detail="You cannot accept your own invitation")
-
-            # Check if user is already a member
-            existing_tenants_list, _ = await couch_sitter_service.get_user_tenants(current_user.get("sub"))
-            existing_tenant_ids = [t.get("tenantId") for t in existing_tenants_list]
-            
-            if tenant_id in existing_tenant_ids:
-                raise HTTPException(status_code=409, detail="You already belong to this band")
-
-            # Get tenant for response (validate it exists and is not deleted)
-            tenant = await couch_sitter_service.get_tenant(tenant_id)
-            if not tenant:
-                raise HTTPException(status_code=404, detail="Tenant not found or has been deleted")
-
-            # Add user to tenant
-            await couch_sitter_service.add_user_to_tenant(tenant_id, user_id, role)
-
-            # Mark invitation as accepted
-            await invite_service.accept_invitation(invitation, user_id)
-
-            logger.info(f"User {user_id} accepted invitation to tenant {tenant_id}")
-
-            # Convert to virtual ID format (remove tenant_ prefix)
-            virtual_tenant_id = tenant_id.replace("tenant_", "") if isinstance(tenant_id, str) and tenant_id.startswith("tenant_") else tenant_id
-
-            # Return complete tenant document for frontend to use immediately
-            return {
-                "success": True,
-                "_id": tenant_id,  # Internal format for local PouchDB
-                "type": "tenant",
-                "tenantId": virtual_tenant_id,  # Virtual ID for API calls
-                "name": tenant.get("name"),
-                "role": role,
-                "userIds": tenant.get("userIds", []),  # Member list
-                "createdAt": tenant.get("createdAt"),
-                "members": tenant.get("members", [])  # For display in UI
-            }
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error accepting invitation: {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail="Failed to accept invitation")
+            validate_tenant_id_format(tenant_id)
+        except TenantIdFormatError as e:
+            logger.error("Invalid tenant_id in invitation %s: %s - %s", invitation.get("_id"), tenant_id, e)
+            raise HTTPException(status_code=500, detail="Invitation data is corrupted (invalid tenant format)")
+
+        # Cannot accept your own invitation
+        if invitation.get("createdBy") == user_id:
+            raise HTTPException(status_code=400, detail="You cannot accept your own invitation")
+
+        # Get tenant for response (validate it exists and is not deleted);
+        # its userIds also answers the membership check
+        tenant = await couch_sitter_service.get_tenant(tenant_id, use_cache=False)
+        if not tenant:
+            raise HTTPException(status_code=404, detail="Tenant not found or has been deleted")
+
+        if user_id in tenant.get("userIds", []):
+            raise HTTPException(status_code=409, detail="You already belong to this band")
+
+        # Add user to tenant and mark the invitation accepted in one write
+        await couch_sitter_service.add_user_to_tenant(
+            tenant_id, user_id, role,
+            also_update=[(invitation, lambda doc: invite_service.mark_accepted(doc, user_id))]
+        )
+
+        logger.info("User %s accepted invitation to tenant %s", user_id, tenant_id)
+
+        # Convert to virtual ID format (remove tenant_ prefix)
+        virtual_tenant_id = tenant_id.replace("tenant_", "") if isinstance(tenant_id, str) and tenant_id.startswith("tenant_") else tenant_id
+
+        # Return complete tenant document for frontend to use immediately
+        return {
+            "success": True,
+            "_id": tenant_id,  # Internal format for local PouchDB
+            "type": "tenant",
+            "tenantId": virtual_tenant_id,  # Virtual ID for API calls
+            "name": tenant.get("name"),
+            "role": role,
+            "userIds": tenant.get("userIds", []),  # Member list
+            "createdAt": tenant.get("createdAt"),
+            "members": tenant.get("members", [])  # For display in UI
+        }
 
     @router.delete("/tenants/{tenant_id}/invitations/{invite_id}")
     async def revoke_invitation(
         tenant_id: str,
-        invite_id: str,
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        invite_id: str = Path(..., pattern=INVITE_ID_PATTERN),
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Revoke a pending invitation (owner/admin only).
@@ -491,37 +503,26 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             204 No Content
         """
-        try:
-            # Validate tenant ID format
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            
-            user_id = current_user.get("user_id")
+        validate_tenant_id_format(tenant_id)
+        
+        user_id = current_user.user_id
 
-            # Check access
-            # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
-            # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
-            # if user_role not in ["owner", "admin"]:
-            #     raise HTTPException(status_code=403, detail="Only owner/admin can revoke invitations")
+        # Check access
+        # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
+        # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
+        # if user_role not in ["owner", "admin"]:
+        #     raise HTTPException(status_code=403, detail="Only owner/admin can revoke invitations")
 
-            # Revoke invitation
-            await invite_service.revoke_invitation(invite_id)
+        # Revoke invitation
+        await invite_service.revoke_invitation(invite_id)
 
-            return {"status": "revoked"}
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error revoking invitation: {e}")
-            raise HTTPException(status_code=500, detail="Failed to revoke invitation")
+        return {"status": "revoked"}
 
     @router.post("/tenants/{tenant_id}/invitations/{invite_id}/resend")
     async def resend_invitation(
         tenant_id: str,
-        invite_id: str,
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        invite_id: str = Path(..., pattern=INVITE_ID_PATTERN),
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Resend an invitation (owner/admin only).
@@ -529,57 +530,51 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             Updated invitation with new token
         """
-        try:
-            user_id = current_user.get("user_id")
-
-            # Check access
-            # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
-            # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
-            # if user_role not in ["owner", "admin"]:
-            #     raise HTTPException(status_code=403, detail="Only owner/admin can resend invitations")
-
-            # Get invitation
-            invitation = await invite_service.get_invitation_by_id(invite_id)
-            if not invitation:
-                raise HTTPException(status_code=404, detail="Invitation not found")
-
-            # Generate new token
-            new_token = invite_service.generate_token()
-            new_hash = invite_service.hash_token(new_token)
-
-            from datetime import datetime, timezone, timedelta
-            expiration_days = 7
-            expires_at = (datetime.now(timezone.utc) + timedelta(days=expiration_days)).isoformat()
-
-            invitation["token"] = new_token
-            invitation["tokenHash"] = new_hash
-            invitation["expiresAt"] = expires_at
-
-            await couch_sitter_service._make_request("PUT", invite_id, json=invitation)
-
-            return {
-                "_id": invitation.get("_id"),
-                "email": invitation.get("email"),
-                "status": invitation.get("status"),
-                "token": new_token,
-                "inviteLink": f"https://app.example.com/join?invite={new_token}",
-                "expiresAt": expires_at
-            }
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error resending invitation: {e}")
-            raise HTTPException(status_code=500, detail="Failed to resend invitation")
+        validate_tenant_id_format(tenant_id)
+
+        user_id = current_user.user_id
+
+        # Check access
+        # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
+        # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
+        # if user_role not in ["owner", "admin"]:
+        #     raise HTTPException(status_code=403, detail="Only owner/admin can resend invitations")
+
+        # Get invitation
+        invitation = await invite_service.get_invitation_by_id(invite_id)
+        if not invitation:
+            raise HTTPException(status_code=404, detail="Invitation not found")
+
+        # Generate new token
+        new_token = invite_service.generate_token()
+        new_hash = invite_service.hash_token(new_token)
+
+        expiration_days = 7
+        expires_at = (datetime.now(timezone.utc) + timedelta(days=expiration_days)).isoformat()
+
+        invitation["token"] = new_token
+        invitation["tokenHash"] = new_hash
+        invitation["expiresAt"] = expires_at
+
+        await couch_sitter_service._make_request("PUT", invite_id, json=invitation)
+
+        return {
+            "_id": invitation.get("_id"),
+            "email": invitation.get("email"),
+            "status": invitation.get("status"),
+            "token": new_token,
+            "inviteLink": f"https://app.example.com/join?invite={new_token}",
+            "expiresAt": expires_at
+        }
 
     # ============ MEMBER MANAGEMENT ============
 
     @router.put("/tenants/{tenant_id}/members/{member_user_id}/role")
     async def change_member_role(
         tenant_id: str,
-        member_user_id: str,
-        request_data: Dict[str, Any],
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        member_user_id: str = Path(..., pattern=USER_ID_PATTERN),
+        request_data: RoleUpdate = Body(...),
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Change a member's role (owner only).
@@ -590,64 +585,56 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             Updated mapping
         """
-        try:
-            # Validate tenant ID format
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            
-            user_id = current_user.get("user_id")
-            new_role = request_data.get("role")
-
-            if new_role not in ["admin", "member"]:
-                raise HTTPException(status_code=400, detail="Invalid role")
-
-            # Check ownership
-            tenant = await couch_sitter_service.get_tenant(tenant_id)
-            if not tenant:
-                raise HTTPException(status_code=404, detail="Tenant not found")
-
-            if tenant.get("userId") != user_id:
-                raise HTTPException(status_code=403, detail="Only owner can change member roles")
-
-            # Cannot change owner role
-            if member_user_id == tenant.get("userId"):
-                raise HTTPException(status_code=400, detail="Cannot change owner role")
-
-            # Update user's tenants array with new role
-            response = await couch_sitter_service._make_request("GET", member_user_id)
-            user_doc = response.json()
-            
-            tenants = user_doc.get("tenants", [])
-            tenant_entry = next((t for t in tenants if t.get("tenantId") == tenant_id), None)
-            if not tenant_entry:
-                raise HTTPException(status_code=404, detail="Member not found")
-
-            tenant_entry["role"] = new_role
-            from datetime import datetime, timezone
-            tenant_entry["updatedAt"] = datetime.now(timezone.utc).isoformat()
-            
-            user_doc["updatedAt"] = datetime.now(timezone.utc).isoformat()
-            await couch_sitter_service._make_request("PUT", member_user_id, json=user_doc)
-
-            return {
-                "userId": member_user_id,
-                "role": new_role,
-                "updatedAt": mapping.get("updatedAt")
-            }
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error changing member role: {e}")
-            raise HTTPException(status_code=500, detail="Failed to change member role")
+        validate_tenant_id_format(tenant_id)
+        
+        user_id = current_user.user_id
+        new_role = request_data.role
+
+        # Check ownership; the member's user doc is fetched alongside the tenant
+        tenant, user_doc = await asyncio.gather(
+            couch_sitter_service.get_tenant(tenant_id, use_cache=False),
+            couch_sitter_service.get_user_doc(member_user_id),
+        )
+        if not tenant:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+
+        if tenant.get("userId") != user_id:
+            raise HTTPException(status_code=403, detail="Only owner can change member roles")
+
+        # Cannot change owner role
+        if member_user_id == tenant.get("userId"):
+            raise HTTPException(status_code=400, detail="Cannot change owner role")
+
+        if not user_doc:
+            raise HTTPException(status_code=404, detail="Member not found")
+
+        # Update user's tenants array with new role
+        # tenants[] entries store the virtual ID (older ones may hold the internal one)
+        tenant_id_virtual = tenant_id[7:] if tenant_id.startswith("tenant_") else tenant_id
+        tenants = user_doc.get("tenants", [])
+        tenant_entry = next(
+            (t for t in tenants if t.get("tenantId") in (tenant_id, tenant_id_virtual)), None
+        )
+        if not tenant_entry:
+            raise HTTPException(status_code=404, detail="Member not found")
+
+        now_iso = datetime.now(timezone.utc).isoformat()
+        tenant_entry["role"] = new_role
+        tenant_entry["updatedAt"] = now_iso
+        user_doc["updatedAt"] = now_iso
+        await couch_sitter_service._make_request("PUT", member_user_id, json=user_doc)
+
+        return {
+            "userId": member_user_id,
+            "role": new_role,
+            "updatedAt": now_iso
+        }
 
     @router.delete("/tenants/{tenant_id}/members/{member_user_id}")
     async def remove_member(
         tenant_id: str,
-        member_user_id: str,
-        current_user: Dict[str, Any] = Depends(get_current_user)
+        member_user_id: str = Path(..., pattern=USER_ID_PATTERN),
+        current_user: CurrentUser = Depends(get_current_user)
     ):
         """
         Remove a member from tenant (owner/admin only).
@@ -655,61 +642,57 @@ def create_tenant_router(couch_sitter_service, invite_service):
         Returns:
             Success with removed status
         """
-        try:
-            # Validate tenant ID format
-            try:
-                validate_tenant_id_format(tenant_id)
-            except TenantIdFormatError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            
-            user_id = current_user.get("user_id")
-            from datetime import datetime, timezone
-
-            # Check access
-            tenant = await couch_sitter_service.get_tenant(tenant_id)
-            if not tenant:
-                raise HTTPException(status_code=404, detail="Tenant not found")
-
-            # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
-            # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
-            # if user_role not in ["owner", "admin"]:
-            #     raise HTTPException(status_code=403, detail="Only owner/admin can remove members")
-
-            # Cannot remove owner
-            if member_user_id == tenant.get("userId"):
-                raise HTTPException(status_code=400, detail="Cannot remove owner from tenant")
-
-            # 1. Remove from tenant's userIds
-            tenant["userIds"] = [uid for uid in tenant.get("userIds", []) if uid != member_user_id]
-            tenant["updatedAt"] = datetime.now(timezone.utc).isoformat()
-            await couch_sitter_service._make_request("PUT", tenant_id, json=tenant)
-
-            # 2. Remove tenant from user's tenants array
-            try:
-                response = await couch_sitter_service._make_request("GET", member_user_id)
-                member_user_doc = response.json()
-                
-                member_user_doc["tenants"] = [
-                    t for t in member_user_doc.get("tenants", [])
-                    if t.get("tenantId") != tenant_id
-                ]
-                member_user_doc["updatedAt"] = datetime.now(timezone.utc).isoformat()
-                await couch_sitter_service._make_request("PUT", member_user_id, json=member_user_doc)
-                logger.info(f"Removed tenant {tenant_id} from user {member_user_id}")
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    logger.warning(f"User {member_user_id} not found when removing from tenant")
-                else:
-                    logger.error(f"Failed to update user {member_user_id}: {e}")
-                    raise
-
-            logger.info(f"Removed member {member_user_id} from tenant {tenant_id}")
-            return {"status": "removed"}
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error removing member: {e}")
-            raise HTTPException(status_code=500, detail="Failed to remove member")
+        validate_tenant_id_format(tenant_id)
+        
+        user_id = current_user.user_id
+
+        # Check access; the member's user doc is fetched alongside the tenant
+        tenant, member_user_doc = await asyncio.gather(
+            couch_sitter_service.get_tenant(tenant_id, use_cache=False),
+            couch_sitter_service.get_user_doc(member_user_id),
+        )
+        if not tenant:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+
+        # TODO: Check if owner or admin (roles not yet implemented, skipping for now)
+        # user_role = await couch_sitter_service.get_user_role_for_tenant(user_id, tenant_id)
+        # if user_role not in ["owner", "admin"]:
+        #     raise HTTPException(status_code=403, detail="Only owner/admin can remove members")
+
+        # Cannot remove owner
+        if member_user_id == tenant.get("userId"):
+            raise HTTPException(status_code=400, detail="Cannot remove owner from tenant")
+
+        now_iso = datetime.now(timezone.utc).isoformat()
+
+        # 1. Remove from tenant's userIds
+        def remove_from_tenant(doc):
+            doc["userIds"] = [uid for uid in doc.get("userIds", []) if uid != member_user_id]
+            doc["updatedAt"] = now_iso
+
+        updates = [(tenant, remove_from_tenant)]
+
+        # 2. Remove tenant from user's tenants array
+        # tenants[] entries store the virtual ID, tenantIds[] the internal one
+        tenant_id_virtual = tenant_id[7:] if tenant_id.startswith("tenant_") else tenant_id
+
+        def remove_from_user(doc):
+            doc["tenants"] = [
+                t for t in doc.get("tenants", [])
+                if t.get("tenantId") not in (tenant_id, tenant_id_virtual)
+            ]
+            doc["tenantIds"] = [tid for tid in doc.get("tenantIds", []) if tid != tenant_id]
+            doc["updatedAt"] = now_iso
+
+        if member_user_doc:
+            updates.append((member_user_doc, remove_from_user))
+        else:
+            logger.warning("User %s not found when removing from tenant", member_user_id)
+
+        # Both docs are written in one _bulk_docs call
+        await couch_sitter_service.bulk_update(updates)
+
+        logger.info("Removed member %s from tenant %s", member_user_id, tenant_id)
+        return {"status": "removed"}
 
     return router
@@ -6,12 +6,41 @@ Handles tenant initialization and creation for users with no tenants.
 
 import uuid
 import logging
+from collections import OrderedDict
 import httpx
-from typing import Optional, Dict, Any, List
+import orjson
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timezone
 
+from .dal import HTTP2_AVAILABLE, UPSTREAM_LIMITS
+
 logger = logging.getLogger(__name__)
 
+# Timeout for CouchDB requests (seconds)
+REQUEST_TIMEOUT = 10.0
+
+# Bodies are pre-encoded with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Maximum number of tenants returned for one owner
+MAX_USER_TENANTS = 100
+
+# View of tenant docs keyed by [owner_id, created_at], so one owner's tenants
+# are a contiguous, already-sorted key range
+TENANTS_DESIGN_DOC = {
+    "_id": "_design/tenants_by_owner",
+    "views": {
+        "by_owner": {
+            "map": "function(doc) { if (doc.type === 'tenant') emit([doc.owner_id, doc.created_at], null); }"
+        }
+    },
+}
+TENANTS_BY_OWNER_VIEW = "_design/tenants_by_owner/_view/by_owner"
+
+# Number of last-written user docs kept to skip the GET before a PUT
+USER_DOC_CACHE_SIZE = 1000
+
 
 class TenantService:
     """Service for creating and initializing user tenants"""
@@ -28,6 +57,30 @@ class TenantService:
         self.couchdb_url = couchdb_url.rstrip('/')
         self.username = username
         self.password = password
+        self._client: Optional[httpx.AsyncClient] = None
+        # (database, user_hash) -> user doc as of our last successful write
+        self._user_docs: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled CouchDB client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            # Never persist upstream cookies: the client is shared across users
+            no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+            self._client = httpx.AsyncClient(
+                base_url=self.couchdb_url,
+                auth=(self.username, self.password),
+                http2=HTTP2_AVAILABLE,
+                timeout=REQUEST_TIMEOUT,
+                limits=UPSTREAM_LIMITS,
+                cookies=no_cookies,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled CouchDB client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def create_tenant(
         self,
@@ -68,29 +121,22 @@ class TenantService:
             }
 
             # Store tenant in user's database
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{self.couchdb_url}/{database}/{tenant_id}",
-                    json=tenant_doc,
-                    auth=(self.username, self.password),
-                )
-
-                if response.status_code in (200, 201):
-                    logger.info(
-                        f"✅ Created tenant {tenant_id} for user {user_hash} in {database}"
-                    )
-                    return {
-                        "tenant_id": tenant_uuid,  # Return without prefix for virtual ID
-                        "doc": tenant_doc,
-                    }
-                else:
-                    logger.error(
-                        f"❌ Failed to create tenant: {response.status_code} {response.text}"
-                    )
-                    raise Exception(f"CouchDB error: {response.status_code}")
+            response = await self._get_client().put(
+                f"/{database}/{tenant_id}", content=orjson.dumps(tenant_doc), headers=JSON_HEADERS
+            )
+
+            if response.status_code in (200, 201):
+                logger.info("✅ Created tenant %s for user %s in %s", tenant_id, user_hash, database)
+                return {
+                    "tenant_id": tenant_uuid,  # Return without prefix for virtual ID
+                    "doc": tenant_doc,
+                }
+            else:
+                logger.error("❌ Failed to create tenant: %s %s", response.status_code, response.text)
+                raise Exception(f"CouchDB error: {response.status_code}")
 
         except Exception as e:
-            logger.error(f"❌ Error creating tenant: {e}", exc_info=True)
+            logger.error("❌ Error creating tenant: %s", e, exc_info=True)
             raise
 
     async def set_user_default_tenant(
@@ -102,6 +148,9 @@ class TenantService:
         """
         Set a user's default active_tenant_id in their user document.
 
+        If we wrote this user doc before, it is PUT straight back with the
+        remembered _rev; only when that conflicts is the doc fetched again.
+
         Args:
             user_hash: User ID hash
             tenant_id: Tenant ID (without prefix)
@@ -115,47 +164,67 @@ class TenantService:
         """
         try:
             user_doc_id = f"user_{user_hash}"
+            key = (database, user_hash)
+
+            client = self._get_client()
 
-            async with httpx.AsyncClient() as client:
-                # Get current user doc to preserve _rev
-                get_response = await client.get(
-                    f"{self.couchdb_url}/{database}/{user_doc_id}",
-                    auth=(self.username, self.password),
+            cached_doc = self._user_docs.get(key)
+            if cached_doc is not None:
+                user_doc = {**cached_doc, "active_tenant_id": tenant_id}
+                put_response = await client.put(
+                    f"/{database}/{user_doc_id}",
+                    content=orjson.dumps(user_doc),
+                    headers={**JSON_HEADERS, "If-Match": cached_doc["_rev"]},
                 )
+                if put_response.status_code in (200, 201):
+                    self._remember_user_doc(key, user_doc, put_response)
+                    logger.info("✅ Set default tenant %s for user %s", tenant_id, user_hash)
+                    return user_doc
+                # 409: the doc changed since our last write, so fetch it again
+                self._user_docs.pop(key, None)
 
-                if get_response.status_code != 200:
-                    logger.error(
-                        f"⚠️  Could not get user doc {user_doc_id}: {get_response.status_code}"
-                    )
-                    return {}
+            # Get current user doc to preserve _rev
+            get_response = await client.get(f"/{database}/{user_doc_id}")
 
-                user_doc = get_response.json()
+            if get_response.status_code != 200:
+                logger.error("⚠️  Could not get user doc %s: %s", user_doc_id, get_response.status_code)
+                return {}
 
-                # Update active_tenant_id
-                user_doc["active_tenant_id"] = tenant_id
+            user_doc = orjson.loads(get_response.content)
 
-                # Put updated document back
-                put_response = await client.put(
-                    f"{self.couchdb_url}/{database}/{user_doc_id}",
-                    json=user_doc,
-                    auth=(self.username, self.password),
-                )
+            # Update active_tenant_id
+            user_doc["active_tenant_id"] = tenant_id
 
-                if put_response.status_code in (200, 201):
-                    logger.info(
-                        f"✅ Set default tenant {tenant_id} for user {user_hash}"
-                    )
-                    return user_doc
-                else:
-                    logger.warning(
-                        f"⚠️  Failed to set default tenant: {put_response.status_code}"
-                    )
-                    return user_doc  # Return anyway, will be retried
+            # Put updated document back
+            put_response = await client.put(
+                f"/{database}/{user_doc_id}", content=orjson.dumps(user_doc), headers=JSON_HEADERS
+            )
+
+            if put_response.status_code in (200, 201):
+                self._remember_user_doc(key, user_doc, put_response)
+                logger.info("✅ Set default tenant %s for user %s", tenant_id, user_hash)
+                return user_doc
+            else:
+                logger.warning("⚠️  Failed to set default tenant: %s", put_response.status_code)
+                return user_doc  # Return anyway, will be retried
 
         except Exception as e:
-            logger.error(f"❌ Error setting default tenant: {e}", exc_info=True)
+            logger.error("❌ Error setting default tenant: %s", e, exc_info=True)
             raise
 
+    def _remember_user_doc(
+        self,
+        key: Tuple[str, str],
+        user_doc: Dict[str, Any],
+        put_response: httpx.Response
+    ) -> None:
+        """Record the new _rev on a written user doc and keep a copy of it"""
+        user_doc["_rev"] = orjson.loads(put_response.content)["rev"]
+        self._user_docs[key] = dict(user_doc)
+        self._user_docs.move_to_end(key)
+        while len(self._user_docs) > USER_DOC_CACHE_SIZE:
+            self._user_docs.popitem(last=False)
+
     async def query_user_tenants(
         self,
         user_hash: str,
@@ -164,6 +233,8 @@ class TenantService:
         """
         Query all tenants owned by a user.
 
+        Reads the tenants_by_owner view, creating its design doc on first use.
+
         Args:
             user_hash: User ID hash
             database: Database to query (default: roady)
@@ -174,32 +245,41 @@ class TenantService:
         Raises:
             Exception: If query fails
         """
+        params = {
+            "startkey": orjson.dumps([user_hash]).decode(),
+            "endkey": orjson.dumps([user_hash, {}]).decode(),
+            "include_docs": "true",
+            "limit": MAX_USER_TENANTS,
+        }
         try:
-            query = {
-                "selector": {
-                    "type": "tenant",
-                    "owner_id": user_hash,
-                },
-                "sort": ["created_at"],
-                "limit": 100,
-            }
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.couchdb_url}/{database}/_find",
-                    json=query,
-                    auth=(self.username, self.password),
-                )
-
-                if response.status_code == 200:
-                    result = await response.json()
-                    docs = result.get("docs", [])
-                    logger.debug(f"Found {len(docs)} tenants for user {user_hash}")
-                    return docs
-                else:
-                    logger.error(f"⚠️  Query failed: {response.status_code}")
-                    return []
+            client = self._get_client()
+            response = await client.get(f"/{database}/{TENANTS_BY_OWNER_VIEW}", params=params)
+
+            if response.status_code == 404:
+                # Design doc not created yet in this database
+                await self._ensure_tenants_view(database)
+                response = await client.get(f"/{database}/{TENANTS_BY_OWNER_VIEW}", params=params)
+
+            if response.status_code == 200:
+                docs = [row["doc"] for row in orjson.loads(response.content).get("rows", []) if row.get("doc")]
+                logger.debug("Found %d tenants for user %s", len(docs), user_hash)
+                return docs
+            else:
+                logger.error("⚠️  Query failed: %s", response.status_code)
+                return []
 
         except Exception as e:
-            logger.error(f"❌ Error querying user tenants: {e}", exc_info=True)
+            logger.error("❌ Error querying user tenants: %s", e, exc_info=True)
             return []
+
+    async def _ensure_tenants_view(self, database: str) -> None:
+        """Create the tenants_by_owner design doc (a concurrent create is fine)"""
+        response = await self._get_client().put(
+            f"/{database}/{TENANTS_DESIGN_DOC['_id']}",
+            content=orjson.dumps(TENANTS_DESIGN_DOC),
+            headers=JSON_HEADERS,
+        )
+        if response.status_code in (201, 202, 409):
+            logger.info("Ensured %s in %s", TENANTS_DESIGN_DOC["_id"], database)
+        else:
+            logger.error("⚠️  Could not create %s in %s: %s", TENANTS_DESIGN_DOC["_id"], database, response.status_code)
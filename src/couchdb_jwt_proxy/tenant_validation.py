@@ -8,14 +8,20 @@ Ensures that:
 """
 
 import logging
-from typing import Dict, List, Any, Optional
-from fastapi import HTTPException
-import json
+from typing import Dict, FrozenSet, List, Any
 import re
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
+# Whole-ID formats matched in one pass; the step-by-step checks below only run
+# for IDs that don't match, to explain the rejection
+_USER_ID_RE = re.compile(r"user_[0-9a-fA-F]{64}\Z")
+_TENANT_ID_RE = re.compile(
+    r"tenant_(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{32})\Z"
+)
+
 
 class TenantAccessError(Exception):
     """Raised when document access violates tenant ownership"""
@@ -42,6 +48,9 @@ def validate_user_id_format(user_id: str) -> None:
     Raises:
         UserIdFormatError: If format is invalid
     """
+    if user_id and _USER_ID_RE.match(user_id):
+        return
+
     if not user_id:
         raise UserIdFormatError("User ID cannot be empty")
     
@@ -63,13 +72,10 @@ def validate_user_id_format(user_id: str) -> None:
             f"User ID hash must be 64 characters (SHA256 hex), got {len(hash_part)}: {hash_part}"
         )
     
-    # Validate that hash contains only valid hex characters
-    try:
-        int(hash_part, 16)
-    except ValueError:
-        raise UserIdFormatError(
-            f"User ID hash must be valid hexadecimal, got: {hash_part}"
-        )
+    # Right prefix and length, so the hash has non-hex characters
+    raise UserIdFormatError(
+        f"User ID hash must be valid hexadecimal, got: {hash_part}"
+    )
 
 
 def validate_tenant_id_format(tenant_id: str) -> None:
@@ -82,6 +88,9 @@ def validate_tenant_id_format(tenant_id: str) -> None:
     Raises:
         TenantIdFormatError: If format is invalid
     """
+    if tenant_id and _TENANT_ID_RE.match(tenant_id):
+        return
+
     if not tenant_id:
         raise TenantIdFormatError("Tenant ID cannot be empty")
     
@@ -97,7 +106,7 @@ def validate_tenant_id_format(tenant_id: str) -> None:
     if not uuid_part:
         raise TenantIdFormatError("Tenant ID must include a UUID after 'tenant_'")
     
-    # Validate that the UUID part is a valid UUID
+    # Not the canonical form; UUID() still accepts its other spellings
     try:
         UUID(uuid_part)
     except ValueError:
@@ -134,27 +143,70 @@ class TenantValidator:
         Raises:
             TenantAccessError: If validation fails
         """
+        self._check_database(database)
+        tenant_ids = await self._get_tenant_ids(user_id)
+        self._validate_write_against(doc, tenant_ids, user_id, database)
+    
+    async def validate_bulk_docs(
+        self,
+        docs: List[Dict[str, Any]],
+        user_id: str,
+        database: str
+    ) -> None:
+        """
+        Validate all documents in a bulk write operation.
         
-        # Ensure this is an app database, not couch-sitter
+        All docs must pass validation or entire operation is rejected.
+        The user's tenants are fetched once and every doc is checked against them.
+        """
+        # Skip deleted documents; a batch with nothing else needs no checks
+        live_docs = [(i, doc) for i, doc in enumerate(docs) if not doc.get("_deleted")]
+        if not live_docs:
+            return
+
+        self._check_database(database)
+        tenant_ids = await self._get_tenant_ids(user_id)
+
+        for i, doc in live_docs:
+            try:
+                self._validate_write_against(doc, tenant_ids, user_id, database)
+            except TenantAccessError as e:
+                raise TenantAccessError(
+                    f"Document {i} failed validation: {str(e)}"
+                )
+
+    @staticmethod
+    def _check_database(database: str) -> None:
+        """Ensure this is an app database, not couch-sitter"""
         if database == 'couch-sitter':
             raise TenantAccessError(
                 "Cannot write directly to couch-sitter. "
                 "Use /api/tenants endpoint to create tenants."
             )
-        
-        # Get user's authorized tenants from couch-sitter
+
+    async def _get_tenant_ids(self, user_id: str) -> FrozenSet[str]:
+        """Get user's authorized tenant IDs from couch-sitter, as a set for O(1) checks"""
         try:
             user_tenants, _ = await self.couch_sitter_service.get_user_tenants(user_id)
-            tenant_ids = [t.get("_id") for t in user_tenants if t]
+            tenant_ids = frozenset(t["_id"] for t in user_tenants if t and t.get("_id"))
         except Exception as e:
-            logger.error(f"Failed to get user tenants: {e}")
+            logger.error("Failed to get user tenants: %s", e)
             raise TenantAccessError("Cannot verify tenant access")
         
         if not tenant_ids:
             raise TenantAccessError(
                 "User has no authorized tenants. Create one first via /api/tenants"
             )
-        
+        return tenant_ids
+
+    @staticmethod
+    def _validate_write_against(
+        doc: Dict[str, Any],
+        tenant_ids: FrozenSet[str],
+        user_id: str,
+        database: str
+    ) -> None:
+        """Check one document against the user's already-fetched tenant IDs"""
         # Special handling for band-info documents
         doc_id = doc.get("_id", "")
         doc_type = doc.get("type", "")
@@ -166,7 +218,7 @@ class TenantValidator:
                 if tenant_id not in tenant_ids:
                     raise TenantAccessError(
                         f"Cannot create band-info for tenant '{tenant_id}'. "
-                        f"You have access to: {tenant_ids}"
+                        f"You have access to: {sorted(tenant_ids)}"
                     )
                 # band-info is OK - update doc to include tenant field
                 doc["tenant"] = tenant_id
@@ -182,43 +234,20 @@ class TenantValidator:
         if not tenant_id:
             raise TenantAccessError(
                 f"Document missing required 'tenant' field. "
-                f"Document must belong to one of your tenants: {tenant_ids}"
+                f"Document must belong to one of your tenants: {sorted(tenant_ids)}"
             )
         
         # Verify tenant ownership
         if tenant_id not in tenant_ids:
             raise TenantAccessError(
                 f"Cannot write to tenant '{tenant_id}'. "
-                f"You have access to: {tenant_ids}"
+                f"You have access to: {sorted(tenant_ids)}"
             )
         
         logger.info(
-            f"✅ Tenant validation passed: user={user_id}, tenant={tenant_id}, db={database}"
+            "✅ Tenant validation passed: user=%s, tenant=%s, db=%s", user_id, tenant_id, database
         )
     
-    async def validate_bulk_docs(
-        self,
-        docs: List[Dict[str, Any]],
-        user_id: str,
-        database: str
-    ) -> None:
-        """
-        Validate all documents in a bulk write operation.
-        
-        All docs must pass validation or entire operation is rejected.
-        """
-        for i, doc in enumerate(docs):
-            try:
-                # Skip deleted documents
-                if doc.get("_deleted"):
-                    continue
-                
-                await self.validate_write(doc, user_id, database)
-            except TenantAccessError as e:
-                raise TenantAccessError(
-                    f"Document {i} failed validation: {str(e)}"
-                )
-    
     @staticmethod
     def is_app_database(database: str) -> bool:
         """Check if database is an app database (not couch-sitter)"""
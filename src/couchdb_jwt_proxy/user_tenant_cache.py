@@ -8,14 +8,39 @@ database queries and improve performance of the JWT proxy.
 import os
 import sys
 import time
+import asyncio
 import threading
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Awaitable, Set
+from dataclasses import dataclass, fields
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default cap on cached users; the oldest entries are evicted beyond it
+DEFAULT_MAX_SIZE = 10000
 
+# Fraction of the TTL after which a hit also triggers a background refresh
+DEFAULT_SOFT_TTL_RATIO = 0.8
+
+
+def _with_slots(cls):
+    """
+    Rebuild a dataclass with __slots__ for its fields.
+
+    Equivalent to dataclass(slots=True), which needs Python 3.10. Field
+    defaults live on the generated __init__, so the class attributes that
+    would clash with the slots can be dropped.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in names}
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_with_slots
 @dataclass
 class UserTenantInfo:
     """Data class representing user and tenant information"""
@@ -25,11 +50,11 @@ class UserTenantInfo:
     email: Optional[str] = None
     name: Optional[str] = None
     is_personal_tenant: bool = True
-    cached_at: float = None
+    cached_at: float = None  # time.monotonic() when cached
 
     def __post_init__(self):
         if self.cached_at is None:
-            self.cached_at = time.time()
+            self.cached_at = time.monotonic()
 
 
 class UserTenantCache:
@@ -37,68 +62,124 @@ class UserTenantCache:
     Thread-safe in-memory cache for user and tenant information.
 
     Features:
-    - Thread-safe operations using threading.Lock
+    - Thread-safe operations using threading.Lock (reads of live entries skip it)
     - TTL (time-to-live) support with automatic cleanup
+    - Bounded size: entries are kept in the order they were cached, so
+      evicting from the front drops the entries closest to expiry
+    - Refresh-ahead: hits past the soft TTL are served from memory while the
+      entry is reloaded in the background, so it rarely expires under load
     - Simple dictionary-based lookup by sub_hash
     - Logging for debugging and monitoring
     """
 
-    def __init__(self, ttl_seconds: int = 300):
+    def __init__(
+        self,
+        ttl_seconds: int = 300,
+        max_size: int = DEFAULT_MAX_SIZE,
+        soft_ttl_ratio: float = DEFAULT_SOFT_TTL_RATIO,
+    ):
         """
         Initialize the cache.
 
         Args:
             ttl_seconds: Time-to-live for cache entries (default: 5 minutes)
+            max_size: Maximum number of cached users (default: 10000)
+            soft_ttl_ratio: Fraction of the TTL after which hits refresh the
+                entry in the background (default: 0.8)
         """
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, UserTenantInfo] = {}
+        self.max_size = max_size
+        self.soft_ttl_seconds = ttl_seconds * soft_ttl_ratio
+        self._cache: "OrderedDict[str, UserTenantInfo]" = OrderedDict()
         self._lock = threading.RLock()
-        logger.info(f"UserTenantCache initialized with TTL={ttl_seconds}s")
+        # sub_hashes with a background refresh in flight, and the tasks themselves
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        logger.info("UserTenantCache initialized with TTL=%ss, max_size=%s", ttl_seconds, max_size)
 
     def _is_expired(self, info: UserTenantInfo) -> bool:
         """Check if a cache entry has expired."""
-        return time.time() - info.cached_at > self.ttl_seconds
+        return time.monotonic() - info.cached_at > self.ttl_seconds
 
     def _cleanup_expired(self):
-        """Remove expired entries from the cache."""
-        current_time = time.time()
-        expired_keys = []
-
-        for key, info in self._cache.items():
-            if current_time - info.cached_at > self.ttl_seconds:
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            del self._cache[key]
-            logger.debug(f"Removed expired cache entry: {key}")
-
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
-
-    def get_user_by_sub_hash(self, sub_hash: str) -> Optional[UserTenantInfo]:
+        """Remove expired entries from the cache (caller holds the lock)."""
+        current_time = time.monotonic()
+        before = len(self._cache)
+
+        # Rebuild in one pass; lock-free readers see either the old or new dict
+        self._cache = OrderedDict(
+            (key, info) for key, info in self._cache.items()
+            if current_time - info.cached_at <= self.ttl_seconds
+        )
+
+        removed = before - len(self._cache)
+        if removed:
+            logger.debug("Cleaned up %d expired cache entries", removed)
+
+    def get_user_by_sub_hash(
+        self,
+        sub_hash: str,
+        refresh: Optional[Callable[[], Awaitable[UserTenantInfo]]] = None
+    ) -> Optional[UserTenantInfo]:
         """
         Get user and tenant information by sub_hash.
 
         Args:
             sub_hash: SHA256 hash of the Clerk sub claim
+            refresh: Loads fresh info for this user. When given and the entry
+                is past the soft TTL, it is run in a background task and the
+                result re-cached; the current entry is still returned.
 
         Returns:
             UserTenantInfo if found and not expired, None otherwise
         """
+        # A single dict read is atomic, so hits don't need the lock
+        info = self._cache.get(sub_hash)
+
+        if info is None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache miss for sub_hash: %s", sub_hash)
+            return None
+
+        if self._is_expired(info):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache expired for sub_hash: %s", sub_hash)
+            with self._lock:
+                # Only drop the entry we saw; set_user may have replaced it meanwhile
+                if self._cache.get(sub_hash) is info:
+                    del self._cache[sub_hash]
+            return None
+
+        if refresh is not None and time.monotonic() - info.cached_at > self.soft_ttl_seconds:
+            self._schedule_refresh(sub_hash, refresh)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cache hit for sub_hash: %s -> user_id=%s, tenant_id=%s", sub_hash, info.user_id, info.tenant_id)
+        return info
+
+    def _schedule_refresh(self, sub_hash: str, refresh: Callable[[], Awaitable[UserTenantInfo]]) -> None:
+        """Start one background refresh per sub_hash (needs a running event loop)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
         with self._lock:
-            info = self._cache.get(sub_hash)
-
-            if info is None:
-                logger.debug(f"Cache miss for sub_hash: {sub_hash}")
-                return None
-
-            if self._is_expired(info):
-                logger.debug(f"Cache expired for sub_hash: {sub_hash}")
-                del self._cache[sub_hash]
-                return None
-
-            logger.debug(f"Cache hit for sub_hash: {sub_hash} -> user_id={info.user_id}, tenant_id={info.tenant_id}")
-            return info
+            if sub_hash in self._refreshing:
+                return
+            self._refreshing.add(sub_hash)
+        task = loop.create_task(self._refresh(sub_hash, refresh))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, sub_hash: str, refresh: Callable[[], Awaitable[UserTenantInfo]]) -> None:
+        """Reload an entry and re-cache it; on failure the entry simply ages out"""
+        try:
+            self.set_user(sub_hash, await refresh())
+        except Exception as e:
+            logger.warning("Background refresh failed for sub_hash %s: %s", sub_hash, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(sub_hash)
 
     def set_user(self, sub_hash: str, info: UserTenantInfo) -> None:
         """
@@ -109,10 +190,14 @@ class UserTenantCache:
             info: UserTenantInfo to cache
         """
         with self._lock:
-            # Update cache timestamp
-            info.cached_at = time.time()
+            # Update cache timestamp; re-caching moves the entry to the back
+            info.cached_at = time.monotonic()
             self._cache[sub_hash] = info
-            logger.debug(f"Cached user info for sub_hash: {sub_hash} -> user_id={info.user_id}, tenant_id={info.tenant_id}")
+            self._cache.move_to_end(sub_hash)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cached user info for sub_hash: %s -> user_id=%s, tenant_id=%s", sub_hash, info.user_id, info.tenant_id)
 
     def invalidate(self, sub_hash: str) -> bool:
         """
@@ -127,7 +212,8 @@ class UserTenantCache:
         with self._lock:
             if sub_hash in self._cache:
                 del self._cache[sub_hash]
-                logger.debug(f"Invalidated cache entry for sub_hash: {sub_hash}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Invalidated cache entry for sub_hash: %s", sub_hash)
                 return True
             return False
 
@@ -141,7 +227,7 @@ class UserTenantCache:
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
-            logger.info(f"Cleared all cache entries ({count} removed)")
+            logger.info("Cleared all cache entries (%d removed)", count)
             return count
 
     def get_stats(self) -> Dict[str, Any]:
@@ -152,7 +238,6 @@ class UserTenantCache:
             Dictionary with cache statistics
         """
         with self._lock:
-            current_time = time.time()
             total_entries = len(self._cache)
             expired_count = sum(1 for info in self._cache.values() if self._is_expired(info))
 
@@ -195,7 +280,9 @@ def get_cache() -> UserTenantCache:
             if _cache_instance is None:
                 env_value = os.getenv("USER_CACHE_TTL_SECONDS")
                 ttl = int(env_value) if env_value is not None else 300
-                _cache_instance = UserTenantCache(ttl_seconds=ttl)
+                env_value = os.getenv("USER_CACHE_MAX")
+                max_size = int(env_value) if env_value is not None else DEFAULT_MAX_SIZE
+                _cache_instance = UserTenantCache(ttl_seconds=ttl, max_size=max_size)
 
     return _cache_instance
 
@@ -0,0 +1,92 @@
+"""
+Unit tests for AuthLogService batched writes
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from couchdb_jwt_proxy.auth_log_service import AuthLogService
+
+
+class TestAuthLogBatching:
+    """Test batched auth event logging."""
+
+    @pytest.fixture
+    def auth_log_service(self):
+        """Create an AuthLogService with a mocked HTTP layer."""
+        service = AuthLogService("http://localhost:5984/couch-sitter-log", "admin", "admin")
+        response = MagicMock()
+        response.status_code = 201
+        service._make_request = AsyncMock(return_value=response)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_bulk_log_posts_bulk_docs(self, auth_log_service):
+        """A batch is written with a single _bulk_docs POST."""
+        docs = [
+            auth_log_service._build_event_doc(action="auth_request", status="success"),
+            auth_log_service._build_event_doc(action="auth_request", status="success"),
+        ]
+
+        assert await auth_log_service.bulk_log(docs) is True
+
+        auth_log_service._make_request.assert_awaited_once()
+        method, path = auth_log_service._make_request.call_args.args
+        assert (method, path) == ("POST", "_bulk_docs")
+        assert auth_log_service._make_request.call_args.kwargs["json"] == {"docs": docs}
+
+    @pytest.mark.asyncio
+    async def test_queued_events_flush_in_one_batch(self, auth_log_service):
+        """Events queued while the writer runs are flushed together."""
+        auth_log_service.start_batch_writer()
+        for i in range(5):
+            auth_log_service.enqueue_auth_event(
+                action="auth_request", status="success", user_id=f"user{i}"
+            )
+
+        await asyncio.sleep(0.6)
+        await auth_log_service.stop_batch_writer()
+
+        auth_log_service._make_request.assert_awaited_once()
+        docs = auth_log_service._make_request.call_args.kwargs["json"]["docs"]
+        assert [d["user_id"] for d in docs] == [f"user{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_events(self, auth_log_service):
+        """Stopping the writer flushes events that were never drained."""
+        auth_log_service.start_batch_writer()
+        auth_log_service._writer_task.cancel()
+        auth_log_service.enqueue_auth_event(action="auth_request", status="success")
+
+        await auth_log_service.stop_batch_writer()
+
+        docs = auth_log_service._make_request.call_args.kwargs["json"]["docs"]
+        assert len(docs) == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_batch_being_collected(self, auth_log_service):
+        """Events the writer already took off the queue are written on stop."""
+        auth_log_service.start_batch_writer()
+        for i in range(3):
+            auth_log_service.enqueue_auth_event(
+                action="auth_request", status="success", user_id=f"user{i}"
+            )
+
+        # Let the writer drain the queue and start waiting out the flush interval
+        await asyncio.sleep(0.05)
+        assert auth_log_service._queue.empty()
+        await auth_log_service.stop_batch_writer()
+
+        auth_log_service._make_request.assert_awaited_once()
+        docs = auth_log_service._make_request.call_args.kwargs["json"]["docs"]
+        assert [d["user_id"] for d in docs] == ["user0", "user1", "user2"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_event(self, auth_log_service):
+        """Backpressure: events are dropped rather than blocking the request."""
+        auth_log_service.start_batch_writer()
+        auth_log_service._queue = asyncio.Queue(maxsize=1)
+        assert auth_log_service.enqueue_auth_event(action="a", status="success") is True
+        assert auth_log_service.enqueue_auth_event(action="b", status="success") is False
+        await auth_log_service.stop_batch_writer()
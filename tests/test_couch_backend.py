@@ -0,0 +1,60 @@
+"""
+CouchBackend tests.
+
+The backend's client is swapped for one on an httpx MockTransport.
+"""
+
+import httpx
+import orjson
+import pytest
+
+from couchdb_jwt_proxy.dal import CouchBackend
+
+
+def backend_for(handler):
+    backend = CouchBackend("http://couchdb:5984", "admin", "secret")
+    backend._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return backend
+
+
+@pytest.mark.asyncio
+async def test_post_sends_orjson_body_and_parses_reply():
+    seen = []
+
+    def couchdb(request):
+        seen.append(request)
+        return httpx.Response(200, content=b'{"docs":[{"_id":"a"}]}')
+
+    backend = backend_for(couchdb)
+    result = await backend.handle_request("roady/_find", "POST", {"selector": {"type": "item"}})
+
+    assert result == {"docs": [{"_id": "a"}]}
+    assert orjson.loads(seen[0].content) == {"selector": {"type": "item"}}
+    assert seen[0].headers["content-type"] == "application/json"
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_post_without_payload_sends_no_body():
+    seen = []
+
+    def couchdb(request):
+        seen.append(request)
+        return httpx.Response(201, content=b"")
+
+    backend = backend_for(couchdb)
+
+    assert await backend.handle_request("roady/_ensure_full_commit", "POST") == {}
+    assert seen[0].content == b""
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_error_reply_is_returned_parsed():
+    def couchdb(request):
+        return httpx.Response(404, content=b'{"error":"not_found","reason":"missing"}')
+
+    backend = backend_for(couchdb)
+
+    assert await backend.handle_request("roady/nope", "GET") == {"error": "not_found", "reason": "missing"}
+    await backend.close()
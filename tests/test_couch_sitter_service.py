@@ -12,7 +12,8 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime, timedelta
 
 # Import service modules
-from couchdb_jwt_proxy.couch_sitter_service import CouchSitterService
+from couchdb_jwt_proxy.couch_sitter_service import BulkUpdateConflict, CouchSitterService
+from couchdb_jwt_proxy.invite_service import InviteService
 from couchdb_jwt_proxy.user_tenant_cache import UserTenantInfo
 from couchdb_jwt_proxy.dal import create_dal
 
@@ -421,6 +422,113 @@ class TestCouchSitterService:
         assert updated_user["name"] == "Updated Name"
 
 
+    @pytest.mark.asyncio
+    async def test_bulk_update_retries_conflicts_on_fresh_doc(self, couch_sitter_service):
+        """Docs rejected with a conflict are re-read and mutated again, others keep their write"""
+        responses = [
+            [{"ok": True, "id": "doc1", "rev": "2-a"}, {"id": "doc2", "error": "conflict"}],
+            {"_id": "doc2", "_rev": "2-theirs", "items": ["theirs"]},
+            [{"ok": True, "id": "doc2", "rev": "3-b"}],
+        ]
+        calls = []
+
+        async def fake_request(method, path, **kwargs):
+            calls.append((method, path, kwargs.get("json")))
+            response = MagicMock()
+            response.json.return_value = responses.pop(0)
+            return response
+
+        couch_sitter_service._make_request = fake_request
+
+        def add_item(doc):
+            doc.setdefault("items", []).append("ours")
+
+        doc1 = {"_id": "doc1", "_rev": "1-a"}
+        doc2 = {"_id": "doc2", "_rev": "1-b"}
+        await couch_sitter_service.bulk_update([(doc1, add_item), (doc2, add_item)])
+
+        assert [(method, path) for method, path, _ in calls] == [
+            ("POST", "_bulk_docs"), ("GET", "doc2"), ("POST", "_bulk_docs")
+        ]
+        assert doc1 == {"_id": "doc1", "_rev": "2-a", "items": ["ours"]}
+        retried = calls[2][2]["docs"][0]
+        assert retried["items"] == ["theirs", "ours"]
+        assert retried["_rev"] == "3-b"
+
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_does_not_accept_revoked_invitation(self, couch_sitter_service, memory_dal):
+        """An invitation revoked concurrently is re-checked on the fresh doc, not re-accepted"""
+        responses = [
+            [{"id": "invite_1", "error": "conflict"}],
+            {"_id": "invite_1", "_rev": "2-revoked", "status": "revoked"},
+        ]
+        calls = []
+
+        async def fake_request(method, path, **kwargs):
+            calls.append((method, path))
+            response = MagicMock()
+            response.json.return_value = responses.pop(0)
+            return response
+
+        couch_sitter_service._make_request = fake_request
+        invite_service = InviteService("http://localhost:5984/couch-sitter", dal=memory_dal)
+
+        invitation = {"_id": "invite_1", "_rev": "1-a", "status": "pending"}
+        with pytest.raises(BulkUpdateConflict):
+            await couch_sitter_service.bulk_update(
+                [(invitation, lambda doc: invite_service.mark_accepted(doc, "user_bob"))]
+            )
+
+        assert calls == [("POST", "_bulk_docs"), ("GET", "invite_1")]
+
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_cached_until_written(self, couch_sitter_service):
+        """Repeat reads come from the cache; a write through the service evicts it"""
+        tenant_id = "tenant_cache-test"
+        await couch_sitter_service.dal.get(f"couch-sitter/{tenant_id}", "PUT", {"name": "Before", "userIds": []})
+
+        with patch.object(couch_sitter_service, "_send_request", wraps=couch_sitter_service._send_request) as send:
+            first = await couch_sitter_service.get_tenant(tenant_id)
+            first["userIds"].append("user_mutated")
+            second = await couch_sitter_service.get_tenant("cache-test")
+            assert send.await_count == 1
+            assert second["userIds"] == []
+
+            second["name"] = "After"
+            await couch_sitter_service._make_request("PUT", tenant_id, json=second)
+            third = await couch_sitter_service.get_tenant(tenant_id)
+
+        assert third["name"] == "After"
+        assert send.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_cache_expires(self, couch_sitter_service):
+        tenant_id = "tenant_cache-ttl"
+        await couch_sitter_service.dal.get(f"couch-sitter/{tenant_id}", "PUT", {"name": "T"})
+        await couch_sitter_service.get_tenant(tenant_id)
+
+        with patch.object(couch_sitter_service, "_send_request", wraps=couch_sitter_service._send_request) as send, \
+             patch("couchdb_jwt_proxy.couch_sitter_service.time.monotonic", return_value=time.monotonic() + 11):
+            await couch_sitter_service.get_tenant(tenant_id)
+
+        assert send.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_without_cache_rereads(self, couch_sitter_service):
+        """use_cache=False sees writes made outside the service and refreshes the entry"""
+        tenant_id = "tenant_cache-bypass"
+        await couch_sitter_service.dal.get(f"couch-sitter/{tenant_id}", "PUT", {"name": "Before"})
+        await couch_sitter_service.get_tenant(tenant_id)
+        stored = await couch_sitter_service.dal.get(f"couch-sitter/{tenant_id}", "GET")
+        await couch_sitter_service.dal.get(f"couch-sitter/{tenant_id}", "PUT", {**stored, "name": "After"})
+
+        assert (await couch_sitter_service.get_tenant(tenant_id))["name"] == "Before"
+        assert (await couch_sitter_service.get_tenant(tenant_id, use_cache=False))["name"] == "After"
+        assert (await couch_sitter_service.get_tenant(tenant_id))["name"] == "After"
+
+
 class TestCouchSitterServiceIntegration:
     """Integration tests for CouchSitterService"""
 
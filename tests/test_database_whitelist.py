@@ -124,3 +124,15 @@ class TestDatabaseWhitelist:
         detail = response.json()['detail']
         assert 'couch-sitter' in detail
         assert 'roady' in detail
+
+    def test_refresh_allowed_dbs_rebuilds_from_application_id(self):
+        """Whitelist is rebuilt only when refresh_allowed_dbs() is called."""
+        from couchdb_jwt_proxy import main
+        original = main._allowed_dbs_cache
+        try:
+            with patch.dict('os.environ', {'APPLICATION_ID': 'roady, band-app'}):
+                allowed = main.refresh_allowed_dbs()
+            assert allowed == frozenset({'couch-sitter', '_users', '_replicator', 'roady', 'band-app'})
+            assert main._allowed_dbs_cache is allowed
+        finally:
+            main._allowed_dbs_cache = original
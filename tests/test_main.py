@@ -104,6 +104,11 @@ class TestProxyEndpoint:
                 )
                 assert response.status_code == 200
 
+    async def test_cors_exposes_bookmark_header(self, async_client):
+        from couchdb_jwt_proxy.main import cors_origins
+        response = await async_client.get("/health", headers={"Origin": cors_origins[0]})
+        assert "x-bookmark" in response.headers["access-control-expose-headers"].lower()
+
 
 # ---------------------------------------------------------------------------
 # Health and root endpoint tests
@@ -198,6 +203,85 @@ class TestTenantEnforcement:
         assert result["rows"][0]["id"] == "doc1"
 
 
+class TestChangesQueryRewrite:
+    def test_seq_interval_defaults_to_limit(self):
+        from couchdb_jwt_proxy.main import rewrite_changes_query
+        result = rewrite_changes_query({"limit": ["50"], "since": ["0"]})
+        assert result["seq_interval"] == ["50"]
+
+    def test_seq_interval_defaults_to_1000_without_limit(self):
+        from couchdb_jwt_proxy.main import rewrite_changes_query
+        result = rewrite_changes_query({"since": ["now"]})
+        assert result["seq_interval"] == ["1000"]
+
+    def test_existing_seq_interval_preserved(self):
+        from couchdb_jwt_proxy.main import rewrite_changes_query
+        result = rewrite_changes_query({"limit": ["50"], "seq_interval": ["7"]})
+        assert result["seq_interval"] == ["7"]
+
+    def test_continuous_feed_untouched(self):
+        from couchdb_jwt_proxy.main import rewrite_changes_query
+        result = rewrite_changes_query({"feed": ["continuous"]})
+        assert "seq_interval" not in result
+
+    def test_longpoll_feed_untouched(self):
+        from couchdb_jwt_proxy.main import rewrite_changes_query
+        result = rewrite_changes_query({"feed": ["longpoll"], "limit": ["50"]})
+        assert "seq_interval" not in result
+
+
+class TestCatchAllQueryParams:
+    def test_blank_values_dropped(self):
+        from fastapi.testclient import TestClient
+        from couchdb_jwt_proxy import main
+
+        doc = {"_id": "doc1", "_rev": "1-a", main.TENANT_FIELD: "test-tenant-123"}
+        with patch.object(main, "verify_session_token", return_value={"pubkey": "a" * 64, "user_id": "user_abc123"}), \
+             patch.object(main, "extract_tenant", new_callable=AsyncMock, return_value="test-tenant-123"), \
+             patch.object(main.dal, "get", new_callable=AsyncMock, return_value=doc) as dal_get:
+            response = TestClient(main.app).get(
+                "/roady/doc1?rev=&revs=true&conflicts",
+                headers={"Authorization": "Bearer fake_token"},
+            )
+
+        assert response.status_code == 200
+        assert dal_get.await_args.kwargs["params"] == {"revs": "true"}
+
+
+class TestUpstreamClients:
+    def test_feed_client_has_its_own_pool(self):
+        from couchdb_jwt_proxy.main import get_feed_client, get_http_client
+        assert get_feed_client() is not get_http_client()
+
+    def test_feed_client_bounds_pool_wait(self):
+        from couchdb_jwt_proxy.main import get_feed_client, DEFAULT_TIMEOUT
+        timeout = get_feed_client().timeout
+        assert timeout.read is None
+        assert timeout.pool == DEFAULT_TIMEOUT
+
+
+class TestEndpointAllowed:
+    def test_exact_endpoints_check_method(self):
+        from couchdb_jwt_proxy.main import is_endpoint_allowed
+        assert is_endpoint_allowed("_find", "POST")
+        assert is_endpoint_allowed("/_all_docs", "GET")
+        assert not is_endpoint_allowed("_find", "GET")
+
+    def test_local_docs(self):
+        from couchdb_jwt_proxy.main import is_endpoint_allowed
+        assert is_endpoint_allowed("_local/checkpoint", "PUT")
+        assert not is_endpoint_allowed("_local/checkpoint", "POST")
+
+    def test_documents_and_attachments(self):
+        from couchdb_jwt_proxy.main import is_endpoint_allowed
+        assert is_endpoint_allowed("doc1", "PUT")
+        assert is_endpoint_allowed("doc1/photo.png", "GET")
+        assert is_endpoint_allowed("", "GET")
+        assert not is_endpoint_allowed("", "PUT")
+        assert not is_endpoint_allowed("_design/app", "GET")
+        assert not is_endpoint_allowed("_secret", "DELETE")
+
+
 # ---------------------------------------------------------------------------
 # Session token validation tests
 # ---------------------------------------------------------------------------
@@ -255,6 +255,29 @@ class TestMemoryDALRestAPI:
         assert "Task 1" in titles
         assert "Note 1" in titles
 
+    async def test_all_docs_by_keys(self, memory_dal):
+        """Test POST _all_docs with keys, in request order"""
+        docs = [
+            {"_id": "keys_1", "title": "One"},
+            {"_id": "keys_2", "title": "Two"}
+        ]
+        await memory_dal.get("/testdb/_bulk_docs", "POST", {"docs": docs})
+
+        response = await memory_dal.get(
+            "/testdb/_all_docs", "POST", {"keys": ["keys_2", "nonexistent", "keys_1"]},
+            params={"include_docs": "true"}
+        )
+
+        rows = response["rows"]
+        assert [row["key"] for row in rows] == ["keys_2", "nonexistent", "keys_1"]
+        assert rows[0]["doc"]["title"] == "Two"
+        assert rows[1] == {"key": "nonexistent", "error": "not_found"}
+        assert rows[2]["value"]["rev"] == rows[2]["doc"]["_rev"]
+
+        # Without include_docs only ids and revs come back
+        response = await memory_dal.get("/testdb/_all_docs", "POST", {"keys": ["keys_1"]})
+        assert "doc" not in response["rows"][0]
+
     async def test_revisions_diff(self, memory_dal):
         """Test _revs_diff operations"""
         # Create a document
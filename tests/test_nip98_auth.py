@@ -23,6 +23,7 @@ from couchdb_jwt_proxy.core.auth import (
     _point_mul,
     _serialize_event,
     _tagged_hash,
+    extract_bearer,
     issue_session_token,
     verify_nip98,
     verify_session_token,
@@ -298,6 +299,26 @@ class TestSessionToken:
             assert exc.value.status_code == 401
             assert "expired" in exc.value.detail
 
+    def test_expired_token_rejected_before_hmac(self):
+        from fastapi import HTTPException
+        with patch.dict(os.environ, {"SESSION_SECRET": SESSION_SECRET}):
+            data = issue_session_token("aabbccdd" * 8, "user_xyz", ttl=-1)
+            with patch("couchdb_jwt_proxy.core.auth.hmac.new") as mock_hmac:
+                with pytest.raises(HTTPException) as exc:
+                    verify_session_token(f"Bearer {data['token']}")
+            mock_hmac.assert_not_called()
+            assert "expired" in exc.value.detail
+
+    @pytest.mark.parametrize("payload", [[1], "x", {"exp": "soon"}, {"user_id": "user_abc"}])
+    def test_malformed_payload_shape_rejected(self, payload):
+        from fastapi import HTTPException
+        payload_b64 = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        with patch.dict(os.environ, {"SESSION_SECRET": SESSION_SECRET}):
+            with pytest.raises(HTTPException) as exc:
+                verify_session_token(f"Bearer {payload_b64}.deadbeef")
+        assert exc.value.status_code == 401
+        assert "malformed" in exc.value.detail
+
     def test_tampered_payload(self):
         from fastapi import HTTPException
         with patch.dict(os.environ, {"SESSION_SECRET": SESSION_SECRET}):
@@ -316,6 +337,35 @@ class TestSessionToken:
             assert exc.value.status_code == 401
             assert "signature" in exc.value.detail
 
+    def test_verified_token_is_cached(self):
+        with patch.dict(os.environ, {"SESSION_SECRET": SESSION_SECRET}):
+            data = issue_session_token("deadbeef" * 8, "user_abc123", ttl=3600)
+            verify_session_token(f"Bearer {data['token']}")
+            with patch("couchdb_jwt_proxy.core.auth.hmac.new") as mock_hmac:
+                payload = verify_session_token(f"Bearer {data['token']}")
+            mock_hmac.assert_not_called()
+            assert payload == {"pubkey": "deadbeef" * 8, "user_id": "user_abc123"}
+
+    def test_cached_token_rejected_after_expiry(self):
+        from fastapi import HTTPException
+        with patch.dict(os.environ, {"SESSION_SECRET": SESSION_SECRET}):
+            data = issue_session_token("deadbeef" * 8, "user_abc123", ttl=60)
+            verify_session_token(f"Bearer {data['token']}")
+            with patch("couchdb_jwt_proxy.core.auth.time.time", return_value=time.time() + 120):
+                with pytest.raises(HTTPException) as exc:
+                    verify_session_token(f"Bearer {data['token']}")
+            assert "expired" in exc.value.detail
+
+    def test_cache_invalidated_when_secret_changes(self):
+        from fastapi import HTTPException
+        with patch.dict(os.environ, {"SESSION_SECRET": SESSION_SECRET}):
+            data = issue_session_token("deadbeef" * 8, "user_abc123", ttl=3600)
+            verify_session_token(f"Bearer {data['token']}")
+        with patch.dict(os.environ, {"SESSION_SECRET": "b" * 64}):
+            with pytest.raises(HTTPException) as exc:
+                verify_session_token(f"Bearer {data['token']}")
+            assert "signature" in exc.value.detail
+
     def test_missing_bearer(self):
         from fastapi import HTTPException
         with patch.dict(os.environ, {"SESSION_SECRET": SESSION_SECRET}):
@@ -334,3 +384,10 @@ class TestSessionToken:
         with patch.dict(os.environ, {"SESSION_SECRET": "short"}):
             with pytest.raises(RuntimeError, match="SESSION_SECRET"):
                 issue_session_token("pubkey", "user", ttl=3600)
+
+    def test_extract_bearer(self):
+        assert extract_bearer("Bearer abc.def") == "abc.def"
+        assert extract_bearer(None) is None
+        assert extract_bearer("Bearer ") is None
+        assert extract_bearer("bearer abc") is None
+        assert extract_bearer("Nostr abc") is None
@@ -4,6 +4,7 @@ Unit tests for SessionService
 
 import pytest
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -117,7 +118,7 @@ class TestSessionService:
         result = await session_service.get_active_tenant("sess123")
 
         # Verify CouchDB was queried
-        mock_dal.get_document.assert_called_once_with("couch-sitter", "session_sess123")
+        mock_dal.get_document.assert_called_once_with("couch-sitter", "sess123")
         assert result == "band-456"
 
         # Verify cache was populated
@@ -180,12 +181,33 @@ class TestSessionService:
 
         # Verify
         assert result is True
-        mock_dal.get_document.assert_called_once_with("couch-sitter", "session_sess123")
-        mock_dal.delete_document.assert_called_once_with("couch-sitter", "session_sess123", "1-abc")
+        mock_dal.get_document.assert_called_once_with("couch-sitter", "sess123")
+        mock_dal.delete_document.assert_called_once_with("couch-sitter", "sess123", "1-abc")
 
         # Verify cache was cleared
         assert sid not in session_service._cache
 
+    @pytest.mark.asyncio
+    async def test_get_active_tenant_after_cache_eviction(self, session_service, mock_dal):
+        """A session written by create_session is found in CouchDB once evicted from cache."""
+        docs = {}
+
+        async def put_document(db, doc_id, doc):
+            docs[doc_id] = dict(doc)
+            return {"_id": doc_id, "_rev": "1-abc"}
+
+        async def get_document(db, doc_id):
+            return docs[doc_id]
+
+        mock_dal.put_document.side_effect = put_document
+        mock_dal.get_document.side_effect = get_document
+
+        await session_service.create_session("sess123", "user_hash123", "band-456")
+        session_service._cache.clear()
+
+        assert await session_service.get_active_tenant("sess123") == "band-456"
+        assert session_service._cache["sess123"]["active_tenant_id"] == "band-456"
+
     @pytest.mark.asyncio
     async def test_delete_session_not_found(self, session_service, mock_dal):
         """Test deleting a non-existent session."""
@@ -199,25 +221,25 @@ class TestSessionService:
         """Test cleaning up expired cache entries."""
         now = time.time()
 
-        # Add mix of fresh and expired entries
-        session_service._cache = {
-            "fresh1": {
-                "active_tenant_id": "band-1",
-                "cached_at": now - 100  # Fresh (100 seconds old)
-            },
-            "fresh2": {
-                "active_tenant_id": "band-2",
-                "cached_at": now - 1000  # Fresh (1000 seconds old)
-            },
-            "expired1": {
-                "active_tenant_id": "band-3",
-                "cached_at": now - 4000  # Expired (4000 seconds old)
-            },
-            "expired2": {
+        # Add mix of fresh and expired entries, oldest first
+        session_service._cache = OrderedDict([
+            ("expired2", {
                 "active_tenant_id": "band-4",
                 "cached_at": now - 5000  # Expired (5000 seconds old)
-            },
-        }
+            }),
+            ("expired1", {
+                "active_tenant_id": "band-3",
+                "cached_at": now - 4000  # Expired (4000 seconds old)
+            }),
+            ("fresh2", {
+                "active_tenant_id": "band-2",
+                "cached_at": now - 1000  # Fresh (1000 seconds old)
+            }),
+            ("fresh1", {
+                "active_tenant_id": "band-1",
+                "cached_at": now - 100  # Fresh (100 seconds old)
+            }),
+        ])
 
         session_service.cleanup_expired_cache()
 
@@ -227,6 +249,33 @@ class TestSessionService:
         assert "expired1" not in session_service._cache
         assert "expired2" not in session_service._cache
 
+    @pytest.mark.asyncio
+    async def test_cache_evicts_oldest(self, session_service, mock_dal):
+        """The cache is bounded; reads don't reorder entries, so it stays in expiry order."""
+        mock_dal.put_document.return_value = {"_rev": "1-abc"}
+        session_service._cache_max_size = 2
+
+        await session_service.create_session("sess1", "user1", "band-1")
+        await session_service.create_session("sess2", "user2", "band-2")
+        assert await session_service.get_active_tenant("sess1") == "band-1"
+        await session_service.create_session("sess3", "user3", "band-3")
+
+        assert list(session_service._cache) == ["sess2", "sess3"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_after_cache_hit(self, session_service, mock_dal):
+        """A hit on an older entry doesn't hide it from the expiry scan."""
+        mock_dal.put_document.return_value = {"_rev": "1-abc"}
+        with patch("couchdb_jwt_proxy.session_service.time.time", return_value=1000.0):
+            await session_service.create_session("old", "user1", "band-1")
+        with patch("couchdb_jwt_proxy.session_service.time.time", return_value=3000.0):
+            await session_service.create_session("new", "user2", "band-2")
+            assert await session_service.get_active_tenant("old") == "band-1"
+        with patch("couchdb_jwt_proxy.session_service.time.time", return_value=4700.0):
+            session_service.cleanup_expired_cache()
+
+        assert list(session_service._cache) == ["new"]
+
     def test_get_cache_stats(self, session_service):
         """Test cache statistics."""
         session_service._cache = {
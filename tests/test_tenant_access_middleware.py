@@ -0,0 +1,290 @@
+"""
+Tenant Access Middleware tests.
+
+Covers token caching and document tenant validation.
+"""
+
+import asyncio
+import base64
+import time
+
+import orjson
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from starlette.requests import Request
+from starlette.responses import Response
+
+from couchdb_jwt_proxy.tenant_access_middleware import (
+    TenantAccessMiddleware,
+    _decode_jwt_payload,
+    _find_invalid_doc,
+)
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_token(sub: str = "user_abc123", **claims) -> str:
+    """Build a test JWT carrying the given claims (the signature is never checked here)"""
+    header = b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+    payload = b64url(orjson.dumps({"sub": sub, **claims}))
+    return f"{header}.{payload}.{b64url(b'signature')}"
+
+
+def make_request(
+    method: str,
+    path: str,
+    body: bytes = b"",
+    token: str = None,
+    content_type: str = "application/json",
+) -> Request:
+    """Build a Starlette request whose body arrives in one ASGI message, then disconnects"""
+    headers = [(b"content-type", content_type.encode())]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {"type": "http", "method": method, "path": path, "query_string": b"", "headers": headers}
+
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    return Request(scope, receive)
+
+
+@pytest.fixture
+def middleware():
+    return TenantAccessMiddleware(app=None, couch_sitter_service=None)
+
+
+@pytest.fixture
+def tenant_middleware():
+    """Middleware whose user belongs to tenant-a and tenant-b"""
+    service = MagicMock()
+    service.get_user_tenants = AsyncMock(
+        return_value=([{"_id": "tenant-a"}, {"_id": "tenant-b"}], None)
+    )
+    return TenantAccessMiddleware(app=None, couch_sitter_service=service)
+
+
+async def echo_body(request: Request) -> Response:
+    """call_next stand-in that returns the body the downstream app would see"""
+    return Response(content=await request.body(), status_code=200)
+
+
+class TestTokenCache:
+    """Test the token -> subject and tenants cache"""
+
+    def test_subject_decoded_once_per_token(self, middleware):
+        token = make_token()
+        with patch("couchdb_jwt_proxy.tenant_access_middleware._decode_jwt_payload",
+                   wraps=_decode_jwt_payload) as decode:
+            assert middleware._lookup_token(token) == ("user_abc123", None, None)
+            assert middleware._lookup_token(token) == ("user_abc123", None, None)
+        assert decode.call_count == 1
+
+    def test_expired_token_is_decoded_again(self, middleware):
+        token = make_token(exp=int(time.time()) - 10)
+        middleware._lookup_token(token)
+        with patch("couchdb_jwt_proxy.tenant_access_middleware._decode_jwt_payload",
+                   wraps=_decode_jwt_payload) as decode:
+            middleware._lookup_token(token)
+        assert decode.call_count == 1
+
+    def test_cache_is_bounded(self, middleware):
+        with patch("couchdb_jwt_proxy.tenant_access_middleware._TOKEN_CACHE_MAX_SIZE", 2):
+            tokens = [make_token(sub=f"user{i}") for i in range(3)]
+            for token in tokens:
+                middleware._lookup_token(token)
+        assert list(middleware._token_cache) == tokens[1:]
+
+    @pytest.mark.asyncio
+    async def test_repeat_write_is_one_lookup(self, tenant_middleware):
+        token = make_token(sub="user1")
+        body = orjson.dumps({"_id": "doc1", "tenant": "tenant-a"})
+        await tenant_middleware(make_request("PUT", "/roady/doc1", body, token), echo_body)
+
+        tenant_middleware._user_tenant_cache.clear()
+
+        with patch("couchdb_jwt_proxy.tenant_access_middleware._decode_jwt_payload") as decode:
+            response = await tenant_middleware(make_request("PUT", "/roady/doc1", body, token), echo_body)
+
+        assert response.status_code == 200
+        decode.assert_not_called()
+        tenant_middleware.couch_sitter_service.get_user_tenants.assert_awaited_once()
+        assert tenant_middleware._token_cache[token][1] == frozenset({"tenant-a", "tenant-b"})
+
+    @pytest.mark.asyncio
+    async def test_tenants_not_kept_past_user_entry(self, tenant_middleware):
+        token = make_token(sub="user1")
+        tenant_middleware._lookup_token(token)
+        await tenant_middleware._get_token_tenants(token, "user1")
+
+        with patch("couchdb_jwt_proxy.tenant_access_middleware.time.monotonic",
+                   return_value=time.monotonic() + 301):
+            assert tenant_middleware._lookup_token(token) == ("user1", None, None)
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_not_attached(self, tenant_middleware):
+        tenant_middleware.couch_sitter_service.get_user_tenants.side_effect = RuntimeError("down")
+        token = make_token(sub="user1")
+        tenant_middleware._lookup_token(token)
+
+        assert await tenant_middleware._get_token_tenants(token, "user1") == (frozenset(), [])
+        assert tenant_middleware._lookup_token(token) == ("user1", None, None)
+
+    def test_decode_jwt_payload(self):
+        assert _decode_jwt_payload(make_token(sub="user1", exp=123)) == {"sub": "user1", "exp": 123}
+        with pytest.raises(ValueError):
+            _decode_jwt_payload("not-a-jwt")
+
+
+class TestSkipValidation:
+    """Test which paths bypass tenant validation"""
+
+    def test_system_and_registry_paths_skip(self):
+        skip = TenantAccessMiddleware._should_skip_validation
+        assert skip("/couch-sitter/doc1")
+        assert skip("/_users/org.couchdb.user:bob")
+        assert skip("/__tenants/tenant-a")
+        assert skip("/__users/user1")
+        assert skip("/roady/_uuids")
+
+    def test_app_database_writes_validated(self):
+        skip = TenantAccessMiddleware._should_skip_validation
+        assert not skip("/roady/doc1")
+        assert not skip("/roady/_bulk_docs")
+
+
+class TestFindInvalidDoc:
+    """Test the per-doc bulk validation loop"""
+
+    def test_all_docs_valid(self):
+        docs = [
+            {"_id": "doc1", "tenant": "tenant-a"},
+            {"_id": "band-info_tenant-b", "type": "band-info"},
+            {"_id": "doc2", "_deleted": True},
+        ]
+        assert _find_invalid_doc(docs, frozenset({"tenant-a", "tenant-b"})) == (-1, None)
+
+    def test_first_failure_reported(self):
+        docs = [
+            {"_id": "doc1", "tenant": "tenant-a"},
+            {"_id": "band-info_tenant-z", "type": "band-info"},
+            {"_id": "doc2"},
+        ]
+        index, err_msg = _find_invalid_doc(docs, frozenset({"tenant-a"}))
+        assert index == 1
+        assert "tenant-z" in err_msg
+
+
+@pytest.mark.asyncio
+class TestWriteValidation:
+    """Test tenant validation of document writes"""
+
+    async def test_own_tenant_write_passes_body_through(self, tenant_middleware):
+        body = orjson.dumps({"_id": "doc1", "tenant": "tenant-a"})
+        request = make_request("PUT", "/roady/doc1", body, make_token())
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == 200
+        assert response.body == body
+
+    async def test_body_replayed_once_then_original_channel(self, tenant_middleware):
+        body = orjson.dumps({"_id": "doc1", "tenant": "tenant-a"})
+        request = make_request("PUT", "/roady/doc1", body, make_token())
+        messages = []
+
+        async def call_next(request):
+            messages.append(await request.receive())
+            messages.append(await request.receive())
+            return Response(status_code=200)
+
+        await tenant_middleware(request, call_next)
+        assert messages[0] == {"type": "http.request", "body": body, "more_body": False}
+        assert messages[1] == {"type": "http.disconnect"}
+
+    async def test_foreign_tenant_write_rejected(self, tenant_middleware):
+        body = orjson.dumps({"_id": "doc1", "tenant": "tenant-z"})
+        request = make_request("PUT", "/roady/doc1", body, make_token())
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == 403
+
+    async def test_bulk_docs_with_foreign_tenant_rejected(self, tenant_middleware):
+        body = orjson.dumps({"docs": [
+            {"_id": "doc1", "tenant": "tenant-a"},
+            {"_id": "doc2", "tenant": "tenant-z"},
+        ]})
+        request = make_request("POST", "/roady/_bulk_docs", body, make_token())
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == 403
+        assert b"Bulk doc 1" in response.body
+
+    async def test_foreign_band_info_put_rejected_before_body_read(self, tenant_middleware):
+        request = make_request("PUT", "/roady/band-info_tenant-z", b"not json", make_token())
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == 403
+        assert b"tenant-z" in response.body
+
+    async def test_binary_attachment_upload_skips_validation(self, tenant_middleware):
+        body = b"\x89PNG not a document"
+        request = make_request("PUT", "/roady/doc1/photo.png", body, make_token(), "image/png")
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == 200
+        assert response.body == body
+
+    @pytest.mark.parametrize("tenant,status", [("tenant-a", 200), ("tenant-z", 403)])
+    async def test_multipart_doc_put_validated(self, tenant_middleware, tenant, status):
+        doc = orjson.dumps({"_id": "doc1", "tenant": tenant, "_attachments": {"a.txt": {"follows": True}}})
+        body = (
+            b"--abc\r\nContent-Type: application/json\r\n\r\n" + doc
+            + b"\r\n--abc\r\nContent-Type: text/plain\r\n\r\nhello\r\n--abc--"
+        )
+        request = make_request("PUT", "/roady/doc1", body, make_token(), 'multipart/related; boundary="abc"')
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == status
+
+    async def test_non_json_doc_put_still_validated(self, tenant_middleware):
+        body = orjson.dumps({"_id": "doc1", "tenant": "tenant-z"})
+        request = make_request("PUT", "/roady/doc1", body, make_token(), "text/plain")
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == 403
+
+    async def test_reads_pass_through_untouched(self, tenant_middleware):
+        request = make_request("GET", "/roady/doc1", token=make_token())
+        response = await tenant_middleware(request, echo_body)
+        assert response.status_code == 200
+        tenant_middleware.couch_sitter_service.get_user_tenants.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestUserTenantCache:
+    """Test the per-user tenant cache"""
+
+    async def test_tenants_fetched_once_within_ttl(self, tenant_middleware):
+        tenant_set, tenant_list = await tenant_middleware._get_user_tenants("user1")
+        await tenant_middleware._get_user_tenants("user1")
+        assert tenant_set == frozenset({"tenant-a", "tenant-b"})
+        assert tenant_list == ["tenant-a", "tenant-b"]
+        tenant_middleware.couch_sitter_service.get_user_tenants.assert_awaited_once()
+
+    async def test_concurrent_misses_share_one_fetch(self, tenant_middleware):
+        results = await asyncio.gather(
+            *(tenant_middleware._get_user_tenants("user1") for _ in range(5))
+        )
+        assert all(result == results[0] for result in results)
+        tenant_middleware.couch_sitter_service.get_user_tenants.assert_awaited_once()
+        assert tenant_middleware._inflight == {}
+
+    async def test_tenants_refetched_after_ttl(self, tenant_middleware):
+        await tenant_middleware._get_user_tenants("user1")
+        with patch("couchdb_jwt_proxy.tenant_access_middleware.time.monotonic",
+                   return_value=time.monotonic() + 301):
+            await tenant_middleware._get_user_tenants("user1")
+        assert tenant_middleware.couch_sitter_service.get_user_tenants.await_count == 2
+
+    async def test_cache_is_bounded(self, tenant_middleware):
+        with patch("couchdb_jwt_proxy.tenant_access_middleware._USER_TENANT_CACHE_MAX_SIZE", 2):
+            for user_id in ("user1", "user2", "user3"):
+                await tenant_middleware._get_user_tenants(user_id)
+        assert list(tenant_middleware._user_tenant_cache) == ["user2", "user3"]
@@ -3,6 +3,7 @@ Tests for multi-tenant extract_tenant() 5-level discovery chain.
 Renamed from test_jwt_fallback_fix.py — Clerk references removed.
 Auth is now via session tokens; payload dict contains pubkey as 'sub'.
 """
+import asyncio
 import os
 
 import pytest
@@ -82,6 +83,36 @@ class TestMultiTenantDiscovery:
             except Exception:
                 pass  # acceptable in partial test env
 
+    @pytest.mark.asyncio
+    async def test_discovered_tenant_writes_run_together(self):
+        """Default-tenant and session writes are issued concurrently; one failing doesn't stop the other."""
+        from couchdb_jwt_proxy.main import remember_discovered_tenant
+
+        started = []
+
+        async def write(name):
+            started.append(name)
+            await asyncio.sleep(0)
+            assert len(started) == 2  # both writes in flight before either finishes
+            if name == "session":
+                raise RuntimeError("couch down")
+
+        async def set_default(*args, **kwargs):
+            await write("default")
+
+        async def create_session(*args, **kwargs):
+            await write("session")
+
+        tenant_service = MagicMock()
+        tenant_service.set_user_default_tenant = AsyncMock(side_effect=set_default)
+
+        with patch("couchdb_jwt_proxy.main.session_service") as mock_session:
+            mock_session.create_session = AsyncMock(side_effect=create_session)
+            await remember_discovered_tenant(tenant_service, "d" * 64, "t1", "sess_1", "roady")
+
+        tenant_service.set_user_default_tenant.assert_awaited_once_with("d" * 64, "t1", database="couch-sitter")
+        mock_session.create_session.assert_awaited_once_with("sess_1", "d" * 64, "t1", application_id="roady")
+
 
 class TestTenantIsolationSecurity:
     """Cross-tenant access must be impossible."""
@@ -6,7 +6,7 @@ Validates that tenant IDs must follow the format: tenant_{uuid}
 
 import pytest
 from uuid import uuid4
-from src.couchdb_jwt_proxy.tenant_validation import (
+from couchdb_jwt_proxy.tenant_validation import (
     validate_tenant_id_format,
     TenantIdFormatError
 )
@@ -163,3 +163,8 @@ class TestValidationIntegration:
         for pattern in invalid_patterns:
             with pytest.raises(TenantIdFormatError):
                 validate_tenant_id_format(pattern)
+    
+    def test_single_module_instance(self):
+        """The routes catch the same exception class the tests raise (module loaded once)"""
+        from couchdb_jwt_proxy import tenant_routes
+        assert tenant_routes.TenantIdFormatError is TenantIdFormatError
@@ -7,6 +7,7 @@ Uses in-memory DAL for realistic testing instead of mocks.
 
 import pytest
 import json
+import hashlib
 from datetime import datetime, timezone, timedelta
 
 # Import services and DAL
@@ -158,6 +159,23 @@ class TestInvitationService:
         assert result["status"] == "pending"
         assert result["tenantName"] == "My Workspace"
 
+    @pytest.mark.asyncio
+    async def test_validate_token_accepts_legacy_sha256_hash(self, invite_service, memory_dal):
+        """Invitations stored before the BLAKE2b switch still validate"""
+        token = invite_service.generate_token()
+        invitation_doc = {
+            "_id": "invite_legacy",
+            "type": "invitation",
+            "tenantId": "tenant_123",
+            "tokenHash": hashlib.sha256(token.encode()).hexdigest(),
+            "status": "pending",
+            "expiresAt": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat(),
+        }
+        await memory_dal.get("couch-sitter/invite_legacy", "PUT", invitation_doc)
+
+        result = await invite_service.validate_token(token)
+        assert result["_id"] == "invite_legacy"
+
     @pytest.mark.asyncio
     async def test_validate_token_rejects_expired(self, invite_service, memory_dal):
         """Validating expired token should return None"""
@@ -179,7 +197,7 @@ class TestInvitationService:
             "createdAt": (datetime.now(timezone.utc) - timedelta(days=8)).isoformat()
         }
         
-        await memory_dal.get(invitation_id, "PUT", invitation_doc)
+        await memory_dal.get(f"couch-sitter/{invitation_id}", "PUT", invitation_doc)
         
         # Token should be rejected as expired
         result = await invite_service.validate_token(token)
@@ -22,6 +22,7 @@ os.environ.setdefault("APPLICATION_ID", "roady,roady-staging")
 from couchdb_jwt_proxy.main import (
     TENANT_FIELD,
     filter_response_documents,
+    filter_rows_stream,
     filter_changes_response,
 )
 
@@ -80,6 +81,103 @@ class TestFilterResponseDocuments:
         ids = [d["_id"] for d in out["docs"]]
         assert DOC_B["_id"] not in ids
 
+    def test_all_docs_deleted_key_dropped(self):
+        """_all_docs?keys=...&include_docs=true returns "doc": null for deleted keys"""
+        body = json.loads(self._all_docs_body(DOC_A))
+        body["rows"].append({"id": "gone", "key": "gone", "value": {"rev": "2-x", "deleted": True}, "doc": None})
+
+        out = json.loads(filter_response_documents(json.dumps(body).encode(), TENANT_A))
+
+        assert [r["id"] for r in out["rows"]] == [DOC_A["_id"]]
+
+
+# ---------------------------------------------------------------------------
+# filter_rows_stream  (_all_docs / _find streamed from CouchDB)
+# ---------------------------------------------------------------------------
+
+async def _lines(*lines):
+    for line in lines:
+        yield line
+
+
+async def _stream(*lines, tenant_id=TENANT_A):
+    return b"".join([chunk async for chunk in filter_rows_stream(_lines(*lines), tenant_id)])
+
+
+def _row(doc):
+    return json.dumps({"id": doc["_id"], "key": doc["_id"], "value": {"rev": doc["_rev"]}, "doc": doc})
+
+
+class TestFilterRowsStream:
+    @pytest.mark.asyncio
+    async def test_all_docs_rows_filtered_one_by_one(self):
+        out = json.loads(await _stream(
+            '{"total_rows":3,"offset":0,"rows":[',
+            _row(DOC_B) + ",",
+            _row(DOC_A) + ",",
+            json.dumps({"id": "x", "key": "x", "value": {"rev": "1-x", TENANT_FIELD: TENANT_A}}),
+            "]}",
+        ))
+
+        assert [r["id"] for r in out["rows"]] == [DOC_A["_id"], "x"]
+        assert out["total_rows"] == 2
+        assert out["offset"] == 0
+
+    @pytest.mark.asyncio
+    async def test_find_keeps_trailing_bookmark(self):
+        out = json.loads(await _stream(
+            '{"docs":[',
+            json.dumps(DOC_A) + ",",
+            json.dumps(DOC_B),
+            "],",
+            '"bookmark": "g1AAAA"',
+            "}",
+        ))
+
+        assert out == {"docs": [DOC_A], "bookmark": "g1AAAA"}
+
+    @pytest.mark.asyncio
+    async def test_no_matching_rows(self):
+        out = json.loads(await _stream('{"total_rows":1,"offset":0,"rows":[', _row(DOC_B), "]}"))
+
+        assert out == {"offset": 0, "rows": [], "total_rows": 0}
+
+    @pytest.mark.asyncio
+    async def test_single_line_response_filtered_whole(self):
+        body = json.dumps({"total_rows": 2, "rows": json.loads("[" + _row(DOC_A) + "," + _row(DOC_B) + "]")})
+
+        out = json.loads(await _stream(body))
+
+        assert [r["id"] for r in out["rows"]] == [DOC_A["_id"]]
+
+    @pytest.mark.asyncio
+    async def test_proxy_streams_couchdb_rows(self):
+        import httpx
+        from unittest.mock import patch
+        from couchdb_jwt_proxy.main import proxy_couchdb_filtered_rows
+
+        body = (
+            '{"total_rows":2,"offset":0,"rows":[\r\n'
+            + _row(DOC_A) + ",\r\n" + _row(DOC_B) + "\r\n]}\n"
+        )
+        seen = []
+
+        def couchdb(request):
+            seen.append(request)
+            return httpx.Response(200, content=body.encode())
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(couchdb))
+        with patch("couchdb_jwt_proxy.main.get_http_client", return_value=client):
+            response = await proxy_couchdb_filtered_rows(
+                "roady/_all_docs", "GET", None, {"include_docs": "true"}, TENANT_A
+            )
+            out = json.loads(b"".join([chunk async for chunk in response.body_iterator]))
+        await client.aclose()
+
+        assert seen[0].url.params["include_docs"] == "true"
+        assert [r["id"] for r in out["rows"]] == [DOC_A["_id"]]
+        assert out["total_rows"] == 1
+
 
 # ---------------------------------------------------------------------------
 # _bulk_get filter  (inline logic in proxy_couchdb)
@@ -165,6 +263,53 @@ class TestFilterChangesResponse:
         assert DOC_A["_id"] in ids
         assert DOC_B["_id"] not in ids
 
+    def test_null_doc_dropped(self):
+        body = json.loads(self._changes_body(DOC_A))
+        body["results"].append({"seq": "9", "id": "gone", "changes": [{"rev": "2-x"}], "deleted": True, "doc": None})
+
+        out = json.loads(filter_changes_response(json.dumps(body).encode(), TENANT_A))
+
+        assert [r["id"] for r in out["results"]] == [DOC_A["_id"]]
+
+
+# ---------------------------------------------------------------------------
+# _find tenant selector  (proxy_couchdb)
+# ---------------------------------------------------------------------------
+
+class TestTenantScopedFind:
+    @pytest.fixture
+    def roady_docs(self):
+        import asyncio
+        from couchdb_jwt_proxy.main import dal
+
+        async def populate():
+            dal.backend._docs.clear()
+            await dal.get("roady/doc-alpha", "PUT", {**DOC_A, "type": "song"})
+            await dal.get("roady/doc-bravo", "PUT", {**DOC_B, "type": "song"})
+
+        asyncio.run(populate())
+        yield
+        dal.backend._docs.clear()
+
+    def test_selector_injected_and_response_filter_skipped(self, roady_docs):
+        from unittest.mock import AsyncMock, patch
+        from fastapi.testclient import TestClient
+        from couchdb_jwt_proxy import main
+
+        with patch.object(main, "verify_session_token", return_value={"pubkey": "a" * 64, "user_id": "user_abc123"}), \
+             patch.object(main, "extract_tenant", new_callable=AsyncMock, return_value=TENANT_A), \
+             patch.object(main, "filter_response_dict", wraps=main.filter_response_dict) as response_filter:
+            response = TestClient(main.app).post(
+                "/roady/_find",
+                headers={"Authorization": "Bearer fake_token"},
+                json={"selector": {"type": "song"}},
+            )
+
+        assert response.status_code == 200
+        # CouchDB applied the tenant selector, so the proxy didn't filter again
+        assert [doc["_id"] for doc in response.json()["docs"]] == [DOC_A["_id"]]
+        response_filter.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # Architectural invariant
@@ -185,10 +330,10 @@ def test_all_allowed_endpoints_have_filter_coverage():
 
     filtered_server_side = {
         "/_changes",        # selector={"tenant_id":...} injected into _changes URL
+        "/_find",           # tenant selector injected into the _find body
     }
     filtered_response = {
         "/_all_docs",       # filter_response_documents() in proxy_couchdb
-        "/_find",           # filter_response_documents() in proxy_couchdb
         "/_bulk_get",       # inline filter loop in proxy_couchdb
     }
     no_doc_content = {
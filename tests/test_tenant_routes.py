@@ -0,0 +1,355 @@
+"""
+Tenant and invitation API route tests.
+
+Runs the /api router against the in-memory DAL with the auth dependency
+overridden, so each test drives the real handlers end to end.
+"""
+
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from couchdb_jwt_proxy.auth_middleware import CurrentUser, get_current_user
+from couchdb_jwt_proxy.couch_sitter_service import BulkUpdateConflict, BulkUpdateError, CouchSitterService
+from couchdb_jwt_proxy.dal import create_dal
+from couchdb_jwt_proxy.invite_service import InviteService
+from couchdb_jwt_proxy.tenant_routes import create_tenant_router
+
+DB_URL = "http://localhost:5984/couch-sitter"
+OWNER_SUB = "owner_sub_123"
+MEMBER_SUB = "member_sub_456"
+
+
+@pytest.fixture
+def couch_sitter_service():
+    return CouchSitterService(couch_sitter_db_url=DB_URL, dal=create_dal(backend="memory"))
+
+
+@pytest.fixture
+def invite_service(couch_sitter_service):
+    return InviteService(couch_sitter_db_url=DB_URL, dal=couch_sitter_service.dal)
+
+
+@pytest.fixture
+def current_user():
+    """Holder for the authenticated user; tests switch identities via set_user()"""
+    return {}
+
+
+def set_user(current_user, couch_sitter_service, sub):
+    user_id = f"user_{couch_sitter_service._hash_pubkey(sub)}"
+    current_user["user"] = CurrentUser(user_id=user_id, sub=sub)
+    return user_id
+
+
+@pytest_asyncio.fixture
+async def client(couch_sitter_service, invite_service, current_user):
+    app = FastAPI()
+    app.include_router(create_tenant_router(couch_sitter_service, invite_service))
+    app.dependency_overrides[get_current_user] = lambda: current_user["user"]
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest_asyncio.fixture
+async def workspace(couch_sitter_service, invite_service, current_user):
+    """A workspace owned by OWNER_SUB plus a pending invitation for MEMBER_SUB"""
+    for sub in (OWNER_SUB, MEMBER_SUB):
+        await couch_sitter_service.create_user_with_personal_tenant_multi_tenant(sub=sub)
+    owner_id = set_user(current_user, couch_sitter_service, OWNER_SUB)
+    tenant = await couch_sitter_service.create_workspace_tenant(
+        user_id=owner_id, name="The Band", application_id="roady"
+    )
+    invitation = await invite_service.create_invitation(
+        tenant_id=tenant["_id"], tenant_name="The Band", email="", role="member", created_by=owner_id
+    )
+    return tenant, invitation
+
+
+@pytest.mark.asyncio
+class TestAcceptInvitation:
+    async def test_accept_adds_member(self, client, couch_sitter_service, current_user, workspace):
+        tenant, invitation = workspace
+        member_id = set_user(current_user, couch_sitter_service, MEMBER_SUB)
+
+        response = await client.patch("/api/invitations/accept", json={"inviteToken": invitation["token"]})
+
+        assert response.status_code == 200
+        assert response.json()["_id"] == tenant["_id"]
+        stored_tenant = await couch_sitter_service.get_tenant(tenant["_id"])
+        assert member_id in stored_tenant["userIds"]
+        stored = await couch_sitter_service.dal.get(f"couch-sitter/{invitation['_id']}", "GET")
+        assert stored["status"] == "accepted"
+        assert stored["acceptedBy"] == member_id
+
+    async def test_existing_member_gets_409(
+        self, client, couch_sitter_service, invite_service, current_user, workspace
+    ):
+        tenant, invitation = workspace
+        set_user(current_user, couch_sitter_service, MEMBER_SUB)
+        await client.patch("/api/invitations/accept", json={"inviteToken": invitation["token"]})
+
+        second = await invite_service.create_invitation(
+            tenant_id=tenant["_id"], tenant_name="The Band", email="", role="member",
+            created_by=tenant["userId"]
+        )
+        response = await client.patch("/api/invitations/accept", json={"inviteToken": second["token"]})
+
+        assert response.status_code == 409
+        # Rejected before any write: the second invitation is still usable
+        assert (await invite_service.validate_token(second["token"]))["_id"] == second["_id"]
+
+
+@pytest.mark.asyncio
+class TestChangeMemberRole:
+    async def test_owner_changes_role(self, client, couch_sitter_service, current_user, workspace):
+        tenant, invitation = workspace
+        member_id = set_user(current_user, couch_sitter_service, MEMBER_SUB)
+        await client.patch("/api/invitations/accept", json={"inviteToken": invitation["token"]})
+        set_user(current_user, couch_sitter_service, OWNER_SUB)
+
+        response = await client.put(
+            f"/api/tenants/{tenant['_id']}/members/{member_id}/role", json={"role": "admin"}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["userId"], body["role"]) == (member_id, "admin")
+        assert body["updatedAt"]
+        member_doc = await couch_sitter_service.get_user_doc(member_id)
+        entry = next(t for t in member_doc["tenants"] if t["tenantId"] == tenant["_id"][7:])
+        assert entry["role"] == "admin"
+
+    async def test_invalid_role_rejected_without_io(self, client, couch_sitter_service, current_user, workspace):
+        tenant, _ = workspace
+        member_id = set_user(current_user, couch_sitter_service, MEMBER_SUB)
+
+        with patch.object(couch_sitter_service, "_send_request", wraps=couch_sitter_service._send_request) as send:
+            response = await client.put(
+                f"/api/tenants/{tenant['_id']}/members/{member_id}/role", json={"role": "owner"}
+            )
+
+        assert response.status_code == 422
+        send.assert_not_awaited()
+
+    async def test_malformed_member_id_rejected_without_io(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+
+        with patch.object(couch_sitter_service, "_send_request", wraps=couch_sitter_service._send_request) as send:
+            response = await client.delete(f"/api/tenants/{tenant['_id']}/members/couch-sitter-admin")
+
+        assert response.status_code == 422
+        send.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestRemoveMember:
+    async def test_remove_updates_tenant_and_user(self, client, couch_sitter_service, current_user, workspace):
+        tenant, invitation = workspace
+        member_id = set_user(current_user, couch_sitter_service, MEMBER_SUB)
+        await client.patch("/api/invitations/accept", json={"inviteToken": invitation["token"]})
+        set_user(current_user, couch_sitter_service, OWNER_SUB)
+
+        response = await client.delete(f"/api/tenants/{tenant['_id']}/members/{member_id}")
+
+        assert response.status_code == 200
+        stored_tenant = await couch_sitter_service.get_tenant(tenant["_id"])
+        assert member_id not in stored_tenant["userIds"]
+
+    async def test_remove_is_one_bulk_write(self, client, couch_sitter_service, current_user, workspace):
+        tenant, invitation = workspace
+        member_id = set_user(current_user, couch_sitter_service, MEMBER_SUB)
+        await client.patch("/api/invitations/accept", json={"inviteToken": invitation["token"]})
+        set_user(current_user, couch_sitter_service, OWNER_SUB)
+
+        with patch.object(couch_sitter_service, "_send_request", wraps=couch_sitter_service._send_request) as send:
+            await client.delete(f"/api/tenants/{tenant['_id']}/members/{member_id}")
+
+        writes = [call for call in send.await_args_list if call.args[0] != "GET"]
+        assert len(writes) == 1
+        assert writes[0].args[:2] == ("POST", "_bulk_docs")
+        written = writes[0].kwargs["json"]["docs"]
+        assert [doc["_id"] for doc in written] == [tenant["_id"], member_id]
+        assert all(doc.get("_rev") for doc in written)
+
+
+@pytest.mark.asyncio
+class TestUpdateAndDeleteTenant:
+    async def _write_elsewhere(self, couch_sitter_service, tenant, **changes):
+        """Change the tenant behind the get_tenant() cache, as another worker would"""
+        await couch_sitter_service.get_tenant(tenant["_id"])
+        stored = await couch_sitter_service.dal.get(f"couch-sitter/{tenant['_id']}", "GET")
+        await couch_sitter_service.dal.get(f"couch-sitter/{tenant['_id']}", "PUT", {**stored, **changes})
+
+    async def test_update_after_outside_write(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+        await self._write_elsewhere(couch_sitter_service, tenant, description="set elsewhere")
+
+        response = await client.put(f"/api/tenants/{tenant['_id']}", json={"name": "Renamed"})
+
+        assert response.status_code == 200
+        stored = await couch_sitter_service.get_tenant(tenant["_id"])
+        assert (stored["name"], stored["description"]) == ("Renamed", "set elsewhere")
+
+    async def test_delete_after_outside_write(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+        await self._write_elsewhere(couch_sitter_service, tenant, name="Renamed elsewhere")
+
+        response = await client.delete(f"/api/tenants/{tenant['_id']}")
+
+        assert response.status_code == 200
+        assert await couch_sitter_service.get_tenant(tenant["_id"]) is None
+        stored = await couch_sitter_service.dal.get(f"couch-sitter/{tenant['_id']}", "GET")
+        assert stored["name"] == "Renamed elsewhere"
+
+    async def test_deleted_elsewhere_is_404(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+        await self._write_elsewhere(couch_sitter_service, tenant, deletedAt="2026-01-01T00:00:00+00:00")
+
+        response = await client.put(f"/api/tenants/{tenant['_id']}", json={"name": "Renamed"})
+
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+class TestListInvitations:
+    async def test_lists_tenant_invitations(self, client, workspace):
+        tenant, invitation = workspace
+
+        response = await client.get(f"/api/tenants/{tenant['_id']}/invitations")
+
+        assert response.status_code == 200
+        assert response.json() == [{
+            "_id": invitation["_id"],
+            "email": invitation["email"],
+            "role": "member",
+            "status": "pending",
+            "createdAt": invitation["createdAt"],
+            "expiresAt": invitation["expiresAt"],
+        }]
+
+    async def test_page_size_and_bookmark(self, client, invite_service, workspace):
+        tenant, invitation = workspace
+        await invite_service.create_invitation(
+            tenant_id=tenant["_id"], tenant_name="The Band", email="", role="member",
+            created_by=tenant["userId"]
+        )
+
+        response = await client.get(f"/api/tenants/{tenant['_id']}/invitations", params={"limit": 1})
+
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert response.headers["X-Bookmark"]
+
+    async def test_last_page_has_no_bookmark(self, client, workspace):
+        tenant, _ = workspace
+
+        response = await client.get(f"/api/tenants/{tenant['_id']}/invitations", params={"limit": 2})
+
+        assert len(response.json()) == 1
+        assert "X-Bookmark" not in response.headers
+
+    async def test_page_size_capped(self, client, workspace):
+        tenant, _ = workspace
+
+        response = await client.get(f"/api/tenants/{tenant['_id']}/invitations", params={"limit": 501})
+
+        assert response.status_code == 422
+
+    async def test_unknown_tenant_404(self, client, workspace):
+        response = await client.get("/api/tenants/tenant_00000000-0000-0000-0000-000000000000/invitations")
+
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+class TestInvitationInput:
+    async def test_invalid_role_rejected_without_io(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+
+        with patch.object(couch_sitter_service, "_send_request", wraps=couch_sitter_service._send_request) as send:
+            response = await client.post(f"/api/tenants/{tenant['_id']}/invitations", json={"role": "owner"})
+
+        assert response.status_code == 422
+        send.assert_not_awaited()
+
+    async def test_malformed_invite_id_rejected_without_io(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+
+        with patch.object(couch_sitter_service, "_send_request", wraps=couch_sitter_service._send_request) as send:
+            revoke = await client.delete(f"/api/tenants/{tenant['_id']}/invitations/{tenant['userId']}")
+            resend = await client.post(f"/api/tenants/{tenant['_id']}/invitations/not-an-invite/resend")
+
+        assert (revoke.status_code, resend.status_code) == (422, 422)
+        send.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestErrorMapping:
+    async def test_bulk_update_conflict_is_409(self, client, couch_sitter_service, current_user, workspace):
+        tenant, _ = workspace
+        member_id = set_user(current_user, couch_sitter_service, MEMBER_SUB)
+        set_user(current_user, couch_sitter_service, OWNER_SUB)
+
+        conflict = BulkUpdateConflict(f"Revision conflict persisted for ['{member_id}']")
+        with patch.object(couch_sitter_service, "bulk_update", side_effect=conflict):
+            response = await client.delete(f"/api/tenants/{tenant['_id']}/members/{member_id}")
+
+        assert response.status_code == 409
+        assert member_id not in response.text
+
+    async def test_bulk_update_error_is_generic_500(self, client, couch_sitter_service, current_user, workspace):
+        tenant, _ = workspace
+        member_id = set_user(current_user, couch_sitter_service, MEMBER_SUB)
+        set_user(current_user, couch_sitter_service, OWNER_SUB)
+
+        failure = BulkUpdateError(f"Failed to write {member_id}: forbidden (validation)")
+        with patch.object(couch_sitter_service, "bulk_update", side_effect=failure):
+            response = await client.delete(f"/api/tenants/{tenant['_id']}/members/{member_id}")
+
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+
+    async def test_value_error_is_generic_500(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+
+        with patch.object(couch_sitter_service, "get_tenant", side_effect=ValueError("bad doc tenant_x")):
+            response = await client.get(f"/api/tenants/{tenant['_id']}/invitations")
+
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+
+    async def test_unexpected_error_is_generic_500(self, client, couch_sitter_service, workspace):
+        tenant, _ = workspace
+
+        with patch.object(couch_sitter_service, "get_tenant", side_effect=RuntimeError("secret internals")):
+            response = await client.get(f"/api/tenants/{tenant['_id']}/invitations")
+
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+
+    async def test_bad_tenant_id_is_400(self, client, current_user, couch_sitter_service):
+        set_user(current_user, couch_sitter_service, OWNER_SUB)
+
+        response = await client.delete("/api/tenants/not-a-tenant")
+
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestCreateTenant:
+    async def test_create_adds_owner_membership(self, client, couch_sitter_service, current_user):
+        owner_id = set_user(current_user, couch_sitter_service, OWNER_SUB)
+
+        response = await client.post("/api/tenants", json={"name": "New Band"})
+
+        assert response.status_code == 200
+        tenant_id = f"tenant_{response.json()['tenantId']}"
+        tenant = await couch_sitter_service.get_tenant(tenant_id)
+        assert tenant["userIds"] == [owner_id]
+        user_doc = await couch_sitter_service.get_user_doc(owner_id)
+        assert tenant_id in user_doc["tenantIds"]
+        entry = next(t for t in user_doc["tenants"] if t["tenantId"] == response.json()["tenantId"])
+        assert entry["role"] == "owner"
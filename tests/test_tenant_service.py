@@ -0,0 +1,162 @@
+"""
+TenantService tests.
+
+Requests go through an httpx MockTransport that plays a tiny CouchDB.
+"""
+
+import httpx
+import orjson
+import pytest
+
+from couchdb_jwt_proxy.tenant_service import TenantService
+
+USER_HASH = "a" * 64
+
+
+class FakeCouch:
+    """Records requests and serves canned documents keyed by path"""
+
+    def __init__(self, docs=None):
+        self.docs = docs or {}
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if request.method == "GET" and path.endswith("/_view/by_owner"):
+            return self.tenants_view(path, request)
+        if request.method == "GET":
+            if path in self.docs:
+                return httpx.Response(200, json=self.docs[path])
+            return httpx.Response(404, json={"error": "not_found"})
+        if request.method == "PUT":
+            doc = orjson.loads(request.content)
+            current = self.docs.get(path)
+            if current is not None and current.get("_rev") != doc.get("_rev"):
+                return httpx.Response(409, json={"error": "conflict"})
+            generation = int(current["_rev"].split("-")[0]) if current and "_rev" in current else 0
+            doc["_rev"] = f"{generation + 1}-x"
+            self.docs[path] = doc
+            return httpx.Response(201, json={"ok": True, "id": path.rsplit("/", 1)[-1], "rev": doc["_rev"]})
+        return httpx.Response(405)
+
+    def tenants_view(self, path: str, request: httpx.Request) -> httpx.Response:
+        database = path.split("/")[1]
+        if f"/{database}/_design/tenants_by_owner" not in self.docs:
+            return httpx.Response(404, json={"error": "not_found"})
+        owner = orjson.loads(request.url.params["startkey"])[0]
+        tenants = [
+            doc for key, doc in self.docs.items()
+            if key.startswith(f"/{database}/") and doc.get("type") == "tenant" and doc.get("owner_id") == owner
+        ]
+        tenants.sort(key=lambda doc: doc["created_at"])
+        rows = [{"id": doc["_id"], "key": [owner, doc["created_at"]], "doc": doc} for doc in tenants]
+        return httpx.Response(200, json={"rows": rows})
+
+
+@pytest.fixture
+def couch():
+    return FakeCouch({
+        f"/couch-sitter/user_{USER_HASH}": {"_id": f"user_{USER_HASH}", "_rev": "1-a"},
+    })
+
+
+@pytest.fixture
+def tenant_service(couch):
+    service = TenantService("http://couchdb:5984/", "admin", "secret")
+    service._client = httpx.AsyncClient(
+        base_url=service.couchdb_url, auth=(service.username, service.password),
+        transport=httpx.MockTransport(couch),
+    )
+    return service
+
+
+@pytest.mark.asyncio
+class TestPooledClient:
+    async def test_client_reused_across_calls(self, tenant_service, couch):
+        client = tenant_service._get_client()
+
+        await tenant_service.create_tenant(USER_HASH, user_name="Ann")
+        await tenant_service.set_user_default_tenant(USER_HASH, "t1")
+
+        assert tenant_service._get_client() is client
+        assert [r.method for r in couch.requests] == ["PUT", "GET", "PUT"]
+        assert all(r.headers["authorization"].startswith("Basic ") for r in couch.requests)
+        assert all(r.headers["content-type"] == "application/json" for r in couch.requests if r.method == "PUT")
+
+    async def test_close_releases_client(self, tenant_service):
+        client = tenant_service._get_client()
+
+        await tenant_service.close()
+
+        assert client.is_closed
+        assert tenant_service._client is None
+
+    async def test_client_created_lazily_with_base_url(self):
+        service = TenantService("http://couchdb:5984/", "admin", "secret")
+        assert service._client is None
+
+        client = service._get_client()
+
+        assert client.base_url == "http://couchdb:5984"
+        await service.close()
+
+
+@pytest.mark.asyncio
+class TestSetUserDefaultTenant:
+    async def test_sets_active_tenant(self, tenant_service, couch):
+        user_doc = await tenant_service.set_user_default_tenant(USER_HASH, "t1")
+
+        assert user_doc["active_tenant_id"] == "t1"
+        assert couch.docs[f"/couch-sitter/user_{USER_HASH}"]["active_tenant_id"] == "t1"
+
+    async def test_missing_user_returns_empty(self, tenant_service):
+        assert await tenant_service.set_user_default_tenant("b" * 64, "t1") == {}
+
+    async def test_repeat_write_skips_get(self, tenant_service, couch):
+        await tenant_service.set_user_default_tenant(USER_HASH, "t1")
+
+        user_doc = await tenant_service.set_user_default_tenant(USER_HASH, "t2")
+
+        assert [r.method for r in couch.requests] == ["GET", "PUT", "PUT"]
+        assert couch.requests[-1].headers["if-match"] == "2-x"
+        assert user_doc["_rev"] == "3-x"
+        assert couch.docs[f"/couch-sitter/user_{USER_HASH}"]["active_tenant_id"] == "t2"
+
+    async def test_conflict_refetches_user_doc(self, tenant_service, couch):
+        await tenant_service.set_user_default_tenant(USER_HASH, "t1")
+        path = f"/couch-sitter/user_{USER_HASH}"
+        couch.docs[path] = {**couch.docs[path], "_rev": "3-y", "name": "Ann"}  # written elsewhere
+
+        await tenant_service.set_user_default_tenant(USER_HASH, "t2")
+
+        assert [r.method for r in couch.requests] == ["GET", "PUT", "PUT", "GET", "PUT"]
+        assert couch.docs[path]["name"] == "Ann"
+        assert couch.docs[path]["active_tenant_id"] == "t2"
+
+
+@pytest.mark.asyncio
+class TestQueryUserTenants:
+    async def test_reads_owner_range_from_view(self, tenant_service, couch):
+        couch.docs["/roady/_design/tenants_by_owner"] = {"_id": "_design/tenants_by_owner"}
+        couch.docs["/roady/tenant_2"] = {"_id": "tenant_2", "type": "tenant", "owner_id": USER_HASH, "created_at": "2024-02"}
+        couch.docs["/roady/tenant_1"] = {"_id": "tenant_1", "type": "tenant", "owner_id": USER_HASH, "created_at": "2024-01"}
+        couch.docs["/roady/tenant_x"] = {"_id": "tenant_x", "type": "tenant", "owner_id": "b" * 64, "created_at": "2023-01"}
+
+        tenants = await tenant_service.query_user_tenants(USER_HASH)
+
+        assert [t["_id"] for t in tenants] == ["tenant_1", "tenant_2"]
+        params = couch.requests[-1].url.params
+        assert orjson.loads(params["startkey"]) == [USER_HASH]
+        assert orjson.loads(params["endkey"]) == [USER_HASH, {}]
+        assert params["include_docs"] == "true"
+
+    async def test_creates_design_doc_on_first_use(self, tenant_service, couch):
+        await tenant_service.create_tenant(USER_HASH)
+
+        tenants = await tenant_service.query_user_tenants(USER_HASH)
+
+        assert len(tenants) == 1
+        design = couch.docs["/roady/_design/tenants_by_owner"]
+        assert "emit([doc.owner_id, doc.created_at]" in design["views"]["by_owner"]["map"]
+        assert [r.method for r in couch.requests] == ["PUT", "GET", "PUT", "GET"]
@@ -0,0 +1,73 @@
+"""
+Tests for TenantValidator document write checks
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from couchdb_jwt_proxy.tenant_validation import TenantAccessError, TenantValidator
+
+
+@pytest.fixture
+def validator():
+    """Validator whose user belongs to tenant-a and tenant-b"""
+    service = MagicMock()
+    service.get_user_tenants = AsyncMock(
+        return_value=([{"_id": "tenant-a"}, {"_id": "tenant-b"}], None)
+    )
+    return TenantValidator(service)
+
+
+@pytest.mark.asyncio
+class TestValidateBulkDocs:
+    async def test_tenants_fetched_once_per_bulk(self, validator):
+        docs = [
+            {"_id": "doc1", "tenant": "tenant-a"},
+            {"_id": "doc2", "tenant": "tenant-b"},
+            {"_id": "band-info_tenant-a", "type": "band-info"},
+            {"_id": "doc3", "_deleted": True},
+        ]
+
+        await validator.validate_bulk_docs(docs, "user1", "roady")
+
+        validator.couch_sitter_service.get_user_tenants.assert_awaited_once_with("user1")
+        assert docs[2]["tenant"] == "tenant-a"
+
+    async def test_tenants_checked_as_set(self, validator):
+        assert await validator._get_tenant_ids("user1") == frozenset({"tenant-a", "tenant-b"})
+
+    async def test_foreign_tenant_reports_index(self, validator):
+        docs = [{"_id": "doc1", "tenant": "tenant-a"}, {"_id": "doc2", "tenant": "tenant-z"}]
+
+        with pytest.raises(TenantAccessError, match=r"Document 1 failed validation.*\['tenant-a', 'tenant-b'\]"):
+            await validator.validate_bulk_docs(docs, "user1", "roady")
+
+    async def test_couch_sitter_rejected_without_lookup(self, validator):
+        with pytest.raises(TenantAccessError):
+            await validator.validate_bulk_docs([{"_id": "doc1"}], "user1", "couch-sitter")
+
+        validator.couch_sitter_service.get_user_tenants.assert_not_awaited()
+
+    @pytest.mark.parametrize("docs", [[], [{"_id": "doc1", "_deleted": True}]])
+    async def test_nothing_to_validate_passes_without_lookup(self, validator, docs):
+        validator.couch_sitter_service.get_user_tenants.return_value = ([], None)
+
+        await validator.validate_bulk_docs(docs, "user1", "roady")
+
+        validator.couch_sitter_service.get_user_tenants.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestValidateWrite:
+    async def test_own_tenant_passes(self, validator):
+        await validator.validate_write({"_id": "doc1", "tenant": "tenant-b"}, "user1", "roady")
+
+    async def test_missing_tenant_rejected(self, validator):
+        with pytest.raises(TenantAccessError, match="missing required 'tenant'"):
+            await validator.validate_write({"_id": "doc1"}, "user1", "roady")
+
+    async def test_no_tenants_rejected(self, validator):
+        validator.couch_sitter_service.get_user_tenants.return_value = ([], None)
+
+        with pytest.raises(TenantAccessError, match="no authorized tenants"):
+            await validator.validate_write({"_id": "doc1", "tenant": "tenant-a"}, "user1", "roady")
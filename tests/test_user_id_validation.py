@@ -6,7 +6,7 @@ Validates that user IDs must follow the format: user_<64-char-sha256-hash>
 
 import pytest
 import hashlib
-from src.couchdb_jwt_proxy.tenant_validation import (
+from couchdb_jwt_proxy.tenant_validation import (
     validate_user_id_format,
     UserIdFormatError
 )
@@ -111,6 +111,13 @@ class TestUserIdValidation:
             validate_user_id_format(f"user_{invalid_hash}")
         assert "valid hexadecimal" in str(exc_info.value)
     
+    def test_hash_with_underscore(self):
+        """Digit-group underscores (accepted by int(x, 16)) are not hex"""
+        invalid_hash = "a" * 32 + "_" + "a" * 31
+        with pytest.raises(UserIdFormatError) as exc_info:
+            validate_user_id_format(f"user_{invalid_hash}")
+        assert "valid hexadecimal" in str(exc_info.value)
+    
     def test_case_insensitive_prefix(self):
         """Prefix must be lowercase"""
         valid_hash = "a" * 64
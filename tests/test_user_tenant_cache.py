@@ -4,6 +4,7 @@ User Tenant Cache tests.
 Tests TTL functionality, thread safety, and cache operations using Memory DAL.
 """
 
+import asyncio
 import pytest
 import time
 import threading
@@ -69,7 +70,7 @@ class TestUserTenantInfo:
         )
 
         # cached_at should be set to current time
-        current_time = time.time()
+        current_time = time.monotonic()
         assert abs(info.cached_at - current_time) < 1.0  # Within 1 second
 
     def test_user_tenant_info_preserves_cached_at(self):
@@ -84,6 +85,17 @@ class TestUserTenantInfo:
 
         assert info.cached_at == custom_time
 
+    def test_user_tenant_info_uses_slots(self):
+        """Instances store fields in slots, without a per-instance __dict__"""
+        info = UserTenantInfo(user_id="user_abc123", tenant_id="tenant_def456", sub="sub_ghi789")
+
+        assert not hasattr(info, "__dict__")
+        with pytest.raises(AttributeError):
+            info.unexpected = 1
+        assert info == UserTenantInfo(
+            user_id="user_abc123", tenant_id="tenant_def456", sub="sub_ghi789", cached_at=info.cached_at
+        )
+
 
 class TestUserTenantCache:
     """Test UserTenantCache functionality"""
@@ -147,7 +159,7 @@ class TestUserTenantCache:
         )
 
         # Set user with old timestamp - directly set in cache to override set_user's timestamp update
-        user_info.cached_at = time.time() - 400  # 400 seconds ago (expired for 300s TTL)
+        user_info.cached_at = time.monotonic() - 400  # 400 seconds ago (expired for 300s TTL)
         cache._cache[sub_hash] = user_info  # Direct cache access to preserve old timestamp
 
         # Should return None due to expiration
@@ -157,6 +169,46 @@ class TestUserTenantCache:
         # Should also be removed from cache
         assert sub_hash not in cache._cache
 
+    def test_hit_does_not_take_lock(self, cache):
+        """Test that reading a live entry never touches the lock"""
+        user_info = UserTenantInfo(user_id="user_fast", tenant_id="tenant_fast", sub="sub_fast")
+        cache.set_user("fast_hash", user_info)
+        cache._lock = MagicMock()
+
+        assert cache.get_user_by_sub_hash("fast_hash") is user_info
+        cache._lock.__enter__.assert_not_called()
+
+    def test_expired_entry_replaced_meanwhile_is_kept(self, cache):
+        """Test that expiry only removes the entry it saw, not a fresh replacement"""
+        stale = UserTenantInfo(user_id="user_old", tenant_id="tenant_old", sub="sub_old")
+        stale.cached_at = time.monotonic() - 400
+        fresh = UserTenantInfo(user_id="user_new", tenant_id="tenant_new", sub="sub_new")
+        cache._cache["race_hash"] = stale
+
+        with patch.object(cache, "_is_expired", side_effect=lambda info: cache.set_user("race_hash", fresh) or True):
+            assert cache.get_user_by_sub_hash("race_hash") is None
+
+        assert cache._cache["race_hash"] is fresh
+
+    def test_cache_is_bounded(self):
+        """Test that the oldest cached users are evicted past max_size"""
+        cache = UserTenantCache(ttl_seconds=300, max_size=2)
+        for i in range(3):
+            cache.set_user(f"hash{i}", UserTenantInfo(user_id=f"user{i}", tenant_id=f"tenant{i}", sub=f"sub{i}"))
+
+        assert list(cache._cache) == ["hash1", "hash2"]
+
+    def test_recached_user_moves_to_back(self):
+        """Test that re-caching a user protects it from the next eviction"""
+        cache = UserTenantCache(ttl_seconds=300, max_size=2)
+        first = UserTenantInfo(user_id="user0", tenant_id="tenant0", sub="sub0")
+        cache.set_user("hash0", first)
+        cache.set_user("hash1", UserTenantInfo(user_id="user1", tenant_id="tenant1", sub="sub1"))
+        cache.set_user("hash0", first)
+        cache.set_user("hash2", UserTenantInfo(user_id="user2", tenant_id="tenant2", sub="sub2"))
+
+        assert list(cache._cache) == ["hash0", "hash2"]
+
     def test_set_updates_cached_at(self, cache):
         """Test that set_user updates cached_at timestamp"""
         sub_hash = "timestamp_test"
@@ -171,7 +223,7 @@ class TestUserTenantCache:
         cache.set_user(sub_hash, user_info)
 
         # cached_at should be updated to current time
-        current_time = time.time()
+        current_time = time.monotonic()
         assert abs(user_info.cached_at - current_time) < 1.0
 
     def test_invalidate_user(self, cache):
@@ -226,7 +278,7 @@ class TestUserTenantCache:
     def test_get_stats(self, cache):
         """Test cache statistics"""
         # Add some entries
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # Valid entry
         valid_info = UserTenantInfo(
@@ -255,7 +307,7 @@ class TestUserTenantCache:
 
     def test_cleanup_expired_entries(self, cache):
         """Test cleanup of expired entries"""
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # Add valid and expired entries
         valid_info = UserTenantInfo(
@@ -286,6 +338,29 @@ class TestUserTenantCache:
         assert "valid_hash" in cache._cache
         assert "expired_hash" not in cache._cache
 
+    def test_cleanup_keeps_eviction_order(self, cache):
+        """Cleanup rebuilds the cache without disturbing the eviction order"""
+        for key in ("a", "b", "c"):
+            cache.set_user(key, UserTenantInfo(user_id=f"user_{key}", tenant_id="t", sub=key))
+        cache._cache["b"].cached_at = time.monotonic() - 400
+
+        cache.cleanup_expired_entries()
+
+        assert list(cache._cache) == ["a", "c"]
+        cache.set_user("a", cache._cache["a"])
+        assert list(cache._cache) == ["c", "a"]
+
+    def test_hit_logging_is_lazy(self, cache, caplog):
+        """Debug lines carry their arguments instead of a pre-formatted string"""
+        cache.set_user("hash", UserTenantInfo(user_id="user_x", tenant_id="tenant_x", sub="x"))
+
+        with caplog.at_level("DEBUG", logger="couchdb_jwt_proxy.user_tenant_cache"):
+            cache.get_user_by_sub_hash("hash")
+
+        record = caplog.records[-1]
+        assert record.args == ("hash", "user_x", "tenant_x")
+        assert record.getMessage() == "Cache hit for sub_hash: hash -> user_id=user_x, tenant_id=tenant_x"
+
     def test_thread_safety_concurrent_access(self, cache):
         """Test thread safety with concurrent cache access"""
         results = []
@@ -420,6 +495,70 @@ class TestUserTenantCache:
         assert cache2.ttl_seconds == 200
 
 
+class TestUserTenantCacheRefreshAhead:
+    """Test background refresh of entries past the soft TTL"""
+
+    @pytest.fixture
+    def cache(self):
+        return UserTenantCache(ttl_seconds=100, soft_ttl_ratio=0.8)
+
+    def aged_entry(self, cache, age):
+        info = UserTenantInfo(user_id="user_old", tenant_id="tenant_old", sub="sub")
+        cache.set_user("hash", info)
+        info.cached_at = time.monotonic() - age
+        return info
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_not_refreshed(self, cache):
+        self.aged_entry(cache, 10)
+        refresh = AsyncMock()
+
+        cache.get_user_by_sub_hash("hash", refresh=refresh)
+        await asyncio.sleep(0)
+
+        refresh.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stale_hit_served_then_refreshed_once(self, cache):
+        old = self.aged_entry(cache, 90)
+        new = UserTenantInfo(user_id="user_new", tenant_id="tenant_new", sub="sub")
+        refresh = AsyncMock(return_value=new)
+
+        assert cache.get_user_by_sub_hash("hash", refresh=refresh) is old
+        assert cache.get_user_by_sub_hash("hash", refresh=refresh) is old
+        await asyncio.gather(*cache._refresh_tasks)
+
+        refresh.assert_awaited_once()
+        assert cache.get_user_by_sub_hash("hash") is new
+        assert cache._refreshing == set()
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_entry(self, cache):
+        old = self.aged_entry(cache, 90)
+        refresh = AsyncMock(side_effect=RuntimeError("couch down"))
+
+        cache.get_user_by_sub_hash("hash", refresh=refresh)
+        await asyncio.gather(*cache._refresh_tasks)
+
+        assert cache.get_user_by_sub_hash("hash") is old
+        assert cache._refreshing == set()
+
+    @pytest.mark.asyncio
+    async def test_hard_ttl_still_expires(self, cache):
+        self.aged_entry(cache, 101)
+        refresh = AsyncMock()
+
+        assert cache.get_user_by_sub_hash("hash", refresh=refresh) is None
+        refresh.assert_not_awaited()
+
+    def test_no_event_loop_skips_refresh(self, cache):
+        old = self.aged_entry(cache, 90)
+        refresh = MagicMock()
+
+        assert cache.get_user_by_sub_hash("hash", refresh=refresh) is old
+        refresh.assert_not_called()
+
+
 class TestUserTenantCacheGlobal:
     """Test global cache instance functionality"""
 
@@ -609,7 +748,7 @@ class TestUserTenantCacheIntegration:
             sub="sub_ttl_test"
         )
 
-        with patch('time.time') as mock_time:
+        with patch('time.monotonic') as mock_time:
             # Mock time progression
             mock_time.side_effect = [0, 1, 5]  # Initial, set time, expired time
 
@@ -784,6 +784,58 @@ class TestVirtualTableBulkDocs:
 # Extract Tenant Integration Tests (Bootstrap in extract_tenant)
 # ============================================================================
 
+class TestVirtualTableAuthDenials:
+    """Fixed auth denials from the /__users and /__tenants handlers"""
+
+    @pytest.mark.asyncio
+    async def test_missing_authorization(self, async_client):
+        response = await async_client.get("/__users/abc")
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Missing authorization"}
+        assert response.headers["content-type"] == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_invalid_session_token(self, async_client):
+        response = await async_client.get("/__tenants", headers={"Authorization": "Bearer not-a-session"})
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid or expired session token"}
+
+    @pytest.mark.asyncio
+    async def test_missing_sub(self, async_client):
+        with patch("couchdb_jwt_proxy.main.verify_session_token", return_value={"pubkey": "", "user_id": "u"}):
+            response = await async_client.get("/__tenants/abc", headers={"Authorization": "Bearer token"})
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Missing 'sub' in JWT"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method,path", [
+        ("PUT", "/__users/abc"),
+        ("POST", "/__tenants"),
+        ("PUT", "/__tenants/abc"),
+        ("POST", "/__users/_bulk_docs"),
+        ("POST", "/__tenants/_bulk_docs"),
+    ])
+    async def test_auth_checked_before_body(self, async_client, method, path):
+        response = await async_client.request(method, path, content=b"not json")
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Missing authorization"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content", [b"not json", b"[]"])
+    async def test_malformed_body_after_auth(self, async_client, content):
+        with patch("couchdb_jwt_proxy.main.verify_session_token", return_value={"pubkey": "a" * 64, "user_id": "u"}):
+            response = await async_client.post(
+                "/__users/_bulk_docs", headers={"Authorization": "Bearer token"}, content=content
+            )
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Request body must be a JSON object"}
+
+
 class TestExtractTenantBootstrapIntegration:
     """Test extract_tenant() function with 5-level discovery chain"""
 
@@ -907,3 +959,60 @@ class TestExtractTenantBootstrapIntegration:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestTenantWritesInvalidateCache:
+    """/__tenants writes evict the tenant from CouchSitterService's get_tenant() cache"""
+
+    @pytest.fixture
+    def session(self):
+        with patch("couchdb_jwt_proxy.main.verify_session_token", return_value={"pubkey": "a" * 64, "user_id": "u"}):
+            yield {"Authorization": "Bearer token"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method,handler", [("PUT", "update_tenant"), ("DELETE", "delete_tenant")])
+    async def test_write_invalidates_tenant(self, async_client, session, method, handler):
+        from couchdb_jwt_proxy import main
+
+        tenant_id = "0b1e2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+
+        with patch.object(main.virtual_table_handler, handler, new_callable=AsyncMock, return_value={"ok": True}), \
+             patch.object(main.couch_sitter_service, "invalidate_tenant") as invalidate:
+            response = await async_client.request(
+                method, f"/__tenants/{tenant_id}", headers=session, json={"name": "x"} if method == "PUT" else None
+            )
+
+        assert response.status_code == 200
+        invalidate.assert_called_once_with(tenant_id)
+
+    @pytest.mark.asyncio
+    async def test_bulk_docs_invalidates_each_tenant(self, async_client, session):
+        from couchdb_jwt_proxy import main
+
+        with patch.object(main.virtual_table_handler, "bulk_docs_tenants", new_callable=AsyncMock, return_value=[]), \
+             patch.object(main.couch_sitter_service, "invalidate_tenant") as invalidate:
+            response = await async_client.post(
+                "/__tenants/_bulk_docs", headers=session,
+                json={"docs": [{"_id": "tenant_a", "_deleted": True}, {"_id": "b", "name": "B"}]}
+            )
+
+        assert response.status_code == 200
+        assert [c.args[0] for c in invalidate.call_args_list] == ["tenant_a", "b"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path,body,evicted", [
+        ("/couch-sitter/tenant_a", {"name": "A"}, ["tenant_a"]),
+        ("/couch-sitter/_bulk_docs", {"docs": [{"_id": "tenant_a"}, {"_id": "user_b"}]}, ["tenant_a"]),
+        ("/roady/tenant_a", {"name": "A"}, []),
+    ])
+    async def test_catch_all_couch_sitter_write_invalidates(self, async_client, session, path, body, evicted):
+        from couchdb_jwt_proxy import main
+
+        with patch.object(main, "extract_tenant", new_callable=AsyncMock, return_value="tenant_a"), \
+             patch.object(main.dal, "get", new_callable=AsyncMock, return_value={"ok": True}), \
+             patch.object(main.couch_sitter_service, "invalidate_tenant") as invalidate:
+            method = "POST" if path.endswith("_bulk_docs") else "PUT"
+            response = await async_client.request(method, path, headers=session, json=body)
+
+        assert response.status_code == 200
+        assert [c.args[0] for c in invalidate.call_args_list] == evicted